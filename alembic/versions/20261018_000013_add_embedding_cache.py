@@ -0,0 +1,35 @@
+"""add embedding cache
+
+Revision ID: 20261018_000013
+Revises: 20260129_000012
+Create Date: 2026-10-18 00:00:13
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_000013"
+down_revision = "20260129_000012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "embedding_cache",
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("dim", sa.Integer(), nullable=False),
+        sa.Column("vector", sa.LargeBinary(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("model", "kind", "text_hash"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("embedding_cache")
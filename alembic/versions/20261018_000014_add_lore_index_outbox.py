@@ -0,0 +1,48 @@
+"""add lore index outbox
+
+Revision ID: 20261018_000014
+Revises: 20261018_000013
+Create Date: 2026-10-18 00:00:14
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_000014"
+down_revision = "20261018_000013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "lore_index_outbox",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("story_id", sa.String(), nullable=False),
+        sa.Column("lore_id", sa.String(), nullable=False),
+        sa.Column("op", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(),
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+            nullable=False,
+        ),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_lore_index_outbox_story_id", "lore_index_outbox", ["story_id"])
+    op.create_index(
+        "ix_lore_index_outbox_next_attempt_at", "lore_index_outbox", ["next_attempt_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lore_index_outbox_next_attempt_at", table_name="lore_index_outbox")
+    op.drop_index("ix_lore_index_outbox_story_id", table_name="lore_index_outbox")
+    op.drop_table("lore_index_outbox")
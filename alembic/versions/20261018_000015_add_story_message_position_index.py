@@ -0,0 +1,24 @@
+"""add story message position index
+
+Revision ID: 20261018_000015
+Revises: 20261018_000014
+Create Date: 2026-10-18 00:00:15
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_000015"
+down_revision = "20261018_000014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_story_messages_story_id_position", "story_messages", ["story_id", "position"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_story_messages_story_id_position", table_name="story_messages")
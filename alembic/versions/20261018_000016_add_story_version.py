@@ -0,0 +1,26 @@
+"""add story version
+
+Revision ID: 20261018_000016
+Revises: 20261018_000015
+Create Date: 2026-10-18 00:00:16
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_000016"
+down_revision = "20261018_000015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "stories", sa.Column("version", sa.Integer(), server_default="1", nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("stories", "version")
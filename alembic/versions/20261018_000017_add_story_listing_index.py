@@ -0,0 +1,22 @@
+"""add story listing index
+
+Revision ID: 20261018_000017
+Revises: 20261018_000016
+Create Date: 2026-10-18 00:00:17
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_000017"
+down_revision = "20261018_000016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_stories_updated_at_id", "stories", ["updated_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stories_updated_at_id", table_name="stories")
@@ -0,0 +1,63 @@
+"""add composite indexes for hot queries
+
+Revision ID: 20261018_000018
+Revises: 20261018_000017
+Create Date: 2026-10-18 00:00:18
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "20261018_000018"
+down_revision = "20261018_000017"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Renumber stories whose positions collide or have gaps before making them unique.
+    op.execute(
+        """
+        UPDATE story_messages
+        SET position = ranked.new_position
+        FROM (
+            SELECT
+                id,
+                ROW_NUMBER() OVER (
+                    PARTITION BY story_id ORDER BY position, created_at, id
+                ) - 1 AS new_position
+            FROM story_messages
+            WHERE story_id IN (
+                SELECT story_id
+                FROM story_messages
+                GROUP BY story_id
+                HAVING COUNT(DISTINCT position) < COUNT(*) OR MAX(position) <> COUNT(*) - 1
+            )
+        ) AS ranked
+        WHERE ranked.id = story_messages.id AND story_messages.position <> ranked.new_position
+        """
+    )
+    op.drop_index("ix_story_messages_story_id_position", table_name="story_messages")
+    op.create_index(
+        "ix_story_messages_story_id_position",
+        "story_messages",
+        ["story_id", "position"],
+        unique=True,
+    )
+    op.drop_index("ix_story_messages_story_id", table_name="story_messages")
+    op.create_index(
+        "ix_lore_suggestions_story_status_kind_title",
+        "lore_suggestions",
+        ["story_id", "status", "kind", "title"],
+    )
+    op.drop_index("ix_lore_suggestions_story_id", table_name="lore_suggestions")
+
+
+def downgrade() -> None:
+    op.create_index("ix_lore_suggestions_story_id", "lore_suggestions", ["story_id"])
+    op.drop_index("ix_lore_suggestions_story_status_kind_title", table_name="lore_suggestions")
+    op.create_index("ix_story_messages_story_id", "story_messages", ["story_id"])
+    op.drop_index("ix_story_messages_story_id_position", table_name="story_messages")
+    op.create_index(
+        "ix_story_messages_story_id_position", "story_messages", ["story_id", "position"]
+    )
@@ -19,6 +19,13 @@ export function buildUrl(path: string) {
 }
 
 export async function requestJson<T>(path: string, options: RequestOptions = {}): Promise<T> {
+  return (await requestJsonWithHeaders<T>(path, options)).data;
+}
+
+export async function requestJsonWithHeaders<T>(
+  path: string,
+  options: RequestOptions = {},
+): Promise<{ data: T; headers: Headers }> {
   const response = await fetch(buildUrl(path), {
     method: options.method ?? "GET",
     headers: {
@@ -33,8 +40,8 @@ export async function requestJson<T>(path: string, options: RequestOptions = {})
   }
 
   if (response.status === 204) {
-    return undefined as T;
+    return { data: undefined as T, headers: response.headers };
   }
 
-  return (await response.json()) as T;
+  return { data: (await response.json()) as T, headers: response.headers };
 }
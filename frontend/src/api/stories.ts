@@ -1,13 +1,18 @@
-import { buildUrl, requestJson } from "./client";
+import { buildUrl, requestJson, requestJsonWithHeaders } from "./client";
 import type {
   ChatMessage,
   LoreEntry,
+  LoreSyncResult,
   Story,
   StoryDraftPayload,
   StoryGenerateJobResponse,
   StoryGenerateJobStatus,
   StoryGenerateRequest,
+  StoryMessagePage,
   StorySummary,
+  StorySummaryPage,
+  TurnDoneEvent,
+  TurnStreamEvent,
 } from "./types";
 
 type StoryPayload = StoryDraftPayload & {
@@ -25,12 +30,27 @@ function toStoryPayload(payload: StoryDraftPayload): StoryPayload {
   };
 }
 
-export function listStories() {
-  return requestJson<StorySummary[]>("/stories");
+export const STORY_PAGE_SIZE = 24;
+
+export async function listStories(cursor?: string | null): Promise<StorySummaryPage> {
+  const params = new URLSearchParams({ limit: String(STORY_PAGE_SIZE) });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  const { data, headers } = await requestJsonWithHeaders<StorySummary[]>(`/stories?${params}`);
+  return { stories: data, nextCursor: headers.get("X-Next-Cursor") };
 }
 
+export const TRANSCRIPT_PAGE_SIZE = 50;
+
 export function getStory(storyId: string) {
-  return requestJson<Story>(`/stories/${storyId}`);
+  return requestJson<Story>(`/stories/${storyId}?messages_limit=${TRANSCRIPT_PAGE_SIZE}`);
+}
+
+export function getStoryMessages(storyId: string, beforePosition: number, limit = TRANSCRIPT_PAGE_SIZE) {
+  return requestJson<StoryMessagePage>(
+    `/stories/${storyId}/messages?before_position=${beforePosition}&limit=${limit}`,
+  );
 }
 
 export function createStory(payload: StoryDraftPayload) {
@@ -41,7 +61,7 @@ export function createStory(payload: StoryDraftPayload) {
 }
 
 export function updateStory(storyId: string, payload: Partial<StoryPayload>) {
-  return requestJson<Story>(`/stories/${storyId}`, {
+  return requestJson<Story>(`/stories/${storyId}?messages_limit=${TRANSCRIPT_PAGE_SIZE}`, {
     method: "PUT",
     body: payload,
   });
@@ -53,8 +73,14 @@ export function deleteStory(storyId: string) {
   });
 }
 
+export function popStoryMessage(storyId: string) {
+  return requestJson<ChatMessage>(`/stories/${storyId}/messages/last`, {
+    method: "DELETE",
+  });
+}
+
 export function syncStoryLore(storyId: string) {
-  return requestJson<void>(`/stories/${storyId}/lore/sync`, {
+  return requestJson<LoreSyncResult>(`/stories/${storyId}/lore/sync`, {
     method: "POST",
   });
 }
@@ -102,12 +128,35 @@ export function getStoryGenerateJob(jobId: string) {
   return requestJson<StoryGenerateJobStatus>(`/stories/generate/${jobId}`);
 }
 
+export type TurnStreamResult = {
+  text: string;
+  error: string | null;
+  done: TurnDoneEvent | null;
+  turnId: string | null;
+};
+
+const MAX_STREAM_RESUMES = 3;
+
+async function openTurnStream(response: Response) {
+  if (!response.ok) {
+    throw new Error((await response.text()) || `Stream failed with status ${response.status}`);
+  }
+
+  if (!response.body) {
+    throw new Error("Streaming response body is missing.");
+  }
+
+  return response.body.getReader();
+}
+
 export async function streamTurn(
   storyId: string,
   text: string,
   mode: string,
+  persistUser: boolean,
   onChunk: (chunk: string) => void,
-) {
+  onQueued?: (position: number, etaMs: number) => void,
+): Promise<TurnStreamResult> {
   const response = await fetch(buildUrl("/turn/stream"), {
     method: "POST",
     headers: {
@@ -118,34 +167,71 @@ export async function streamTurn(
       mode,
       story_id: storyId,
       trigger: text || undefined,
+      persist_user: persistUser,
+      format: "ndjson",
     }),
   });
 
-  if (!response.ok) {
-    throw new Error((await response.text()) || `Stream failed with status ${response.status}`);
-  }
+  const result: TurnStreamResult = { text: "", error: null, done: null, turnId: null };
+  // The backend counts resume offsets in code points, not UTF-16 units.
+  let offset = 0;
 
-  if (!response.body) {
-    throw new Error("Streaming response body is missing.");
-  }
+  const handleLine = (line: string) => {
+    if (!line.trim()) {
+      return;
+    }
+    const event = JSON.parse(line) as TurnStreamEvent;
+    if (event.type === "turn") {
+      result.turnId = event.turn_id;
+    } else if (event.type === "delta") {
+      result.text += event.text;
+      offset += Array.from(event.text).length;
+      onChunk(event.text);
+    } else if (event.type === "queued") {
+      onQueued?.(event.position, event.eta_ms);
+    } else if (event.type === "error") {
+      result.error = event.message;
+    } else if (event.type === "done") {
+      result.done = event;
+    }
+  };
 
-  const decoder = new TextDecoder();
-  const reader = response.body.getReader();
-  let fullText = "";
+  const readEvents = async (reader: ReadableStreamDefaultReader<Uint8Array>) => {
+    const decoder = new TextDecoder();
+    let pending = "";
 
-  while (true) {
-    const { done, value } = await reader.read();
-    if (done) {
-      break;
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) {
+        break;
+      }
+
+      pending += decoder.decode(value, { stream: true });
+      const lines = pending.split("\n");
+      pending = lines.pop() ?? "";
+      lines.forEach(handleLine);
     }
 
-    const chunk = decoder.decode(value, { stream: true });
-    if (chunk) {
-      fullText += chunk;
-      onChunk(chunk);
+    pending += decoder.decode();
+    handleLine(pending);
+  };
+
+  let reader = await openTurnStream(response);
+  for (let resumes = 0; ; resumes += 1) {
+    try {
+      await readEvents(reader);
+    } catch (streamError) {
+      if (!result.turnId || resumes >= MAX_STREAM_RESUMES) {
+        throw streamError;
+      }
+    }
+    if (result.done || result.error || !result.turnId || resumes >= MAX_STREAM_RESUMES) {
+      break;
     }
+    reader = await openTurnStream(
+      await fetch(buildUrl(`/turn/stream/${result.turnId}?offset=${offset}&format=ndjson`)),
+    );
   }
 
-  fullText += decoder.decode();
-  return fullText;
+  return result;
 }
@@ -6,6 +6,12 @@ export type LoreEntry = {
   triggers: string;
 };
 
+export type LoreSyncResult = {
+  embedded: number;
+  unchanged: number;
+  deleted: number;
+};
+
 export type LoreSuggestion = {
   id: string;
   kind: string;
@@ -22,8 +28,28 @@ export type ChatMessage = {
   role: string;
   text: string;
   mode?: string | null;
+  // Client-only marker for messages the backend did not persist (e.g. failed turns).
+  transient?: boolean;
 };
 
+export type TurnDoneEvent = {
+  type: "done";
+  story_id: string | null;
+  positions: number[];
+  usage: Record<string, number>;
+  timing: {
+    first_token_ms: number | null;
+    duration_ms: number;
+  };
+};
+
+export type TurnStreamEvent =
+  | { type: "turn"; turn_id: string; offset: number }
+  | { type: "delta"; text: string }
+  | { type: "error"; message: string }
+  | { type: "queued"; position: number; eta_ms: number }
+  | TurnDoneEvent;
+
 export type StorySummary = {
   id: string;
   title: string;
@@ -45,6 +71,17 @@ export type Story = {
   lore: LoreEntry[];
   lore_review: LoreSuggestion[];
   messages: ChatMessage[];
+  messages_before_position?: number | null;
+};
+
+export type StorySummaryPage = {
+  stories: StorySummary[];
+  nextCursor: string | null;
+};
+
+export type StoryMessagePage = {
+  messages: ChatMessage[];
+  before_position: number | null;
 };
 
 export type StoryDraftPayload = {
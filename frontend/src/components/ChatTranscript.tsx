@@ -16,11 +16,21 @@ function formatUserMessage(message: ChatMessage) {
 
 type ChatTranscriptProps = {
   messages: ChatMessage[];
+  hasEarlier?: boolean;
+  isLoadingEarlier?: boolean;
+  onLoadEarlier?: () => void;
 };
 
-export function ChatTranscript({ messages }: ChatTranscriptProps) {
+export function ChatTranscript({ messages, hasEarlier, isLoadingEarlier, onLoadEarlier }: ChatTranscriptProps) {
   return (
     <div className="panel transcript" aria-live="polite">
+      {hasEarlier && onLoadEarlier ? (
+        <div className="button-row">
+          <button className="button button--ghost" onClick={onLoadEarlier} disabled={isLoadingEarlier}>
+            {isLoadingEarlier ? "Loading..." : "Load earlier turns"}
+          </button>
+        </div>
+      ) : null}
       {messages.length === 0 ? <p className="muted">No turns yet.</p> : null}
       {messages.map((message, index) => {
         const key = `${message.role}-${index}`;
@@ -8,7 +8,9 @@ import { StoryFormDialog } from "../components/StoryFormDialog";
 export function StoriesPage() {
   const navigate = useNavigate();
   const [stories, setStories] = useState<StorySummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [isCreateOpen, setIsCreateOpen] = useState(false);
   const [editingStory, setEditingStory] = useState<Story | null>(null);
@@ -17,7 +19,9 @@ export function StoriesPage() {
     setIsLoading(true);
     setError(null);
     try {
-      setStories(await listStories());
+      const page = await listStories();
+      setStories(page.stories);
+      setNextCursor(page.nextCursor);
     } catch (loadError) {
       setError(loadError instanceof Error ? loadError.message : "Unable to load stories.");
     } finally {
@@ -25,6 +29,22 @@ export function StoriesPage() {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) {
+      return;
+    }
+    setIsLoadingMore(true);
+    try {
+      const page = await listStories(nextCursor);
+      setStories((current) => [...current, ...page.stories]);
+      setNextCursor(page.nextCursor);
+    } catch (loadError) {
+      setError(loadError instanceof Error ? loadError.message : "Unable to load stories.");
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     void loadStories();
   }, []);
@@ -99,6 +119,14 @@ export function StoriesPage() {
         ))}
       </section>
 
+      {nextCursor ? (
+        <div className="button-row">
+          <button className="button button--ghost" onClick={() => void handleLoadMore()} disabled={isLoadingMore}>
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </button>
+        </div>
+      ) : null}
+
       <StoryFormDialog
         open={isCreateOpen}
         title="Create Story"
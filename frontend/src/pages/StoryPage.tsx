@@ -5,6 +5,8 @@ import {
   addLoreEntry,
   deleteLoreEntry,
   getStory,
+  getStoryMessages,
+  popStoryMessage,
   rejectLoreSuggestion,
   syncStoryLore,
   streamTurn,
@@ -21,22 +23,6 @@ function cloneMessages(messages: ChatMessage[]) {
   return messages.map((message) => ({ ...message }));
 }
 
-function sanitizeMessagesForPersistence(messages: ChatMessage[]) {
-  return messages.filter((message) => {
-    if (message.role !== "assistant") {
-      return true;
-    }
-
-    const text = message.text.trim();
-    return !(
-      text.startsWith("[Ollama error:") ||
-      text.startsWith("[Ollama warning:") ||
-      text.startsWith("Backend error:") ||
-      text.startsWith("Unexpected error:")
-    );
-  });
-}
-
 export function StoryPage() {
   const { storyId } = useParams();
   const navigate = useNavigate();
@@ -46,10 +32,12 @@ export function StoryPage() {
   const [isSaving, setIsSaving] = useState(false);
   const [isStreaming, setIsStreaming] = useState(false);
   const [error, setError] = useState<string | null>(null);
+  const [queueStatus, setQueueStatus] = useState<string | null>(null);
   const [command, setCommand] = useState("");
   const [mode, setMode] = useState<TurnMode>("story");
   const [isPanelOpen, setIsPanelOpen] = useState(false);
   const [isInputOpen, setIsInputOpen] = useState(false);
+  const [isLoadingEarlier, setIsLoadingEarlier] = useState(false);
 
   const modePlaceholder =
     mode === "do" ? "What do you do?" : mode === "say" ? "What do you say?" : "What happens next?";
@@ -90,11 +78,32 @@ export function StoryPage() {
     void loadStory();
   }, [storyId]);
 
-  const persistMessages = async (messages: ChatMessage[]) => {
-    if (!storyId) {
+  const handleLoadEarlier = async () => {
+    const beforePosition = storyRef.current?.messages_before_position;
+    if (!storyId || beforePosition == null || isLoadingEarlier || isStreaming) {
+      return;
+    }
+
+    setIsLoadingEarlier(true);
+    try {
+      const page = await getStoryMessages(storyId, beforePosition);
+      applyStory((current) => ({
+        ...current,
+        messages: [...page.messages, ...current.messages],
+        messages_before_position: page.before_position,
+      }));
+    } catch (loadError) {
+      setError(loadError instanceof Error ? loadError.message : "Unable to load earlier turns.");
+    } finally {
+      setIsLoadingEarlier(false);
+    }
+  };
+
+  const popPersistedMessage = async (message: ChatMessage) => {
+    if (!storyId || message.transient) {
       return;
     }
-    await updateStory(storyId, { messages: sanitizeMessagesForPersistence(messages) });
+    await popStoryMessage(storyId);
   };
 
   const handleSendTurn = async (text: string, currentMode: TurnMode, showUser: boolean) => {
@@ -118,28 +127,56 @@ export function StoryPage() {
     }));
 
     try {
-      await streamTurn(storyId, text, currentMode, (chunk) => {
-        messages = messages.map((message, index) =>
-          index === messages.length - 1 ? { ...message, text: `${message.text}${chunk}` } : message,
+      const result = await streamTurn(
+        storyId,
+        text,
+        currentMode,
+        showUser,
+        (chunk) => {
+          setQueueStatus(null);
+          messages = messages.map((message, index) =>
+            index === messages.length - 1 ? { ...message, text: `${message.text}${chunk}` } : message,
+          );
+          applyStory((current) => ({
+            ...current,
+            messages,
+          }));
+        },
+        (position, etaMs) => {
+          setQueueStatus(`Waiting for the model: position ${position}, about ${Math.ceil(etaMs / 1000)}s.`);
+        },
+      );
+      const reply = messages[messages.length - 1];
+      if (reply && (!reply.text.trim() || result.error)) {
+        messages = messages.map((entry, index) =>
+          index === messages.length - 1
+            ? {
+                ...entry,
+                text: entry.text.trim() || !result.error ? entry.text : `Model error: ${result.error}`,
+                transient: true,
+              }
+            : entry,
         );
         applyStory((current) => ({
           ...current,
           messages,
         }));
-      });
-      await persistMessages(messages);
+      }
+      if (result.error) {
+        setError(`Model error: ${result.error}`);
+      }
     } catch (streamError) {
       const message = streamError instanceof Error ? streamError.message : "Turn failed.";
       messages = messages.map((entry, index) =>
-        index === messages.length - 1 ? { ...entry, text: `Backend error: ${message}` } : entry,
+        index === messages.length - 1 ? { ...entry, text: `Backend error: ${message}`, transient: true } : entry,
       );
       applyStory((current) => ({
         ...current,
         messages,
       }));
       setError(message);
-      await persistMessages(messages);
     } finally {
+      setQueueStatus(null);
       setIsStreaming(false);
       setIsInputOpen(false);
     }
@@ -179,13 +216,12 @@ export function StoryPage() {
         ...current,
         messages: currentMessages,
       }));
+      await popPersistedMessage(lastMessage);
       const lastUser = findLastUser(currentMessages);
       if (lastUser) {
-        await persistMessages(currentMessages);
         await handleSendTurn(lastUser.text, (lastUser.mode as TurnMode) || "story", false);
         return;
       }
-      await persistMessages(currentMessages);
       await handleSendTurn("", "continue", false);
       return;
     }
@@ -203,7 +239,7 @@ export function StoryPage() {
       return;
     }
 
-    messages.pop();
+    const erased = messages.pop();
     applyStory((current) => ({
       ...current,
       messages,
@@ -211,7 +247,9 @@ export function StoryPage() {
 
     setIsSaving(true);
     try {
-      await persistMessages(messages);
+      if (erased) {
+        await popPersistedMessage(erased);
+      }
     } catch (saveError) {
       setError(saveError instanceof Error ? saveError.message : "Unable to persist erased message.");
     } finally {
@@ -266,10 +304,16 @@ export function StoryPage() {
       </section>
 
       {error ? <p className="error-banner">{error}</p> : null}
+      {queueStatus ? <p className="muted">{queueStatus}</p> : null}
 
       <section className="story-layout">
         <div className="story-main">
-          <ChatTranscript messages={story.messages} />
+          <ChatTranscript
+            messages={story.messages}
+            hasEarlier={story.messages_before_position != null}
+            isLoadingEarlier={isLoadingEarlier || isStreaming}
+            onLoadEarlier={() => void handleLoadEarlier()}
+          />
 
           <section className="panel controls">
             {!isInputOpen ? (
@@ -19,6 +19,12 @@ class LoreEntryOut(BaseModel):
     triggers: str = ""
 
 
+class LoreSyncOut(BaseModel):
+    embedded: int
+    unchanged: int
+    deleted: int
+
+
 class LoreSuggestionOut(BaseModel):
     id: str
     kind: str
@@ -73,6 +79,12 @@ class StoryOut(StoryBase):
     id: str
     lore: List[LoreEntryOut] = Field(default_factory=list)
     lore_review: List[LoreSuggestionOut] = Field(default_factory=list)
+    messages_before_position: Optional[int] = None
+
+
+class StoryMessagePage(BaseModel):
+    messages: List[ChatMessage] = Field(default_factory=list)
+    before_position: Optional[int] = None
 
 
 class StorySummary(BaseModel):
@@ -1,28 +1,56 @@
+import base64
+import binascii
+import json
 import logging
 import os
 import threading
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy import or_, update
 from sqlalchemy.orm import Session
 
 from src.backend.api.schemas import (
+    ChatMessage,
     LoreEntryIn,
     LoreEntryOut,
+    LoreSyncOut,
+    StoryCreate,
     StoryGenerateJobResponse,
     StoryGenerateJobStatus,
     StoryGenerateRequest,
     StoryGenerateResponse,
-    StoryCreate,
+    StoryMessagePage,
     StoryOut,
     StorySummary,
     StoryUpdate,
 )
-from src.backend.infrastructure.embeddings import build_lore_text
-from src.backend.infrastructure.db import get_db
+from src.backend.application.lore_indexer import DELETE, LoreIndexer, enqueue_lore_index
+from src.backend.application.story_generator import GeneratedStory, generate_story_blueprint
+from src.backend.application.summarizer import resolve_summary_prompt_key
+from src.backend.application.use_cases.lore import sync_lore_index
+from src.backend.application.use_cases.stories import (
+    STORY_DETAIL_LOAD,
+    STORY_SUMMARY_LOAD,
+    STORY_TRANSCRIPT_LOAD,
+    DbStoryRepository,
+)
 from src.backend.application.vectorstores.lore_vectorstore import LoreVectorStore
+from src.backend.infrastructure.db import get_db
+from src.backend.infrastructure.embeddings import build_lore_text
 from src.backend.infrastructure.langchain_clients import (
+    get_chat_model,
     get_embedding_model,
     get_story_generator_model,
     get_story_generator_repair_model,
@@ -34,11 +62,10 @@ from src.backend.infrastructure.models import (
     StoryModel,
     StorySummaryModel,
 )
-from src.backend.application.summarizer import resolve_summary_prompt_key
-from src.backend.application.story_generator import GeneratedStory, generate_story_blueprint
-from src.backend.infrastructure.langchain_clients import get_chat_model
 
 router = APIRouter(prefix="/stories", tags=["stories"])
+MESSAGE_PAGE_MAX = 500
+STORY_PAGE_MAX = 200
 
 _generator_jobs: dict[str, dict] = {}
 _TRANSIENT_ASSISTANT_PREFIXES = (
@@ -98,7 +125,13 @@ def _lore_metadata(entry: LoreEntryModel) -> dict:
     }
 
 
-def _story_to_out(story: StoryModel) -> StoryOut:
+def _story_to_out(
+    story: StoryModel,
+    messages: List[StoryMessageModel] | None = None,
+    messages_before_position: Optional[int] = None,
+) -> StoryOut:
+    if messages is None:
+        messages = story.messages or []
     return StoryOut(
         id=story.id,
         title=story.title,
@@ -110,7 +143,8 @@ def _story_to_out(story: StoryModel) -> StoryOut:
         author_note=story.author_note or "",
         description=story.description or "",
         tags=list(story.tags or []),
-        messages=[msg.to_payload() for msg in (story.messages or [])],
+        messages=[msg.to_payload() for msg in messages],
+        messages_before_position=messages_before_position,
         lore=[_lore_to_out(entry) for entry in story.lore_entries],
         lore_review=[
             {
@@ -130,59 +164,60 @@ def _story_to_out(story: StoryModel) -> StoryOut:
     )
 
 
-def _compute_lore_vector(entry_id: str, story_id: str, text: str, metadata: dict) -> None:
-    logger = logging.getLogger("backend")
-    try:
-        embedder = get_embedding_model()
-        embedding = embedder.embed_query(text)
-        if not embedding:
-            logger.warning("lore_vector_embedding_failed entry_id=%s", entry_id)
-            return
-        expected_dim = int(os.getenv("EMBED_DIM", "768"))
-        if embedding and len(embedding) != expected_dim:
-            logger.error( "Lore Embeddings Dimension mismatch: got %d, expected %d", len(embedding), expected_dim)
-            embedding = None
-            return
-    except Exception:
-        logger.exception("Lore Embeddings Failed entry_id=%s", entry_id)
-        return
-    payload = {
-        "story_id": story_id,
-        "content": text,
-        "metadata": metadata,
-    }
-    logger.debug( "lore_qdrant_upsert   entry_id=%s story_id=%s title=%s content_len=%d", entry_id, story_id, metadata.get("title", ""), len(text or ""), )
-    store = LoreVectorStore(embedder, story_id, vector_size=int(os.getenv("EMBED_DIM", "768")))
-    store.upsert_lore(entry_id, embedding, payload)
+def _load_story(
+    db: Session, story_id: str, load: tuple = STORY_DETAIL_LOAD + STORY_TRANSCRIPT_LOAD
+) -> StoryModel:
+    story = DbStoryRepository(db=db).get_story(story_id, load)
+    if not story:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    return story
+
+
+def _story_detail(
+    db: Session, story_id: str, messages_limit: Optional[int] = None
+) -> tuple[StoryModel, StoryOut]:
+    if messages_limit is None:
+        story = _load_story(db, story_id)
+        return story, _story_to_out(story)
+    story = _load_story(db, story_id, STORY_DETAIL_LOAD)
+    messages, before_position = DbStoryRepository(db=db).message_window(story_id, messages_limit)
+    return story, _story_to_out(story, messages, before_position)
+
+
+def _story_etag(version: int, messages_limit: Optional[int] = None) -> str:
+    return f'"v{version}-{messages_limit or "all"}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
 
+def _cache_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
 
-def _queue_vector(background_tasks: BackgroundTasks | None, entry_id: str, story_id: str, text: str, metadata: dict) -> None:
-    if background_tasks is None:
-        return
-    background_tasks.add_task(_compute_lore_vector, entry_id, story_id, text, metadata)
 
+def get_lore_indexer(request: Request) -> LoreIndexer | None:
+    return getattr(request.app.state, "lore_indexer", None)
 
-def _apply_lore(story: StoryModel, lore: List[LoreEntryIn], db: Session) -> List[tuple[str, str, dict]]:
+
+LORE_INDEXER_DEPENDENCY = Depends(get_lore_indexer)
+
+
+def _notify_lore_indexer(indexer: LoreIndexer | None) -> None:
+    if indexer is not None:
+        indexer.notify()
+
+
+def _apply_lore(story: StoryModel, lore: List[LoreEntryIn], db: Session) -> None:
     existing_ids = {entry.id for entry in story.lore_entries}
     story.lore_entries.clear()
-    tasks: List[tuple[str, str, dict]] = []
     new_ids: set[str] = set()
     for entry in lore:
         entry_id = entry.id or str(uuid4())
         new_ids.add(entry_id)
-        text = build_lore_text(
-            entry.title,
-            entry.tag,
-            entry.triggers or "",
-            entry.description or "",
-        )
-        metadata = {
-            "lore_id": entry_id,
-            "title": entry.title,
-            "tag": entry.tag,
-            "description": entry.description or "",
-            "triggers": entry.triggers or "",
-        }
         story.lore_entries.append(
             LoreEntryModel(
                 id=entry_id,
@@ -192,13 +227,9 @@ def _apply_lore(story: StoryModel, lore: List[LoreEntryIn], db: Session) -> List
                 triggers=entry.triggers or "",
             )
         )
-        tasks.append((entry_id, text, metadata))
-    removed_ids = existing_ids - new_ids
-    if removed_ids and story.id:
-        store = LoreVectorStore(get_embedding_model(), story.id, vector_size=int(os.getenv("EMBED_DIM", "768")))
-        for lore_id in removed_ids:
-            store.delete_by_lore_id(lore_id)
-    return tasks
+        enqueue_lore_index(db, story.id, entry_id)
+    for lore_id in existing_ids - new_ids:
+        enqueue_lore_index(db, story.id, lore_id, DELETE)
 
 
 def _message_value(msg, key: str, default=None):
@@ -241,43 +272,108 @@ def _is_transient_assistant_message(message: StoryMessageModel) -> bool:
     return any(text.startswith(prefix) for prefix in _TRANSIENT_ASSISTANT_PREFIXES)
 
 
-def _cleanup_transient_story_messages(story: StoryModel, db: Session | None = None) -> bool:
+def cleanup_transient_messages(db: Session) -> int:
+    candidates = (
+        db.query(StoryMessageModel.story_id)
+        .filter(
+            StoryMessageModel.role == "assistant",
+            or_(
+                *(
+                    StoryMessageModel.text.contains(prefix, autoescape=True)
+                    for prefix in _TRANSIENT_ASSISTANT_PREFIXES
+                )
+            ),
+        )
+        .distinct()
+        .all()
+    )
+    cleaned = 0
+    for (story_id,) in candidates:
+        story = _load_story(db, story_id, STORY_SUMMARY_LOAD + STORY_TRANSCRIPT_LOAD)
+        if _cleanup_transient_story_messages(story, db):
+            cleaned += 1
+    logging.getLogger("backend").debug(
+        "transient_messages_cleaned candidates=%d stories=%d", len(candidates), cleaned
+    )
+    return cleaned
+
+
+def _cleanup_transient_story_messages(story: StoryModel, db: Session) -> bool:
     transient_ids = [message.id for message in story.messages if _is_transient_assistant_message(message)]
     if not transient_ids:
         return False
 
     story.messages = [message for message in story.messages if message.id not in transient_ids]
-    for position, message in enumerate(story.messages):
-        message.position = position
+    moves = [
+        {"id": message.id, "position": position}
+        for position, message in enumerate(story.messages)
+        if message.position != position
+    ]
 
     summary_record = _ensure_summary(story)
     summary_record.last_position = len(story.messages) - 1 if story.messages else -1
 
-    if db is not None:
-        db.commit()
-        db.refresh(story)
+    # (story_id, position) is unique: delete first, then move rows down in ascending order.
+    db.flush()
+    if moves:
+        db.execute(update(StoryMessageModel), moves)
+    db.commit()
+    db.refresh(story)
     return True
 
 
 def _apply_messages(story: StoryModel, messages: List) -> None:
     normalized_messages = _normalize_persisted_messages(messages)
-    story.messages.clear()
+    existing = list(story.messages)
+    first_changed = min(len(existing), len(normalized_messages))
+    # Rewrite rows in place: (story_id, position) is unique, and only changed rows get written.
     for position, msg in enumerate(normalized_messages):
-        story.messages.append(
-            StoryMessageModel(
-                role=str(_message_value(msg, "role", "")).strip(),
-                text=str(_message_value(msg, "text", "") or ""),
-                mode=_message_value(msg, "mode", None),
-                position=position,
-            )
-        )
+        values = {
+            "role": str(_message_value(msg, "role", "")).strip(),
+            "text": str(_message_value(msg, "text", "") or ""),
+            "mode": _message_value(msg, "mode", None),
+            "position": position,
+        }
+        if position >= len(existing):
+            story.messages.append(StoryMessageModel(**values))
+            continue
+        for key, value in values.items():
+            if getattr(existing[position], key) != value:
+                setattr(existing[position], key, value)
+                first_changed = min(first_changed, position)
+    del story.messages[len(normalized_messages) :]
+    # Appended turns are left for the summary job; only edits to summarized turns rewind it.
     summary_record = _ensure_summary(story)
-    summary_record.last_position = len(normalized_messages) - 1 if normalized_messages else -1
+    summary_record.last_position = min(summary_record.last_position, first_changed - 1)
+
+
+def _encode_cursor(key: tuple[datetime, str]) -> str:
+    raw = json.dumps([key[0].isoformat(), key[1]]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        updated_at, story_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(updated_at), str(story_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from exc
 
 
 @router.get("", response_model=List[StorySummary])
-def list_stories(db: Session = Depends(get_db)) -> List[StorySummary]:
-    stories = db.query(StoryModel).order_by(StoryModel.updated_at.desc()).all()
+def list_stories(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=STORY_PAGE_MAX),
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    db: Session = Depends(get_db),
+) -> List[StorySummary]:
+    after = _decode_cursor(cursor) if cursor else None
+    stories, next_key = DbStoryRepository(db=db).list_stories(limit, after, tag)
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = _encode_cursor(next_key)
     return [
         StorySummary(
             id=story.id,
@@ -293,10 +389,11 @@ def list_stories(db: Session = Depends(get_db)) -> List[StorySummary]:
 def create_story(
     payload: StoryCreate,
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
 ) -> StoryOut:
     summary_prompt_key = payload.summary_prompt_key or resolve_summary_prompt_key(payload.ai_instruction_key)
     story = StoryModel(
+        id=str(uuid4()),
         title=payload.title.strip() or "Untitled Story",
         ai_instruction_key=payload.ai_instruction_key,
         ai_instructions=payload.ai_instructions,
@@ -306,29 +403,34 @@ def create_story(
         description=payload.description or "",
         tags=list(payload.tags or []),
     )
-    _ensure_summary(story, payload.plot_summary or "")
+    summary_record = _ensure_summary(story, payload.plot_summary or "")
     if payload.messages:
         _apply_messages(story, payload.messages)
-    tasks = _apply_lore(story, payload.lore or [], db)
+        summary_record.last_position = len(story.messages) - 1
+    _apply_lore(story, payload.lore or [], db)
     db.add(story)
     db.commit()
-    db.refresh(story)
-    for entry_id, text, metadata in tasks:
-        _queue_vector(background_tasks, entry_id, story.id, text, metadata)
-    return _story_to_out(story)
+    _notify_lore_indexer(indexer)
+    return _story_to_out(_load_story(db, story.id))
 
 
 @router.get("/{story_id}", response_model=StoryOut)
 def get_story(
     story_id: str,
+    request: Request,
+    response: Response,
+    messages_limit: Optional[int] = Query(None, ge=1, le=MESSAGE_PAGE_MAX),
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
 ) -> StoryOut:
-    story = db.query(StoryModel).filter(StoryModel.id == story_id).first()
-    if not story:
+    version = db.query(StoryModel.version).filter(StoryModel.id == story_id).scalar()
+    if version is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
-    _cleanup_transient_story_messages(story, db)
-    return _story_to_out(story)
+    etag = _story_etag(version, messages_limit)
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_cache_headers(etag))
+    story, out = _story_detail(db, story_id, messages_limit)
+    response.headers.update(_cache_headers(_story_etag(story.version, messages_limit)))
+    return out
 
 
 @router.post("/generate", response_model=StoryGenerateJobResponse)
@@ -362,21 +464,30 @@ def get_generate_job(job_id: str) -> StoryGenerateJobStatus:
     return _job_to_response(job_id, job)
 
 
-@router.post("/{story_id}/lore/sync", status_code=status.HTTP_204_NO_CONTENT)
-def sync_story_lore(story_id: str, db: Session = Depends(get_db)) -> None:
+@router.post("/{story_id}/lore/sync", response_model=LoreSyncOut)
+def sync_story_lore(story_id: str, db: Session = Depends(get_db)) -> LoreSyncOut:
     story = db.query(StoryModel).filter(StoryModel.id == story_id).first()
     if not story:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
-    if not story.lore_entries:
-        return None
     embedder = get_embedding_model()
     store = LoreVectorStore(embedder, story_id, vector_size=int(os.getenv("EMBED_DIM", "768")))
-    texts: list[str] = []
-    metadatas: list[dict] = []
-    for entry in story.lore_entries:
-        texts.append(build_lore_text(entry.title, entry.tag, entry.triggers or "", entry.description or ""))
-        metadatas.append(_lore_metadata(entry))
-    store.add_texts(texts, metadatas=metadatas)
+    entries = [
+        (
+            entry.id,
+            build_lore_text(entry.title, entry.tag, entry.triggers or "", entry.description or ""),
+            _lore_metadata(entry),
+        )
+        for entry in story.lore_entries
+    ]
+    result = sync_lore_index(store, entries)
+    logging.getLogger("backend").debug(
+        "lore_sync story_id=%s embedded=%d unchanged=%d deleted=%d",
+        story_id,
+        result.embedded,
+        result.unchanged,
+        result.deleted,
+    )
+    return LoreSyncOut(embedded=result.embedded, unchanged=result.unchanged, deleted=result.deleted)
 
 
 @router.post("/{story_id}/lore/review/{suggestion_id}/accept", status_code=status.HTTP_204_NO_CONTENT)
@@ -384,10 +495,9 @@ def accept_lore_suggestion(
     story_id: str,
     suggestion_id: str,
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
 ) -> None:
-    story = db.query(StoryModel).filter(StoryModel.id == story_id).first()
-    if not story:
+    if not db.query(StoryModel.id).filter(StoryModel.id == story_id).first():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
     suggestion = (
         db.query(LoreSuggestionModel)
@@ -418,34 +528,30 @@ def accept_lore_suggestion(
             entry_to_upsert = target
         else:
             entry = LoreEntryModel(
+                story_id=story_id,
                 title=suggestion.title,
                 description=suggestion.description or "",
                 tag=suggestion.tag,
                 triggers=suggestion.triggers or "",
             )
-            story.lore_entries.append(entry)
+            db.add(entry)
             entry_to_upsert = entry
     else:
         entry = LoreEntryModel(
+            story_id=story_id,
             title=suggestion.title,
             description=suggestion.description or "",
             tag=suggestion.tag,
             triggers=suggestion.triggers or "",
         )
-        story.lore_entries.append(entry)
+        db.add(entry)
         entry_to_upsert = entry
     suggestion.status = "accepted"
-    db.commit()
-    db.refresh(story)
-
     if entry_to_upsert:
-        text = build_lore_text(
-            entry_to_upsert.title,
-            entry_to_upsert.tag,
-            entry_to_upsert.triggers or "",
-            entry_to_upsert.description or "",
-        )
-        _queue_vector(background_tasks, entry_to_upsert.id, story_id, text, _lore_metadata(entry_to_upsert))
+        db.flush()
+        enqueue_lore_index(db, story_id, entry_to_upsert.id)
+    db.commit()
+    _notify_lore_indexer(indexer)
     return None
 
 
@@ -475,12 +581,12 @@ def reject_lore_suggestion(
 def update_story(
     story_id: str,
     payload: StoryUpdate,
+    response: Response,
+    messages_limit: Optional[int] = Query(None, ge=1, le=MESSAGE_PAGE_MAX),
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
 ) -> StoryOut:
-    story = db.query(StoryModel).filter(StoryModel.id == story_id).first()
-    if not story:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    story = _load_story(db, story_id, STORY_SUMMARY_LOAD)
     if payload.title is not None:
         story.title = payload.title.strip() or "Untitled Story"
     if payload.ai_instruction_key is not None:
@@ -504,23 +610,75 @@ def update_story(
     if payload.messages is not None:
         _apply_messages(story, payload.messages)
     if payload.lore is not None:
-        tasks = _apply_lore(story, payload.lore, db)
-    else:
-        tasks = []
+        _apply_lore(story, payload.lore, db)
     db.commit()
-    db.refresh(story)
-    for entry_id, text, metadata in tasks:
-        _queue_vector(background_tasks, entry_id, story.id, text, metadata)
-    return _story_to_out(story)
+    if payload.lore is not None:
+        _notify_lore_indexer(indexer)
+    story, out = _story_detail(db, story_id, messages_limit)
+    response.headers.update(_cache_headers(_story_etag(story.version, messages_limit)))
+    return out
 
 
 @router.delete("/{story_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_story(story_id: str, db: Session = Depends(get_db)) -> None:
+def delete_story(
+    story_id: str,
+    db: Session = Depends(get_db),
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
+) -> None:
     story = db.query(StoryModel).filter(StoryModel.id == story_id).first()
     if not story:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    for entry in story.lore_entries:
+        enqueue_lore_index(db, story_id, entry.id, DELETE)
     db.delete(story)
     db.commit()
+    _notify_lore_indexer(indexer)
+
+
+@router.get("/{story_id}/messages", response_model=StoryMessagePage)
+def list_messages(
+    story_id: str,
+    before_position: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=MESSAGE_PAGE_MAX),
+    db: Session = Depends(get_db),
+) -> StoryMessagePage:
+    if not db.query(StoryModel.id).filter(StoryModel.id == story_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    messages, cursor = DbStoryRepository(db=db).message_window(story_id, limit, before_position)
+    return StoryMessagePage(
+        messages=[ChatMessage(**msg.to_payload()) for msg in messages], before_position=cursor
+    )
+
+
+@router.post(
+    "/{story_id}/messages", response_model=ChatMessage, status_code=status.HTTP_201_CREATED
+)
+def append_message(
+    story_id: str, payload: ChatMessage, db: Session = Depends(get_db)
+) -> ChatMessage:
+    repo = DbStoryRepository(db=db)
+    if not db.query(StoryModel.id).filter(StoryModel.id == story_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    normalized = _normalize_persisted_messages([payload])
+    if not normalized:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Message is not persistable"
+        )
+    repo.append_and_commit(story_id, normalized)
+    return ChatMessage(**normalized[0])
+
+
+@router.delete("/{story_id}/messages/last", response_model=ChatMessage)
+def pop_message(story_id: str, db: Session = Depends(get_db)) -> ChatMessage:
+    repo = DbStoryRepository(db=db)
+    if not db.query(StoryModel.id).filter(StoryModel.id == story_id).first():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    message = repo.pop_message(story_id)
+    if message is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Message not found")
+    payload = message.to_payload()
+    repo.commit()
+    return ChatMessage(**payload)
 
 
 @router.get("/{story_id}/lore", response_model=List[LoreEntryOut])
@@ -540,29 +698,23 @@ def add_lore(
     story_id: str,
     payload: LoreEntryIn,
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
 ) -> LoreEntryOut:
-    story = db.query(StoryModel).filter(StoryModel.id == story_id).first()
-    if not story:
+    if not db.query(StoryModel.id).filter(StoryModel.id == story_id).first():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
-    text = build_lore_text(
-        payload.title,
-        payload.tag,
-        payload.triggers or "",
-        payload.description or "",
-    )
     entry = LoreEntryModel(
         id=payload.id or str(uuid4()),
+        story_id=story_id,
         title=payload.title,
         description=payload.description or "",
         tag=payload.tag,
         triggers=payload.triggers or "",
-        story=story,
     )
     db.add(entry)
+    enqueue_lore_index(db, story_id, entry.id)
     db.commit()
     db.refresh(entry)
-    _queue_vector(background_tasks, entry.id, story.id, text, _lore_metadata(entry))
+    _notify_lore_indexer(indexer)
     return _lore_to_out(entry)
 
 
@@ -572,7 +724,7 @@ def update_lore(
     entry_id: str,
     payload: LoreEntryIn,
     db: Session = Depends(get_db),
-    background_tasks: BackgroundTasks = None,
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
 ) -> LoreEntryOut:
     entry = (
         db.query(LoreEntryModel)
@@ -585,20 +737,20 @@ def update_lore(
     entry.description = payload.description or ""
     entry.tag = payload.tag
     entry.triggers = payload.triggers or ""
+    enqueue_lore_index(db, story_id, entry.id)
     db.commit()
     db.refresh(entry)
-    text = build_lore_text(
-        payload.title,
-        payload.tag,
-        payload.triggers or "",
-        payload.description or "",
-    )
-    _queue_vector(background_tasks, entry.id, story_id, text, _lore_metadata(entry))
+    _notify_lore_indexer(indexer)
     return _lore_to_out(entry)
 
 
 @router.delete("/{story_id}/lore/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_lore(story_id: str, entry_id: str, db: Session = Depends(get_db)) -> None:
+def delete_lore(
+    story_id: str,
+    entry_id: str,
+    db: Session = Depends(get_db),
+    indexer: LoreIndexer | None = LORE_INDEXER_DEPENDENCY,
+) -> None:
     entry = (
         db.query(LoreEntryModel)
         .filter(LoreEntryModel.story_id == story_id, LoreEntryModel.id == entry_id)
@@ -606,7 +758,7 @@ def delete_lore(story_id: str, entry_id: str, db: Session = Depends(get_db)) ->
     )
     if not entry:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Lore entry not found")
-    store = LoreVectorStore(get_embedding_model(), story_id, vector_size=int(os.getenv("EMBED_DIM", "768")))
-    store.delete_by_lore_id(entry_id)
+    enqueue_lore_index(db, story_id, entry_id, DELETE)
     db.delete(entry)
     db.commit()
+    _notify_lore_indexer(indexer)
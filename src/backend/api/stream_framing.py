@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable
+from contextlib import suppress
+
+from src.backend.application.ports import LoggerProtocol
+from src.backend.application.turn_events import TurnEvent
+
+DISCONNECT_POLL_SECONDS = 0.5
+
+STREAM_MEDIA_TYPES = {
+    "text": "text/plain",
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def frame_event(event: TurnEvent, stream_format: str) -> str:
+    if stream_format == "ndjson":
+        return json.dumps({"type": event.type, **event.data}, ensure_ascii=False) + "\n"
+    if stream_format == "sse":
+        return f"event: {event.type}\ndata: {json.dumps(event.data, ensure_ascii=False)}\n\n"
+    if event.type == "delta":
+        return event.data["text"]
+    if event.type == "error":
+        return f"\n[Ollama error: {event.data['message']}]"
+    return ""
+
+
+async def frame_events(
+    events: AsyncIterable[TurnEvent],
+    stream_format: str,
+) -> AsyncIterator[str]:
+    async for event in events:
+        chunk = frame_event(event, stream_format)
+        if chunk:
+            yield chunk
+
+
+async def stop_on_disconnect(
+    events: AsyncIterable[TurnEvent],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    logger: LoggerProtocol,
+    poll_seconds: float = DISCONNECT_POLL_SECONDS,
+) -> AsyncIterator[TurnEvent]:
+    loop = asyncio.get_running_loop()
+    iterator = aiter(events)
+    pending: asyncio.Future | None = None
+    next_check = loop.time() + poll_seconds
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+            done, _ = await asyncio.wait({pending}, timeout=max(0.0, next_check - loop.time()))
+            if loop.time() >= next_check:
+                next_check = loop.time() + poll_seconds
+                if await is_disconnected():
+                    logger.debug("turn_client_disconnected")
+                    return
+            if not done:
+                continue
+            finished, pending = pending, None
+            try:
+                event = finished.result()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        if pending is not None:
+            pending.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await pending
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            await aclose()
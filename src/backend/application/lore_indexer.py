@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from src.backend.application.ports import EmbeddingsProtocol, LoggerProtocol
+from src.backend.application.use_cases.turn_models import lore_document
+from src.backend.application.vectorstores.lore_vectorstore import LoreVectorStore
+from src.backend.infrastructure.db import SessionLocal
+from src.backend.infrastructure.langchain_clients import get_embedding_model
+from src.backend.infrastructure.models import LoreEntryModel, LoreIndexOutboxModel
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+@dataclass(frozen=True)
+class LoreIndexerSettings:
+    batch_size: int = 32
+    vector_size: int = 768
+    base_backoff_seconds: float = 2.0
+    max_backoff_seconds: float = 300.0
+    max_attempts: int = 10
+
+
+@dataclass(frozen=True)
+class LoreIndexBacklog:
+    pending: int
+    failed: int
+
+
+@dataclass(frozen=True)
+class _IndexBatch:
+    row_ids: list[int]
+    upserts: dict[str, list[tuple[str, dict]]]
+    deletes: dict[str, list[str]]
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def enqueue_lore_index(db: Session, story_id: str, lore_id: str, op: str = UPSERT) -> None:
+    db.add(
+        LoreIndexOutboxModel(
+            story_id=story_id,
+            lore_id=lore_id,
+            op=op,
+            next_attempt_at=_utcnow(),
+        )
+    )
+
+
+class LoreIndexer:
+    def __init__(
+        self,
+        settings: LoreIndexerSettings,
+        logger: LoggerProtocol,
+        session_factory: Callable[[], Session] = SessionLocal,
+        embeddings_factory: Callable[[], EmbeddingsProtocol] = get_embedding_model,
+        store_factory: Callable[[EmbeddingsProtocol, str], LoreVectorStore] | None = None,
+        clock: Callable[[], datetime] = _utcnow,
+    ) -> None:
+        self._settings = settings
+        self._logger = logger
+        self._session_factory = session_factory
+        self._embeddings_factory = embeddings_factory
+        self._store_factory = store_factory or self._default_store
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = False
+
+    def notify(self) -> None:
+        self._wake.set()
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        thread = threading.Thread(target=self._run, daemon=True)
+        thread.start()
+
+    def backlog(self) -> LoreIndexBacklog:
+        with self._session_factory() as db:
+            rows = (
+                db.query(
+                    LoreIndexOutboxModel.attempts >= self._settings.max_attempts,
+                    func.count(LoreIndexOutboxModel.id),
+                )
+                .group_by(LoreIndexOutboxModel.attempts >= self._settings.max_attempts)
+                .all()
+            )
+        counts = {bool(failed): count for failed, count in rows}
+        return LoreIndexBacklog(pending=counts.get(False, 0), failed=counts.get(True, 0))
+
+    def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                if self.drain_once():
+                    continue
+                delay = self._seconds_until_retry()
+            except Exception:
+                self._logger.exception("lore_index_drain_failed")
+                delay = self._settings.base_backoff_seconds
+            with self._lock:
+                if delay is None and not self._wake.is_set():
+                    self._running = False
+                    return
+            self._wake.wait(delay)
+
+    def drain_once(self) -> int:
+        batch = self._load_batch()
+        if batch is None:
+            return 0
+        try:
+            self._apply(batch)
+        except Exception as exc:
+            self._record_failure(batch, exc)
+            return len(batch.row_ids)
+        with self._session_factory() as db:
+            db.query(LoreIndexOutboxModel).filter(
+                LoreIndexOutboxModel.id.in_(batch.row_ids)
+            ).delete(synchronize_session=False)
+            db.commit()
+        self._logger.debug(
+            "lore_index_batch rows=%d upserted=%d deleted=%d",
+            len(batch.row_ids),
+            sum(len(items) for items in batch.upserts.values()),
+            sum(len(ids) for ids in batch.deletes.values()),
+        )
+        return len(batch.row_ids)
+
+    def _load_batch(self) -> _IndexBatch | None:
+        with self._session_factory() as db:
+            rows = (
+                db.query(LoreIndexOutboxModel)
+                .filter(
+                    LoreIndexOutboxModel.attempts < self._settings.max_attempts,
+                    LoreIndexOutboxModel.next_attempt_at <= self._clock(),
+                )
+                .order_by(LoreIndexOutboxModel.id)
+                .limit(self._settings.batch_size)
+                .all()
+            )
+            if not rows:
+                return None
+            targets = {(row.story_id, row.lore_id) for row in rows}
+            entries = {
+                entry.id: entry
+                for entry in db.query(LoreEntryModel)
+                .filter(LoreEntryModel.id.in_({lore_id for _, lore_id in targets}))
+                .all()
+            }
+            upserts: dict[str, list[tuple[str, dict]]] = {}
+            deletes: dict[str, list[str]] = {}
+            # The outbox only names what changed; the current row decides what to index.
+            for story_id, lore_id in sorted(targets):
+                entry = entries.get(lore_id)
+                if entry is not None and entry.story_id == story_id:
+                    document = lore_document(entry)
+                    item = (document.page_content, document.metadata)
+                    upserts.setdefault(story_id, []).append(item)
+                else:
+                    deletes.setdefault(story_id, []).append(lore_id)
+            return _IndexBatch([row.id for row in rows], upserts, deletes)
+
+    def _apply(self, batch: _IndexBatch) -> None:
+        embeddings = self._embeddings_factory()
+        story_ids = sorted(set(batch.upserts) | set(batch.deletes))
+        documents = [item for story_id in story_ids for item in batch.upserts.get(story_id, [])]
+        vectors = embeddings.embed_documents([text for text, _ in documents]) if documents else []
+        for vector in vectors:
+            if len(vector) != self._settings.vector_size:
+                raise ValueError(
+                    f"Embedding dimension mismatch: got {len(vector)}, "
+                    f"expected {self._settings.vector_size}"
+                )
+        offset = 0
+        for story_id in story_ids:
+            store = self._store_factory(embeddings, story_id)
+            items = batch.upserts.get(story_id, [])
+            store.upsert_vectors(
+                [
+                    (text, metadata, vector)
+                    for (text, metadata), vector in zip(
+                        items, vectors[offset : offset + len(items)], strict=True
+                    )
+                ]
+            )
+            offset += len(items)
+            store.delete_points(batch.deletes.get(story_id, []))
+
+    def _record_failure(self, batch: _IndexBatch, exc: Exception) -> None:
+        now = self._clock()
+        with self._session_factory() as db:
+            rows = (
+                db.query(LoreIndexOutboxModel)
+                .filter(LoreIndexOutboxModel.id.in_(batch.row_ids))
+                .all()
+            )
+            for row in rows:
+                row.attempts += 1
+                row.last_error = str(exc)[:1000]
+                row.next_attempt_at = now + timedelta(seconds=self._backoff_seconds(row.attempts))
+            db.commit()
+        self._logger.exception("lore_index_batch_failed rows=%d", len(batch.row_ids))
+
+    def _backoff_seconds(self, attempts: int) -> float:
+        return min(
+            self._settings.max_backoff_seconds,
+            self._settings.base_backoff_seconds * 2 ** (attempts - 1),
+        )
+
+    def _seconds_until_retry(self) -> float | None:
+        with self._session_factory() as db:
+            next_attempt_at = (
+                db.query(func.min(LoreIndexOutboxModel.next_attempt_at))
+                .filter(LoreIndexOutboxModel.attempts < self._settings.max_attempts)
+                .scalar()
+            )
+        if next_attempt_at is None:
+            return None
+        return max(0.0, (next_attempt_at - self._clock()).total_seconds())
+
+    def _default_store(self, embeddings: EmbeddingsProtocol, story_id: str) -> LoreVectorStore:
+        return LoreVectorStore(embeddings, story_id, vector_size=self._settings.vector_size)
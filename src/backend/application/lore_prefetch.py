@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from langchain_core.documents import Document
+
+from src.backend.application.ports import LoggerProtocol
+from src.backend.application.use_cases.lore import LoreRepository
+
+PREFETCH_QUERY_CHARS = 2000
+
+
+@dataclass(frozen=True)
+class _Prefetched:
+    lore_ids: list[str]
+    fetched_at: float
+
+
+class LorePrefetcher:
+    def __init__(
+        self,
+        logger: LoggerProtocol,
+        ttl_seconds: float = 600.0,
+        max_stories: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._logger = logger
+        self._ttl_seconds = ttl_seconds
+        self._max_stories = max_stories
+        self._clock = clock
+        self._prefetched: OrderedDict[str, _Prefetched] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    def schedule(self, lore_repo: LoreRepository, story_id: str, reply: str) -> None:
+        if not reply.strip():
+            return
+        task = asyncio.get_running_loop().create_task(self.prefetch(lore_repo, story_id, reply))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def prefetch(self, lore_repo: LoreRepository, story_id: str, reply: str) -> None:
+        start = self._clock()
+        try:
+            entries = await lore_repo.aretrieve(story_id, reply[-PREFETCH_QUERY_CHARS:])
+        except Exception:
+            self._logger.exception("lore_prefetch_failed story_id=%s", story_id)
+            return
+        lore_ids = [str(entry.metadata.get("lore_id") or "") for entry in entries]
+        lore_ids = [lore_id for lore_id in lore_ids if lore_id]
+        self._prefetched[story_id] = _Prefetched(lore_ids, start)
+        self._prefetched.move_to_end(story_id)
+        while len(self._prefetched) > self._max_stories:
+            self._prefetched.popitem(last=False)
+        self._logger.debug(
+            "lore_prefetched story_id=%s hits=%d duration_ms=%d",
+            story_id,
+            len(entries),
+            int((self._clock() - start) * 1000),
+        )
+
+    def candidates(self, story_id: str, current: list[Document]) -> list[Document]:
+        prefetched = self._prefetched.get(story_id)
+        if prefetched is None:
+            return []
+        if self._clock() - prefetched.fetched_at > self._ttl_seconds:
+            del self._prefetched[story_id]
+            return []
+        by_id = {str(entry.metadata.get("lore_id") or ""): entry for entry in current}
+        return [by_id[lore_id] for lore_id in prefetched.lore_ids if lore_id in by_id]
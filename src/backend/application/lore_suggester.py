@@ -126,24 +126,24 @@ def save_suggestions(
     db_session,
 ) -> int:
     title_map = _existing_title_map(existing_entries)
+    pending = {
+        (kind, title)
+        for kind, title in db_session.query(LoreSuggestionModel.kind, LoreSuggestionModel.title)
+        .filter(
+            LoreSuggestionModel.story_id == story_id,
+            LoreSuggestionModel.status == "pending",
+        )
+        .all()
+    }
     created = 0
     for suggestion in suggestions:
         if suggestion.confidence < 0.6:
             continue
         normalized = _normalize_title(suggestion.title)
         target_id = suggestion.target_lore_id or title_map.get(normalized)
-        exists = (
-            db_session.query(LoreSuggestionModel)
-            .filter(
-                LoreSuggestionModel.story_id == story_id,
-                LoreSuggestionModel.title == suggestion.title,
-                LoreSuggestionModel.kind == suggestion.kind,
-                LoreSuggestionModel.status == "pending",
-            )
-            .first()
-        )
-        if exists:
+        if (suggestion.kind, suggestion.title) in pending:
             continue
+        pending.add((suggestion.kind, suggestion.title))
         db_session.add(
             LoreSuggestionModel(
                 story_id=story_id,
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterable
+
+from langchain_core.documents import Document
+
+MIN_TRIGGER_CHARS = 2
+
+
+def lore_keywords(title: str, triggers: str) -> list[str]:
+    keywords = [title, *triggers.split(",")]
+    return [word.strip() for word in keywords if len(word.strip()) >= MIN_TRIGGER_CHARS]
+
+
+class TriggerMatcher:
+    def __init__(self, keywords: dict[str, list[str]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[str, int]]] = [[]]
+        for lore_id, words in keywords.items():
+            for word in words:
+                self._add(lore_id, word.casefold())
+        self._link()
+
+    def find(self, text: str) -> dict[str, int]:
+        text = text.casefold()
+        found: dict[str, int] = {}
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for lore_id, length in self._out[node]:
+                start = index - length + 1
+                if lore_id in found or not _on_word_boundary(text, start, index + 1):
+                    continue
+                found[lore_id] = start
+        return found
+
+    def _add(self, lore_id: str, word: str) -> None:
+        node = 0
+        for char in word:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto[node][char] = child
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = child
+        self._out[node].append((lore_id, len(word)))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not before.isalnum() and not after.isalnum()
+
+
+class LoreTriggerIndex:
+    def __init__(self, max_stories: int = 64) -> None:
+        self._max_stories = max_stories
+        self._matchers: OrderedDict[str, tuple[int, TriggerMatcher]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def match(self, story_id: str, entries: list[Document], texts: Iterable[str]) -> list[Document]:
+        if not entries:
+            return []
+        matcher = self._matcher(story_id, entries)
+        # One pass over all texts; earlier texts rank first.
+        hits = matcher.find("\n".join(text for text in texts if text))
+        by_id = {str(entry.metadata.get("lore_id")): entry for entry in entries}
+        return [by_id[lore_id] for lore_id in sorted(hits, key=hits.__getitem__)]
+
+    def _matcher(self, story_id: str, entries: list[Document]) -> TriggerMatcher:
+        keywords = {
+            str(entry.metadata.get("lore_id")): lore_keywords(
+                str(entry.metadata.get("title") or ""),
+                str(entry.metadata.get("triggers") or ""),
+            )
+            for entry in entries
+        }
+        fingerprint = hash(tuple((lore_id, tuple(words)) for lore_id, words in keywords.items()))
+        with self._lock:
+            cached = self._matchers.get(story_id)
+            if cached is not None and cached[0] == fingerprint:
+                self._matchers.move_to_end(story_id)
+                return cached[1]
+        matcher = TriggerMatcher(keywords)
+        with self._lock:
+            self._matchers[story_id] = (fingerprint, matcher)
+            self._matchers.move_to_end(story_id)
+            while len(self._matchers) > self._max_stories:
+                self._matchers.popitem(last=False)
+        return matcher
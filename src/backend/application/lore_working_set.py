@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from langchain_core.documents import Document
+
+
+def _lore_id(entry: Document) -> str:
+    return str(entry.metadata.get("lore_id") or "")
+
+
+class LoreWorkingSet:
+    def __init__(self, decay: float = 0.5, min_weight: float = 0.2, max_stories: int = 256) -> None:
+        self._decay = decay
+        self._min_weight = min_weight
+        self._max_stories = max_stories
+        self._weights: OrderedDict[str, dict[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def update(self, story_id: str, entries: list[Document]) -> None:
+        used = [lore_id for lore_id in map(_lore_id, entries) if lore_id]
+        with self._lock:
+            weights = {
+                lore_id: weight * self._decay
+                for lore_id, weight in self._weights.get(story_id, {}).items()
+            }
+            for lore_id in used:
+                weights[lore_id] = weights.get(lore_id, 0.0) + 1.0
+            self._weights[story_id] = {
+                lore_id: weight for lore_id, weight in weights.items() if weight >= self._min_weight
+            }
+            self._weights.move_to_end(story_id)
+            while len(self._weights) > self._max_stories:
+                self._weights.popitem(last=False)
+
+    def active(self, story_id: str, current: list[Document]) -> list[Document]:
+        with self._lock:
+            weights = dict(self._weights.get(story_id, {}))
+        # Resolve against the current lore rows so edits and deletions show up immediately.
+        by_id = {_lore_id(entry): entry for entry in current}
+        ranked = sorted(
+            (lore_id for lore_id in weights if lore_id in by_id),
+            key=lambda lore_id: -weights[lore_id],
+        )
+        return [by_id[lore_id] for lore_id in ranked]
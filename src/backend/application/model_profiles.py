@@ -167,13 +167,39 @@ def get_model_spec(spec_id: str | None) -> ModelSpec | None:
     return MODEL_SPECS.get(spec_id)
 
 
+def find_model_spec(model_name: str | None) -> ModelSpec | None:
+    normalized = (model_name or "").strip().lower()
+    if not normalized:
+        return None
+    for spec in MODEL_SPECS.values():
+        if normalized == spec.model.lower():
+            return spec
+    return None
+
+
+def resolve_prompt_token_budget(
+    model_name: str | None,
+    profile_id: str | None,
+    num_ctx: int | None = None,
+    num_predict: int = 0,
+) -> int:
+    limits = [get_model_profile(profile_id).max_effective_context]
+    spec = find_model_spec(model_name)
+    if spec and spec.max_context:
+        limits.append(spec.max_context)
+    if num_ctx:
+        limits.append(num_ctx)
+    context_window = min(limits)
+    return max(context_window // 4, context_window - max(0, num_predict))
+
+
 def infer_model_profile_id(model_name: str | None, explicit_profile_id: str | None = None) -> str:
     if explicit_profile_id in MODEL_CLASS_PROFILES:
         return str(explicit_profile_id)
+    spec = find_model_spec(model_name)
+    if spec:
+        return spec.profile_id
     normalized = (model_name or "").strip().lower()
-    for spec in MODEL_SPECS.values():
-        if normalized and normalized == spec.model.lower():
-            return spec.profile_id
     if any(token in normalized for token in ("opus", "gpt-5", "o3", "o4")):
         return "reasoning_strong"
     if any(token in normalized for token in ("sonnet", "gpt-4", "gemini")):
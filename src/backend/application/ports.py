@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator
+from collections.abc import AsyncIterator, Iterable, Iterator
 from typing import Any, Protocol
 
 from langchain_core.messages import BaseMessage
@@ -21,6 +21,9 @@ class ChatModelProtocol(Protocol):
     def stream(self, input: Iterable[BaseMessage]) -> Iterator[BaseMessage]:
         ...
 
+    def astream(self, input: Iterable[BaseMessage]) -> AsyncIterator[BaseMessage]:
+        ...
+
     def invoke(self, input: Iterable[BaseMessage] | str) -> BaseMessage:
         ...
 
@@ -31,3 +34,6 @@ class EmbeddingsProtocol(Protocol):
 
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         ...
+
+    async def aembed_query(self, text: str) -> list[float]:
+        ...
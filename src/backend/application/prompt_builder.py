@@ -8,6 +8,12 @@ from src.backend.application.ports import LoggerProtocol
 from src.backend.application.prompt_renderer import render_profile_guidance
 from src.backend.infrastructure.models import StoryModel
 
+CHARS_PER_TOKEN = 4
+MESSAGE_TOKEN_OVERHEAD = 4
+CLASSIC_LAYOUT = "classic"
+STABLE_PREFIX_LAYOUT = "stable_prefix"
+PROMPT_LAYOUTS = (CLASSIC_LAYOUT, STABLE_PREFIX_LAYOUT)
+
 
 def _lore_value(entry, key: str, logger: LoggerProtocol = None) -> str:
     logger and logger.debug("lore_value entry=%s key=%s", entry, key)
@@ -27,7 +33,7 @@ def _lore_value(entry, key: str, logger: LoggerProtocol = None) -> str:
     return ""
 
 
-def _should_skip_lore(entry, plot_essentials: str, logger: LoggerProtocol = None) -> bool:
+def should_skip_lore(entry, plot_essentials: str, logger: LoggerProtocol = None) -> bool:
     tag = _lore_value(entry, "tag", logger=logger).strip().lower()
     if tag in {"player", "player_character", "player character", "pc"}:
         return True
@@ -46,10 +52,14 @@ def _should_skip_lore(entry, plot_essentials: str, logger: LoggerProtocol = None
     return False
 
 
-def _format_lore(entries: Iterable, plot_essentials: str, logger: LoggerProtocol = None) -> str:
+def _format_lore_lines(
+    entries: Iterable,
+    plot_essentials: str,
+    logger: LoggerProtocol = None,
+) -> list[str]:
     lines = []
     for entry in entries:
-        if _should_skip_lore(entry, plot_essentials, logger=logger):
+        if should_skip_lore(entry, plot_essentials, logger=logger):
             continue
         title = _lore_value(entry, "title", logger=logger).strip()
         tag = _lore_value(entry, "tag", logger=logger).strip()
@@ -64,7 +74,15 @@ def _format_lore(entries: Iterable, plot_essentials: str, logger: LoggerProtocol
             tag,
             description,
         )
-    return "\n".join(lines)
+    return lines
+
+
+def _format_lore(entries: Iterable, plot_essentials: str, logger: LoggerProtocol = None) -> str:
+    return "\n".join(_format_lore_lines(entries, plot_essentials, logger=logger))
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN + MESSAGE_TOKEN_OVERHEAD
 
 
 def _message_value(msg, key: str, default=None):
@@ -82,44 +100,66 @@ def build_system_prompt(
     model_profile_id: str | None = None,
     logger: LoggerProtocol = None,
 ) -> str:
-    sections = []
+    lore_block = _format_lore(
+        lore_entries or [],
+        (story.plot_essentials or "").strip(),
+        logger=logger,
+    )
+    return _compose_system_prompt(story, lore_block, mode, model_profile_id)
 
-    ai_instructions = (story.ai_instructions or "").strip()
-    if ai_instructions:
-        sections.append("[AI INSTRUCTIONS]\n" + ai_instructions)
 
-    plot_summary = (story.plot_summary or "").strip()
-    if plot_summary:
-        sections.append("[PLOT SUMMARY]\n" + plot_summary)
+def _join_sections(sections: Iterable[tuple[str, str | None]]) -> str:
+    return "\n\n".join(
+        f"[{title}]\n{value.strip()}" for title, value in sections if (value or "").strip()
+    )
 
-    plot_essentials = (story.plot_essentials or "").strip()
-    if plot_essentials:
-        sections.append("[PLOT ESSENTIALS]\n" + plot_essentials)
 
-    lore_block = _format_lore(
-        lore_entries if lore_entries is not None else story.lore_entries,
-        plot_essentials,
-        logger=logger,
-    ).strip()
-    if lore_block:
-        sections.append("[LORE]\n" + lore_block)
+def _compose_system_prompt(
+    story: StoryModel,
+    lore_block: str,
+    mode: str,
+    model_profile_id: str | None,
+) -> str:
+    return _join_sections(
+        [
+            ("AI INSTRUCTIONS", story.ai_instructions),
+            ("PLOT SUMMARY", story.plot_summary),
+            ("PLOT ESSENTIALS", story.plot_essentials),
+            ("LORE", lore_block),
+            ("AUTHOR NOTE", story.author_note),
+            ("MODEL-SPECIFIC GUIDANCE", render_profile_guidance(model_profile_id, mode)),
+        ]
+    )
 
-    author_note = (story.author_note or "").strip()
-    if author_note:
-        sections.append("[AUTHOR NOTE]\n" + author_note)
 
-    profile_guidance = render_profile_guidance(model_profile_id, mode).strip()
-    if profile_guidance:
-        sections.append("[MODEL-SPECIFIC GUIDANCE]\n" + profile_guidance)
+def _compose_stable_prompt(story: StoryModel) -> str:
+    return _join_sections(
+        [
+            ("AI INSTRUCTIONS", story.ai_instructions),
+            ("PLOT ESSENTIALS", story.plot_essentials),
+            ("AUTHOR NOTE", story.author_note),
+        ]
+    )
 
-    return "\n\n".join(sections)
 
+def _compose_turn_context(
+    story: StoryModel,
+    lore_block: str,
+    mode: str,
+    model_profile_id: str | None,
+) -> str:
+    # The summary is rewritten in the background after most turns, so it sits after the
+    # history with the other per-turn sections instead of invalidating the cached prefix.
+    return _join_sections(
+        [
+            ("PLOT SUMMARY", story.plot_summary),
+            ("LORE", lore_block),
+            ("MODEL-SPECIFIC GUIDANCE", render_profile_guidance(model_profile_id, mode)),
+        ]
+    )
 
-def _build_history_messages(
-    messages: Iterable,
-    max_pairs: int,
-    overlap_pairs: int = 0,
-) -> list[BaseMessage]:
+
+def _history_messages(messages: Iterable) -> list[BaseMessage]:
     history: list[BaseMessage] = []
     for msg in messages:
         role = str(_message_value(msg, "role", "")).strip().lower()
@@ -130,17 +170,116 @@ def _build_history_messages(
             continue
         if role == "user":
             mode = _message_value(msg, "mode", None)
-            content = format_input_block(mode, text)
+            history.append(HumanMessage(content=format_input_block(mode, text)))
         else:
-            content = text
-        if role == "user":
-            history.append(HumanMessage(content=content))
-        else:
-            history.append(AIMessage(content=content))
+            history.append(AIMessage(content=text))
+    return history
+
+
+def _build_history_messages(
+    messages: Iterable,
+    max_pairs: int,
+    overlap_pairs: int = 0,
+    stable_prefix: bool = False,
+) -> list[BaseMessage]:
+    history = _history_messages(messages)
     if max_pairs <= 0:
         return []
     take_pairs = max_pairs + max(0, overlap_pairs)
-    return history[-(take_pairs * 2) :]
+    start = max(0, len(history) - take_pairs * 2)
+    if stable_prefix:
+        # Slide the window in whole blocks so the history prefix stays identical between turns.
+        start -= start % (max_pairs * 2)
+    return history[start:]
+
+
+def _turn_starts(history: list[BaseMessage]) -> list[int]:
+    # A turn is a player message with the replies after it, so packing never splits a pair.
+    starts = [
+        index
+        for index, message in enumerate(history)
+        if index == 0 or isinstance(message, HumanMessage)
+    ]
+    return [*starts, len(history)]
+
+
+def _take_recent(
+    history: list[BaseMessage],
+    starts: list[int],
+    start: int,
+    stop: int,
+    remaining: int,
+) -> tuple[int, int]:
+    for begin in reversed([bound for bound in starts if stop <= bound < start]):
+        cost = sum(estimate_tokens(str(message.content)) for message in history[begin:start])
+        if cost > remaining:
+            break
+        remaining -= cost
+        start = begin
+    return start, remaining
+
+
+def _pack_prompt(
+    story: StoryModel,
+    user_message: HumanMessage,
+    lore_entries: Iterable | None,
+    mode: str,
+    model_profile_id: str | None,
+    recent_pairs: int,
+    overlap_pairs: int,
+    token_budget: int,
+    stable_prefix: bool = False,
+    logger: LoggerProtocol = None,
+) -> tuple[str, list[BaseMessage]]:
+    lore_lines = [
+        line
+        for line in _format_lore_lines(
+            lore_entries or [],
+            (story.plot_essentials or "").strip(),
+            logger=logger,
+        )
+        if line
+    ]
+    history = _history_messages(story.messages or [])
+    starts = _turn_starts(history)
+
+    base_prompt = _compose_system_prompt(story, "", mode, model_profile_id)
+    remaining = token_budget - estimate_tokens(base_prompt)
+    remaining -= estimate_tokens(str(user_message.content))
+    if lore_lines:
+        remaining -= estimate_tokens("[LORE]\n")
+    if stable_prefix:
+        remaining -= MESSAGE_TOKEN_OVERHEAD
+
+    # Priority: the most recent turns, then retrieved lore by rank, then older history.
+    recent_turns = min(len(starts) - 1, max(0, recent_pairs + max(0, overlap_pairs)))
+    recent_start = starts[len(starts) - 1 - recent_turns]
+    start, remaining = _take_recent(history, starts, len(history), recent_start, remaining)
+    packed_lore: list[str] = []
+    for line in lore_lines:
+        cost = estimate_tokens(line) - MESSAGE_TOKEN_OVERHEAD
+        if cost > remaining:
+            continue
+        packed_lore.append(line)
+        remaining -= cost
+    if start == recent_start:
+        start, remaining = _take_recent(history, starts, start, 0, remaining)
+        block = max(1, recent_pairs)
+        turn = starts.index(start)
+        aligned = starts[min(len(starts) - 1, -(-turn // block) * block)]
+        if stable_prefix and aligned <= recent_start:
+            start = aligned
+
+    logger and logger.debug(
+        "prompt_packed budget=%d remaining=%d history=%d/%d lore=%d/%d",
+        token_budget,
+        remaining,
+        len(history) - start,
+        len(history),
+        len(packed_lore),
+        len(lore_lines),
+    )
+    return "\n".join(packed_lore), history[start:]
 
 
 def build_chat_messages(
@@ -152,19 +291,48 @@ def build_chat_messages(
     overlap_pairs: int = 0,
     model_profile_id: str | None = None,
     logger: LoggerProtocol = None,
+    token_budget: int | None = None,
+    prompt_layout: str = CLASSIC_LAYOUT,
 ) -> list[BaseMessage]:
     messages: list[BaseMessage] = []
+    user_message = HumanMessage(content=format_input_block(mode, user_text))
     if story:
-        system_prompt = build_system_prompt(
-            story,
-            lore_entries=lore_entries,
-            mode=mode,
-            model_profile_id=model_profile_id,
-            logger=logger,
-        )
+        stable_prefix = prompt_layout == STABLE_PREFIX_LAYOUT
+        if token_budget is not None:
+            lore_block, history = _pack_prompt(
+                story,
+                user_message,
+                lore_entries,
+                mode,
+                model_profile_id,
+                recent_pairs,
+                overlap_pairs,
+                token_budget,
+                stable_prefix=stable_prefix,
+                logger=logger,
+            )
+        else:
+            lore_block = _format_lore(
+                lore_entries or [],
+                (story.plot_essentials or "").strip(),
+                logger=logger,
+            )
+            history = _build_history_messages(
+                story.messages or [],
+                recent_pairs,
+                overlap_pairs,
+                stable_prefix=stable_prefix,
+            )
+        if stable_prefix:
+            system_prompt = _compose_stable_prompt(story)
+            turn_context = _compose_turn_context(story, lore_block, mode, model_profile_id)
+        else:
+            system_prompt = _compose_system_prompt(story, lore_block, mode, model_profile_id)
+            turn_context = ""
         if system_prompt:
             messages.append(SystemMessage(content=system_prompt))
-        if story.messages:
-            messages.extend(_build_history_messages(story.messages, recent_pairs, overlap_pairs))
-    messages.append(HumanMessage(content=format_input_block(mode, user_text)))
+        messages.extend(history)
+        if turn_context:
+            messages.append(SystemMessage(content=turn_context))
+    messages.append(user_message)
     return messages
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from langchain_core.prompts import PromptTemplate
 
+from src.backend.application.input_formatting import format_user_for_summary
 from src.backend.application.ports import ChatModelProtocol, LoggerProtocol
 from src.backend.application.prompt_renderer import render_summary_profile_guidance
-from src.backend.infrastructure.models import StoryModel
 
 AI_INSTRUCTION_TO_SUMMARY_KEY = {
     "neutral_storyteller": "neutral_summarizer",
@@ -23,7 +25,7 @@ NEUTRAL_SUMMARY_PROMPT_TEMPLATE = PromptTemplate.from_template(
 
 Your task:
 - Rewrite the CURRENT SUMMARY into a plain, descriptive chronicle when needed.
-- Then update it with the latest turn.
+- Then update it with the latest turns.
 - Keep concise, factual, chronological, third-person, past tense.
 - Preserve important names, locations, items, relationships, quests, consequences,
   promises, threats, and state changes.
@@ -42,9 +44,8 @@ MODEL-SPECIFIC SUMMARY GUIDANCE:
 CURRENT SUMMARY:
 {summary}
 
-LATEST TURN:
-User: {user_input}
-Assistant: {assistant_text}
+LATEST TURNS:
+{turns}
 
 UPDATED SUMMARY:
 """
@@ -55,20 +56,21 @@ DARK_SUMMARY_PROMPT_TEMPLATE = PromptTemplate.from_template(
 for a dark fantasy adventure.
 Your task: rewrite the current chronicle into plain factual notes when needed.
 Then update it ONLY with genuinely new, plot-relevant information from the latest
-player action and narrator response.
+player actions and narrator responses.
 
 Core rules:
 - Third-person perspective, past tense.
 - Plain, descriptive, chronological prose. Think "campaign notes", not "novel excerpt".
 - Preserve EVERY important proper name (characters, locations, items, factions, gods, curses...).
 - Keep track of open quests, debts, alliances, betrayals, consequences, prophecies, ongoing threats.
-- Only add / revise facts that are explicitly shown in the new turn — no assumptions, no inventions.
+- Only add / revise facts that are explicitly shown in the new turns —
+  no assumptions, no inventions.
 - Remove transient details: small talk, weather descriptions (unless plot-relevant),
   exact dialogue wording (unless it reveals key info or is a binding oath/promise),
   decorative sensual language, repeated emphasis, and scene-level prose.
 - Do not mimic the narrator's voice, mood, or rhetoric.
 - Do not end with dramatic closing lines.
-- If the new turn adds no meaningful plot progression, return the CURRENT SUMMARY unchanged.
+- If the new turns add no meaningful plot progression, return the CURRENT SUMMARY unchanged.
 - Stay concise but never sacrifice clarity or key facts for brevity.
 - Output format: ONLY the updated summary text — no explanations, no headers, no markdown.
 
@@ -78,9 +80,8 @@ MODEL-SPECIFIC SUMMARY GUIDANCE:
 CURRENT STORY CHRONICLE:
 {summary}
 
-LATEST TURN:
-User (player): {user_input}
-Narrator: {assistant_text}
+LATEST TURNS:
+{turns}
 
 UPDATED STORY CHRONICLE:
 """
@@ -91,6 +92,39 @@ SUMMARY_PROMPT_KEYS = {
     "dark_summarizer": DARK_SUMMARY_PROMPT_TEMPLATE,
 }
 
+SUMMARY_TURN_LABELS = {
+    "neutral_summarizer": ("User", "Assistant"),
+    "dark_summarizer": ("User (player)", "Narrator"),
+}
+
+
+def format_summary_turns(messages: Iterable, summary_prompt_key: str = "neutral") -> str:
+    user_label, assistant_label = SUMMARY_TURN_LABELS.get(
+        summary_prompt_key, ("User", "Assistant")
+    )
+    lines = []
+    for msg in messages:
+        role = str(_message_value(msg, "role", "")).strip().lower()
+        text = str(_message_value(msg, "text", "") or "")
+        if role == "user":
+            text = format_user_for_summary(_message_value(msg, "mode", None), text)
+            label = user_label
+        elif role == "assistant":
+            label = assistant_label
+        else:
+            continue
+        if text.strip():
+            lines.append(f"{label}: {text.strip()}")
+    return "\n".join(lines)
+
+
+def _message_value(msg, key: str, default=None):
+    if hasattr(msg, key):
+        return getattr(msg, key)
+    if isinstance(msg, dict):
+        return msg.get(key, default)
+    return default
+
 
 def summarize_turn(
     client: ChatModelProtocol,
@@ -102,6 +136,35 @@ def summarize_turn(
     logger: LoggerProtocol,
     summary_prompt_key: str = "neutral",
     model_profile_id: str | None = None,
+) -> str:
+    turns = format_summary_turns(
+        [
+            {"role": "user", "text": user_input},
+            {"role": "assistant", "text": assistant_text},
+        ],
+        summary_prompt_key,
+    )
+    return summarize_turns(
+        client=client,
+        model=model,
+        previous_summary=previous_summary,
+        turns=turns,
+        max_chars=max_chars,
+        logger=logger,
+        summary_prompt_key=summary_prompt_key,
+        model_profile_id=model_profile_id,
+    )
+
+
+def summarize_turns(
+    client: ChatModelProtocol,
+    model: str,
+    previous_summary: str,
+    turns: str,
+    max_chars: int,
+    logger: LoggerProtocol,
+    summary_prompt_key: str = "neutral",
+    model_profile_id: str | None = None,
 ) -> str:
     previous = previous_summary.strip()
     try:
@@ -115,8 +178,7 @@ def summarize_turn(
         )
         prompt = prompt_template.format(
             summary=previous,
-            user_input=user_input.strip(),
-            assistant_text=assistant_text.strip(),
+            turns=turns.strip(),
             profile_guidance=render_summary_profile_guidance(model_profile_id),
         )
         if hasattr(llm, "invoke"):
@@ -139,30 +201,3 @@ def summarize_turn(
         logger.exception("summary_update_failed")
         return previous_summary
 
-
-def update_story_summary(
-    client: ChatModelProtocol,
-    model: str,
-    story: StoryModel,
-    user_input: str,
-    assistant_text: str,
-    max_chars: int,
-    logger: LoggerProtocol,
-    model_profile_id: str | None = None,
-) -> str:
-    summary_prompt_key = story.summary_prompt_key or resolve_summary_prompt_key(
-        story.ai_instruction_key,
-    )
-    updated = summarize_turn(
-        client=client,
-        model=model,
-        previous_summary=story.plot_summary or "",
-        user_input=user_input,
-        assistant_text=assistant_text,
-        max_chars=max_chars,
-        logger=logger,
-        summary_prompt_key=summary_prompt_key,
-        model_profile_id=model_profile_id,
-    )
-    story.plot_summary = updated
-    return updated
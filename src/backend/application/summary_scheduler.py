@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.backend.application.ports import ChatModelProtocol, LoggerProtocol
+from src.backend.application.summarizer import (
+    format_summary_turns,
+    resolve_summary_prompt_key,
+    summarize_turns,
+)
+from src.backend.infrastructure.db import SessionLocal
+from src.backend.infrastructure.langchain_clients import get_chat_model
+from src.backend.infrastructure.models import StoryMessageModel, StoryModel, StorySummaryModel
+
+
+@dataclass(frozen=True)
+class SummarySettings:
+    model: str
+    max_chars: int
+    model_profile_id: str | None = None
+    debounce_seconds: float = 2.0
+
+
+@dataclass(frozen=True)
+class _SummaryBacklog:
+    summary: str
+    last_position: int
+    summary_prompt_key: str
+    messages: list[dict]
+
+
+class SummaryScheduler:
+    def __init__(
+        self,
+        settings: SummarySettings,
+        logger: LoggerProtocol,
+        session_factory: Callable = SessionLocal,
+        chat_model_factory: Callable[[], ChatModelProtocol] = get_chat_model,
+    ) -> None:
+        self._settings = settings
+        self._logger = logger
+        self._session_factory = session_factory
+        self._chat_model_factory = chat_model_factory
+        self._lock = threading.Lock()
+        self._running: set[str] = set()
+        self._dirty: set[str] = set()
+
+    def schedule(self, story_id: str) -> None:
+        with self._lock:
+            if story_id in self._running:
+                self._dirty.add(story_id)
+                return
+            self._running.add(story_id)
+        thread = threading.Thread(target=self._run, args=(story_id,), daemon=True)
+        thread.start()
+
+    def _run(self, story_id: str) -> None:
+        while True:
+            time.sleep(self._settings.debounce_seconds)
+            with self._lock:
+                self._dirty.discard(story_id)
+            try:
+                self.catch_up(story_id)
+            except Exception:
+                self._logger.exception("story_summary_failed story_id=%s", story_id)
+            with self._lock:
+                if story_id not in self._dirty:
+                    self._running.discard(story_id)
+                    return
+
+    def catch_up(self, story_id: str) -> bool:
+        backlog = self._load_backlog(story_id)
+        if backlog is None or not backlog.messages:
+            return False
+        turns = format_summary_turns(backlog.messages, backlog.summary_prompt_key)
+        updated = backlog.summary
+        if turns:
+            updated = summarize_turns(
+                client=self._chat_model_factory(),
+                model=self._settings.model,
+                previous_summary=backlog.summary,
+                turns=turns,
+                max_chars=self._settings.max_chars,
+                logger=self._logger,
+                summary_prompt_key=backlog.summary_prompt_key,
+                model_profile_id=self._settings.model_profile_id,
+            )
+        return self._store(story_id, backlog, updated)
+
+    def _load_backlog(self, story_id: str) -> _SummaryBacklog | None:
+        with self._session_factory() as db:
+            story = db.get(StoryModel, story_id)
+            if story is None:
+                return None
+            record = story.summary_record
+            last_position = record.last_position if record else -1
+            rows = (
+                db.query(StoryMessageModel)
+                .filter(
+                    StoryMessageModel.story_id == story_id,
+                    StoryMessageModel.position > last_position,
+                )
+                .order_by(StoryMessageModel.position)
+                .all()
+            )
+            return _SummaryBacklog(
+                summary=record.summary if record else "",
+                last_position=last_position,
+                summary_prompt_key=story.summary_prompt_key
+                or resolve_summary_prompt_key(story.ai_instruction_key),
+                messages=[{**row.to_payload(), "position": row.position} for row in rows],
+            )
+
+    def _store(self, story_id: str, backlog: _SummaryBacklog, summary: str) -> bool:
+        with self._session_factory() as db:
+            record = db.get(StorySummaryModel, story_id)
+            current_position = record.last_position if record else -1
+            if current_position != backlog.last_position:
+                self._logger.debug(
+                    "story_summary_stale story_id=%s expected=%d actual=%d",
+                    story_id,
+                    backlog.last_position,
+                    current_position,
+                )
+                return False
+            if record is None:
+                record = StorySummaryModel(story_id=story_id)
+                db.add(record)
+            record.summary = summary
+            record.last_position = backlog.messages[-1]["position"]
+            db.commit()
+        self._logger.debug(
+            "story_summary_updated story_id=%s messages=%d last_position=%d",
+            story_id,
+            len(backlog.messages),
+            backlog.messages[-1]["position"],
+        )
+        return True
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+
+STREAM_COALESCE_CHARS = 64
+STREAM_COALESCE_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class TurnEvent:
+    type: str
+    data: dict = field(default_factory=dict)
+
+
+def delta_event(text: str) -> TurnEvent:
+    return TurnEvent("delta", {"text": text})
+
+
+async def coalesce_deltas(
+    events: AsyncIterable[TurnEvent],
+    max_chars: int = STREAM_COALESCE_CHARS,
+    max_seconds: float = STREAM_COALESCE_SECONDS,
+) -> AsyncIterator[TurnEvent]:
+    loop = asyncio.get_running_loop()
+    iterator = aiter(events)
+    parts: list[str] = []
+    size = 0
+    deadline: float | None = None
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(iterator))
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield delta_event("".join(parts))
+                parts, size, deadline = [], 0, None
+                continue
+            finished, pending = pending, None
+            try:
+                event = finished.result()
+            except StopAsyncIteration:
+                break
+            if event.type == "delta":
+                parts.append(event.data["text"])
+                size += len(event.data["text"])
+                if deadline is None:
+                    deadline = loop.time() + max_seconds
+                if size >= max_chars:
+                    yield delta_event("".join(parts))
+                    parts, size, deadline = [], 0, None
+                continue
+            if parts:
+                yield delta_event("".join(parts))
+                parts, size, deadline = [], 0, None
+            yield event
+        if parts:
+            yield delta_event("".join(parts))
+    finally:
+        if pending is not None:
+            pending.cancel()
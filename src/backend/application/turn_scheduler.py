@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass, field
+
+from src.backend.application.ports import LoggerProtocol
+from src.backend.application.turn_events import TurnEvent
+
+
+@dataclass(frozen=True)
+class TurnSchedulerSettings:
+    max_concurrency: int = 1
+    max_queue: int = 8
+    default_turn_seconds: float = 30.0
+    update_seconds: float = 1.0
+
+
+class TurnQueueFullError(RuntimeError):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__("Turn queue is full")
+        self.retry_after = retry_after
+
+
+@dataclass(eq=False)
+class TurnTicket:
+    backend: str
+    story_key: str
+    granted: asyncio.Future
+    started_at: float | None = None
+
+
+@dataclass
+class _BackendState:
+    active: int = 0
+    waiting: OrderedDict[str, deque[TurnTicket]] = field(default_factory=OrderedDict)
+    avg_turn_seconds: float | None = None
+
+
+class TurnScheduler:
+    def __init__(
+        self,
+        settings: TurnSchedulerSettings,
+        logger: LoggerProtocol,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._settings = settings
+        self._logger = logger
+        self._clock = clock
+        self._states: dict[str, _BackendState] = {}
+
+    def admit(self, backend: str, story_id: str | None) -> TurnTicket:
+        state = self._states.setdefault(backend, _BackendState())
+        ticket = TurnTicket(backend, story_id or "", asyncio.get_running_loop().create_future())
+        if state.active < self._settings.max_concurrency and not state.waiting:
+            self._grant(state, ticket)
+            return ticket
+        queued = sum(len(tickets) for tickets in state.waiting.values())
+        if queued >= self._settings.max_queue:
+            retry_after = self._eta_seconds(state, queued + 1)
+            self._logger.debug(
+                "turn_rejected backend=%s queued=%d retry_after=%d",
+                backend,
+                queued,
+                retry_after,
+            )
+            raise TurnQueueFullError(retry_after)
+        state.waiting.setdefault(ticket.story_key, deque()).append(ticket)
+        self._logger.debug(
+            "turn_queued backend=%s story_id=%s queued=%d",
+            backend,
+            ticket.story_key,
+            queued + 1,
+        )
+        return ticket
+
+    def position(self, ticket: TurnTicket) -> int:
+        if ticket.granted.done():
+            return 0
+        state = self._states[ticket.backend]
+        for index, queued in enumerate(self._round_robin(state), start=1):
+            if queued is ticket:
+                return index
+        return 0
+
+    def eta_seconds(self, ticket: TurnTicket) -> int:
+        position = self.position(ticket)
+        if position == 0:
+            return 0
+        return self._eta_seconds(self._states[ticket.backend], position)
+
+    def release(self, ticket: TurnTicket) -> None:
+        state = self._states.get(ticket.backend)
+        if state is None:
+            return
+        if ticket.started_at is None:
+            tickets = state.waiting.get(ticket.story_key)
+            if tickets and ticket in tickets:
+                tickets.remove(ticket)
+                if not tickets:
+                    del state.waiting[ticket.story_key]
+            ticket.granted.cancel()
+            return
+        duration = self._clock() - ticket.started_at
+        ticket.started_at = None
+        state.active -= 1
+        state.avg_turn_seconds = (
+            duration
+            if state.avg_turn_seconds is None
+            else 0.8 * state.avg_turn_seconds + 0.2 * duration
+        )
+        self._dispatch(state)
+
+    async def run(
+        self,
+        ticket: TurnTicket,
+        events: AsyncIterable[TurnEvent],
+    ) -> AsyncIterator[TurnEvent]:
+        try:
+            last_position = None
+            while not ticket.granted.done():
+                position = self.position(ticket)
+                if position != last_position:
+                    last_position = position
+                    yield TurnEvent(
+                        "queued",
+                        {"position": position, "eta_ms": self.eta_seconds(ticket) * 1000},
+                    )
+                try:
+                    await asyncio.wait_for(
+                        asyncio.shield(ticket.granted),
+                        self._settings.update_seconds,
+                    )
+                except TimeoutError:
+                    continue
+            async for event in events:
+                yield event
+        finally:
+            self.release(ticket)
+
+    def _grant(self, state: _BackendState, ticket: TurnTicket) -> None:
+        state.active += 1
+        ticket.started_at = self._clock()
+        ticket.granted.set_result(True)
+
+    def _dispatch(self, state: _BackendState) -> None:
+        while state.active < self._settings.max_concurrency and state.waiting:
+            story_key, tickets = next(iter(state.waiting.items()))
+            ticket = tickets.popleft()
+            if tickets:
+                state.waiting.move_to_end(story_key)
+            else:
+                del state.waiting[story_key]
+            self._grant(state, ticket)
+
+    def _round_robin(self, state: _BackendState) -> list[TurnTicket]:
+        queues = [list(tickets) for tickets in state.waiting.values()]
+        order: list[TurnTicket] = []
+        for depth in range(max((len(tickets) for tickets in queues), default=0)):
+            order.extend(tickets[depth] for tickets in queues if depth < len(tickets))
+        return order
+
+    def _eta_seconds(self, state: _BackendState, position: int) -> int:
+        turn_seconds = state.avg_turn_seconds or self._settings.default_turn_seconds
+        rounds = math.ceil(position / max(1, self._settings.max_concurrency))
+        return math.ceil(rounds * turn_seconds)
@@ -1,35 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
-from collections.abc import Callable, Iterator
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import aclosing
 
-from src.backend.application.input_formatting import format_user_for_summary
 from src.backend.application.llm_settings import DEFAULT_OPTIONS, MODE_OPTIONS
 from src.backend.application.lore_suggester import extract_suggestions, save_suggestions
 from src.backend.application.ports import ChatModelProtocol, LoggerProtocol
-from src.backend.application.prompt_builder import build_chat_messages
+from src.backend.application.prompt_builder import CLASSIC_LAYOUT, build_chat_messages
+from src.backend.application.turn_events import TurnEvent, delta_event
 from src.backend.application.use_cases.turn_models import TurnContext
 from src.backend.infrastructure.db import SessionLocal
 from src.backend.infrastructure.langchain_clients import get_chat_model
 from src.backend.infrastructure.models import LoreEntryModel
 
 
-def stream_turn(
+async def stream_turn(
     context: TurnContext,
     chat_model: ChatModelProtocol,
     model: str,
     logger: LoggerProtocol,
-    commit: Callable[[], None] | None = None,
-    summary_model: str | None = None,
-    summary_max_chars: int | None = None,
-    summary_model_profile_id: str | None = None,
+    append_messages: Callable[[list[dict]], Awaitable[list[int]]] | None = None,
+    schedule_summary: Callable[[str], None] | None = None,
+    suggest_lore: Callable[[str, str, str], None] | None = None,
+    prefetch_lore: Callable[[str, str], None] | None = None,
     recent_pairs: int = 3,
     overlap_pairs: int = 0,
-) -> Iterator[str]:
+    token_budget: int | None = None,
+    prompt_layout: str = CLASSIC_LAYOUT,
+) -> AsyncIterator[TurnEvent]:
     start = time.monotonic()
-    buffer = ""
+    first_token_ms = None
+    parts: list[str] = []
     last_usage = None
+    usage_stats: dict = {}
+    positions: list[int] = []
+    persisted = False
     try:
         messages = build_chat_messages(
             context.story,
@@ -40,48 +48,126 @@ def stream_turn(
             overlap_pairs=overlap_pairs,
             model_profile_id=getattr(context, "model_profile_id", None),
             logger=logger,
+            token_budget=token_budget,
+            prompt_layout=prompt_layout,
         )
         logger.debug("ollama_stream_request messages=%s", messages)
         options = MODE_OPTIONS.get(context.mode, DEFAULT_OPTIONS)
         logger.debug("ollama_stream_options %s", options)
         bound = chat_model.bind(model=model, **options)
-        for part in bound.stream(messages):
-            token = getattr(part, "content", "") or ""
-            usage = getattr(part, "response_metadata", {}).get("usage")
-            if usage:
-                last_usage = usage
-            if token:
-                buffer += token
-                yield token
-        logger.debug(
-            "ollama_stream_completed duration_ms=%d",
-            int((time.monotonic() - start) * 1000),
-        )
+        async with aclosing(bound.astream(messages)) as upstream:
+            async for part in upstream:
+                token = getattr(part, "content", "") or ""
+                metadata = getattr(part, "response_metadata", None) or {}
+                usage = metadata.get("usage")
+                if usage:
+                    last_usage = usage
+                usage_stats.update(_usage_stats(metadata))
+                if token:
+                    if first_token_ms is None:
+                        first_token_ms = _elapsed_ms(start)
+                    parts.append(token)
+                    yield delta_event(token)
+        reply = "".join(parts)
+        logger.debug("ollama_stream_completed duration_ms=%d", _elapsed_ms(start))
         if last_usage:
             logger.debug("ollama_usage %s", last_usage)
-        if context.story and commit and summary_model and summary_max_chars is not None:
-            from src.backend.application.summarizer import update_story_summary
-
-            update_story_summary(
-                client=chat_model,
-                model=summary_model,
-                story=context.story,
-                user_input=format_user_for_summary(context.mode, context.text),
-                assistant_text=buffer,
-                max_chars=summary_max_chars,
-                logger=logger,
-                model_profile_id=summary_model_profile_id,
+        if usage_stats:
+            logger.debug(
+                "turn_prompt_eval layout=%s prompt_tokens=%s prompt_eval_ms=%s cached_tokens=%s",
+                prompt_layout,
+                usage_stats.get("prompt_tokens"),
+                usage_stats.get("prompt_eval_ms"),
+                usage_stats.get("cached_tokens"),
             )
-            commit()
-            _schedule_lore_suggestions(context.story.id, context.text, buffer, model, logger)
+        persisted = True
+        positions = await _persist_turn(context, reply, append_messages, logger)
+        if positions:
+            if schedule_summary:
+                schedule_summary(context.story.id)
+            if suggest_lore:
+                suggest_lore(context.story.id, context.text, reply)
+            if prefetch_lore:
+                prefetch_lore(context.story.id, reply)
         else:
-            logger.debug("story_summary_skipped no_story_or_commit")
+            logger.debug("turn_post_processing_skipped story=%s", bool(context.story))
+    except (asyncio.CancelledError, GeneratorExit):
+        logger.debug(
+            "turn_abandoned story_id=%s tokens=%d duration_ms=%d",
+            context.story.id if context.story else None,
+            len(parts),
+            _elapsed_ms(start),
+        )
+        raise
     except Exception as exc:
         logger.exception("ollama_stream_error")
-        yield f"\n[Ollama error: {exc}]"
+        yield TurnEvent("error", {"message": str(exc)})
+        if not persisted:
+            positions = await _persist_turn(context, "", append_messages, logger)
+    yield TurnEvent(
+        "done",
+        {
+            "story_id": context.story.id if context.story else None,
+            "positions": positions,
+            "usage": usage_stats,
+            "timing": {"first_token_ms": first_token_ms, "duration_ms": _elapsed_ms(start)},
+        },
+    )
+
+
+def _elapsed_ms(start: float) -> int:
+    return int((time.monotonic() - start) * 1000)
+
+
+def _usage_stats(metadata: dict) -> dict:
+    stats: dict = {}
+    if metadata.get("prompt_eval_count") is not None:
+        stats["prompt_tokens"] = metadata["prompt_eval_count"]
+    if metadata.get("prompt_eval_duration") is not None:
+        stats["prompt_eval_ms"] = int(metadata["prompt_eval_duration"]) // 1_000_000
+    if metadata.get("eval_count") is not None:
+        stats["completion_tokens"] = metadata["eval_count"]
+    usage = metadata.get("usage") or {}
+    if usage.get("prompt_tokens") is not None:
+        stats["prompt_tokens"] = usage["prompt_tokens"]
+    if usage.get("completion_tokens") is not None:
+        stats["completion_tokens"] = usage["completion_tokens"]
+    cached = (usage.get("prompt_tokens_details") or {}).get("cached_tokens")
+    if cached is not None:
+        stats["cached_tokens"] = cached
+    return stats
+
+
+def _turn_messages(context: TurnContext, assistant_text: str) -> list[dict]:
+    messages: list[dict] = []
+    if context.persist_user:
+        messages.append({"role": "user", "text": context.text, "mode": context.mode})
+    if assistant_text.strip():
+        messages.append({"role": "assistant", "text": assistant_text})
+    return messages
+
+
+async def _persist_turn(
+    context: TurnContext,
+    assistant_text: str,
+    append_messages: Callable[[list[dict]], Awaitable[list[int]]] | None,
+    logger: LoggerProtocol,
+) -> list[int]:
+    if not context.story or append_messages is None:
+        return []
+    messages = _turn_messages(context, assistant_text)
+    if not messages:
+        return []
+    try:
+        positions = await append_messages(messages)
+        logger.debug("turn_messages_appended story_id=%s count=%d", context.story.id, len(messages))
+        return list(positions)
+    except Exception:
+        logger.exception("turn_messages_append_failed story_id=%s", context.story.id)
+        return []
 
 
-def _schedule_lore_suggestions(
+def schedule_lore_suggestions(
     story_id: str | None,
     user_input: str,
     assistant_text: str,
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
+
+from src.backend.application.ports import LoggerProtocol
+from src.backend.application.turn_events import TurnEvent, delta_event
+
+
+@dataclass(frozen=True)
+class TurnStreamSettings:
+    ttl_seconds: float = 120.0
+    buffer_chars: int = 65536
+    detach_grace_seconds: float = 15.0
+
+
+class TurnStreamNotFoundError(LookupError):
+    pass
+
+
+class TurnStreamOffsetError(ValueError):
+    pass
+
+
+class TurnStream:
+    def __init__(self, turn_id: str, buffer_chars: int) -> None:
+        self.id = turn_id
+        self._buffer_chars = buffer_chars
+        self._parts: deque[str] = deque()
+        self._buffered = 0
+        self.base_offset = 0
+        self.size = 0
+        self.status: TurnEvent | None = None
+        self.final: list[TurnEvent] = []
+        self.finished_at: float | None = None
+        self.readers = 0
+        self.changed = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.detach_timer: asyncio.TimerHandle | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def append(self, event: TurnEvent) -> None:
+        if event.type == "delta":
+            text = event.data["text"]
+            self._parts.append(text)
+            self._buffered += len(text)
+            self.size += len(text)
+            while self._buffered > self._buffer_chars and len(self._parts) > 1:
+                dropped = self._parts.popleft()
+                self._buffered -= len(dropped)
+                self.base_offset += len(dropped)
+        elif event.type == "queued":
+            self.status = event
+        else:
+            self.final.append(event)
+        self._notify()
+
+    def finish(self, clock: Callable[[], float]) -> None:
+        if self.finished_at is None:
+            self.finished_at = clock()
+            self._notify()
+
+    def text_since(self, offset: int) -> str:
+        missing = self.size - offset
+        if missing <= 0:
+            return ""
+        parts: list[str] = []
+        covered = 0
+        for part in reversed(self._parts):
+            if covered >= missing:
+                break
+            parts.append(part)
+            covered += len(part)
+        return "".join(reversed(parts))[-missing:]
+
+    def _notify(self) -> None:
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class TurnStreamRegistry:
+    def __init__(
+        self,
+        settings: TurnStreamSettings,
+        logger: LoggerProtocol,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._settings = settings
+        self._logger = logger
+        self._clock = clock
+        self._streams: dict[str, TurnStream] = {}
+
+    def start(self, events: AsyncIterable[TurnEvent]) -> TurnStream:
+        self._purge()
+        stream = TurnStream(uuid.uuid4().hex, self._settings.buffer_chars)
+        self._streams[stream.id] = stream
+        stream.task = asyncio.get_running_loop().create_task(self._produce(stream, events))
+        return stream
+
+    def open(self, turn_id: str, offset: int = 0) -> AsyncIterator[TurnEvent]:
+        self._purge()
+        stream = self._streams.get(turn_id)
+        if stream is None:
+            raise TurnStreamNotFoundError("Turn stream not found")
+        if offset < stream.base_offset or offset > stream.size:
+            raise TurnStreamOffsetError(
+                f"Offset must be between {stream.base_offset} and {stream.size}"
+            )
+        self._attach(stream)
+        return self._follow(stream, offset)
+
+    async def _produce(self, stream: TurnStream, events: AsyncIterable[TurnEvent]) -> None:
+        try:
+            async for event in events:
+                stream.append(event)
+        except asyncio.CancelledError:
+            self._logger.debug("turn_stream_cancelled turn_id=%s chars=%d", stream.id, stream.size)
+            stream.append(TurnEvent("error", {"message": "Turn was abandoned by the client"}))
+        except Exception as exc:
+            self._logger.exception("turn_stream_failed turn_id=%s", stream.id)
+            stream.append(TurnEvent("error", {"message": str(exc)}))
+        finally:
+            stream.finish(self._clock)
+
+    async def _follow(self, stream: TurnStream, offset: int) -> AsyncIterator[TurnEvent]:
+        try:
+            yield TurnEvent("turn", {"turn_id": stream.id, "offset": offset})
+            sent_status = None
+            sent_final = 0
+            while True:
+                changed = stream.changed
+                if offset < stream.base_offset:
+                    yield TurnEvent("error", {"message": "Turn stream buffer overflowed"})
+                    return
+                text = stream.text_since(offset)
+                if text:
+                    offset += len(text)
+                    yield delta_event(text)
+                elif stream.status is not sent_status and stream.size == 0:
+                    sent_status = stream.status
+                    yield sent_status
+                while sent_final < len(stream.final):
+                    sent_final += 1
+                    yield stream.final[sent_final - 1]
+                if stream.finished and offset >= stream.size:
+                    return
+                await changed.wait()
+        finally:
+            self._detach(stream)
+
+    def _attach(self, stream: TurnStream) -> None:
+        stream.readers += 1
+        if stream.detach_timer is not None:
+            stream.detach_timer.cancel()
+            stream.detach_timer = None
+
+    def _detach(self, stream: TurnStream) -> None:
+        stream.readers -= 1
+        if stream.readers > 0 or stream.finished or stream.task is None:
+            return
+        self._logger.debug("turn_stream_detached turn_id=%s chars=%d", stream.id, stream.size)
+        stream.detach_timer = asyncio.get_running_loop().call_later(
+            self._settings.detach_grace_seconds,
+            self._cancel_detached,
+            stream,
+        )
+
+    def _cancel_detached(self, stream: TurnStream) -> None:
+        stream.detach_timer = None
+        if stream.readers == 0 and not stream.finished and stream.task is not None:
+            stream.task.cancel()
+
+    def _purge(self) -> None:
+        now = self._clock()
+        expired = [
+            turn_id
+            for turn_id, stream in self._streams.items()
+            if stream.finished and now - stream.finished_at > self._settings.ttl_seconds
+        ]
+        for turn_id in expired:
+            del self._streams[turn_id]
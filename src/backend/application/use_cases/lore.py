@@ -8,10 +8,13 @@ from langchain_core.documents import Document
 
 from src.backend.application.ports import EmbeddingsProtocol
 from src.backend.application.vectorstores.lore_vectorstore import LoreVectorStore
+from src.backend.infrastructure.embedding_cache import text_hash
+
+LORE_SYNC_BATCH_SIZE = int(os.getenv("LORE_SYNC_BATCH_SIZE", "32"))
 
 
 class LoreRepository(Protocol):
-    def retrieve(self, story_id: str, query: str) -> list[Document]:
+    async def aretrieve(self, story_id: str, query: str) -> list[Document]:
         ...
 
 
@@ -19,7 +22,37 @@ class LoreRepository(Protocol):
 class DbLoreRepository:
     embeddings: EmbeddingsProtocol
 
-    def retrieve(self, story_id: str, query: str) -> list[Document]:
+    async def aretrieve(self, story_id: str, query: str) -> list[Document]:
         top_k = int(os.getenv("LORE_TOP_K", "8"))
         store = LoreVectorStore(self.embeddings, story_id)
-        return store.similarity_search(query, k=top_k)
+        return await store.asimilarity_search(query, k=top_k)
+
+
+@dataclass(frozen=True)
+class LoreSyncResult:
+    embedded: int
+    unchanged: int
+    deleted: int
+
+
+def sync_lore_index(
+    store: LoreVectorStore,
+    entries: list[tuple[str, str, dict]],
+    batch_size: int = LORE_SYNC_BATCH_SIZE,
+) -> LoreSyncResult:
+    indexed = store.indexed_content_hashes()
+    changed = [
+        (lore_id, text, metadata)
+        for lore_id, text, metadata in entries
+        if indexed.get(lore_id) != text_hash(text)
+    ]
+    for start in range(0, len(changed), max(1, batch_size)):
+        batch = changed[start : start + batch_size]
+        store.add_texts([text for _, text, _ in batch], metadatas=[meta for _, _, meta in batch])
+    orphaned = sorted(set(indexed) - {lore_id for lore_id, _, _ in entries})
+    store.delete_points(orphaned)
+    return LoreSyncResult(
+        embedded=len(changed),
+        unchanged=len(entries) - len(changed),
+        deleted=len(orphaned),
+    )
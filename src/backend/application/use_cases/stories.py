@@ -1,16 +1,43 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import logging
+from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Protocol
 
-from src.backend.infrastructure.models import StoryModel
+from sqlalchemy import String, and_, cast, func, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from src.backend.application.use_cases.turn_models import StorySnapshot
+from src.backend.infrastructure.db import SessionLocal
+from src.backend.infrastructure.models import (
+    LoreSuggestionModel,
+    StoryMessageModel,
+    StoryModel,
+    StorySummaryModel,
+)
+
+logger = logging.getLogger("backend")
+
+APPEND_ATTEMPTS = 3
+STORY_SUMMARY_LOAD = (joinedload(StoryModel.summary_record),)
+STORY_TURN_LOAD = (*STORY_SUMMARY_LOAD, selectinload(StoryModel.lore_entries))
+STORY_DETAIL_LOAD = (
+    *STORY_TURN_LOAD,
+    selectinload(StoryModel.lore_suggestions.and_(LoreSuggestionModel.status == "pending")),
+)
+STORY_TRANSCRIPT_LOAD = (selectinload(StoryModel.messages),)
 
 
 class StoryRepository(Protocol):
-    def get_story(self, story_id: str) -> StoryModel | None:
+    async def aload_snapshot(self, story_id: str) -> StorySnapshot | None:
         ...
 
-    def commit(self) -> None:
+    async def aappend_messages(self, story_id: str, messages: list[dict]) -> list[int]:
         ...
 
 
@@ -18,8 +45,157 @@ class StoryRepository(Protocol):
 class DbStoryRepository:
     db: object
 
-    def get_story(self, story_id: str) -> StoryModel | None:
-        return self.db.query(StoryModel).filter(StoryModel.id == story_id).first()
+    def get_story(self, story_id: str, load: tuple = ()) -> StoryModel | None:
+        query = self.db.query(StoryModel).filter(StoryModel.id == story_id)
+        if load:
+            query = query.options(*load).populate_existing()
+        return query.first()
+
+    def list_stories(
+        self,
+        limit: int | None = None,
+        after: tuple[datetime, str] | None = None,
+        tag: str | None = None,
+    ) -> tuple[list, tuple[datetime, str] | None]:
+        query = self.db.query(
+            StoryModel.id,
+            StoryModel.title,
+            StoryModel.description,
+            StoryModel.tags,
+            StoryModel.updated_at,
+        )
+        if tag:
+            # Tags are a JSON list; match the encoded element so it works on sqlite and Postgres.
+            query = query.filter(
+                cast(StoryModel.tags, String).contains(json.dumps(tag), autoescape=True)
+            )
+        if after is not None:
+            updated_at, story_id = after
+            query = query.filter(
+                or_(
+                    StoryModel.updated_at < updated_at,
+                    and_(StoryModel.updated_at == updated_at, StoryModel.id < story_id),
+                )
+            )
+        query = query.order_by(StoryModel.updated_at.desc(), StoryModel.id.desc())
+        if limit is None:
+            return query.all(), None
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+        return page, (page[-1].updated_at, page[-1].id) if len(rows) > limit else None
+
+    def last_position(self, story_id: str) -> int:
+        position = (
+            self.db.query(func.max(StoryMessageModel.position))
+            .filter(StoryMessageModel.story_id == story_id)
+            .scalar()
+        )
+        return -1 if position is None else int(position)
+
+    def message_window(
+        self, story_id: str, limit: int, before_position: int | None = None
+    ) -> tuple[list[StoryMessageModel], int | None]:
+        query = self.db.query(StoryMessageModel).filter(StoryMessageModel.story_id == story_id)
+        if before_position is not None:
+            query = query.filter(StoryMessageModel.position < before_position)
+        rows = query.order_by(StoryMessageModel.position.desc()).limit(limit + 1).all()
+        window = rows[:limit][::-1]
+        return window, window[0].position if len(rows) > limit else None
+
+    def messages_from(self, story_id: str, start_position: int) -> list[StoryMessageModel]:
+        return (
+            self.db.query(StoryMessageModel)
+            .filter(
+                StoryMessageModel.story_id == story_id,
+                StoryMessageModel.position >= start_position,
+            )
+            .order_by(StoryMessageModel.position)
+            .all()
+        )
+
+    def append_messages(self, story_id: str, messages: list[dict]) -> list[StoryMessageModel]:
+        position = self.last_position(story_id)
+        rows: list[StoryMessageModel] = []
+        for msg in messages:
+            position += 1
+            row = StoryMessageModel(
+                story_id=story_id,
+                role=str(msg.get("role", "")).strip(),
+                text=str(msg.get("text", "") or ""),
+                mode=msg.get("mode") or None,
+                position=position,
+            )
+            self.db.add(row)
+            rows.append(row)
+        return rows
+
+    def append_and_commit(self, story_id: str, messages: list[dict]) -> list[int]:
+        # (story_id, position) is unique: a racing append that took the same positions
+        # first makes the commit fail, so re-read the tail and try again.
+        for attempt in range(1, APPEND_ATTEMPTS + 1):
+            positions = [row.position for row in self.append_messages(story_id, messages)]
+            try:
+                self.db.commit()
+                return positions
+            except IntegrityError:
+                self.db.rollback()
+                if attempt == APPEND_ATTEMPTS:
+                    raise
+                logger.debug("story_append_raced story_id=%s attempt=%d", story_id, attempt)
+        return []
+
+    def pop_message(self, story_id: str) -> StoryMessageModel | None:
+        message = (
+            self.db.query(StoryMessageModel)
+            .filter(StoryMessageModel.story_id == story_id)
+            .order_by(StoryMessageModel.position.desc())
+            .first()
+        )
+        if message is None:
+            return None
+        self.db.delete(message)
+        summary_record = self.db.get(StorySummaryModel, story_id)
+        if summary_record is not None and summary_record.last_position >= message.position:
+            summary_record.last_position = message.position - 1
+        return message
 
     def commit(self) -> None:
         self.db.commit()
+
+
+@dataclass
+class TurnStoryRepository:
+    session_factory: Callable[[], Session] = SessionLocal
+    history_window: int = 0
+
+    def load_snapshot(self, story_id: str) -> StorySnapshot | None:
+        with self.session_factory() as db:
+            repo = DbStoryRepository(db=db)
+            windowed = self.history_window > 0
+            load = STORY_TURN_LOAD if windowed else STORY_TURN_LOAD + STORY_TRANSCRIPT_LOAD
+            story = repo.get_story(story_id, load)
+            if story is None:
+                return None
+            if not windowed:
+                return StorySnapshot.from_model(story)
+            # The window hops in whole steps so the oldest prompt message stays put between hops.
+            start = max(0, repo.last_position(story_id) + 1 - self.history_window)
+            start -= start % self.history_window
+            return StorySnapshot.from_model(story, repo.messages_from(story_id, start))
+
+    def story_exists(self, story_id: str) -> bool:
+        with self.session_factory() as db:
+            return db.query(StoryModel.id).filter(StoryModel.id == story_id).first() is not None
+
+    def append_messages(self, story_id: str, messages: list[dict]) -> list[int]:
+        with self.session_factory() as db:
+            return DbStoryRepository(db=db).append_and_commit(story_id, messages)
+
+    async def aload_snapshot(self, story_id: str) -> StorySnapshot | None:
+        return await asyncio.to_thread(self.load_snapshot, story_id)
+
+    async def astory_exists(self, story_id: str) -> bool:
+        return await asyncio.to_thread(self.story_exists, story_id)
+
+    async def aappend_messages(self, story_id: str, messages: list[dict]) -> list[int]:
+        return await asyncio.to_thread(self.append_messages, story_id, messages)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from langchain_core.documents import Document
 
-from src.backend.infrastructure.models import StoryModel
+from src.backend.infrastructure.embeddings import build_lore_text
+from src.backend.infrastructure.models import LoreEntryModel, StoryMessageModel, StoryModel
 
 
 @dataclass(frozen=True)
@@ -13,12 +14,60 @@ class TurnPayload:
     mode: str | None = None
     story_id: str | None = None
     trigger: str | None = None
+    persist_user: bool = True
+
+
+@dataclass(frozen=True)
+class StorySnapshot:
+    id: str
+    ai_instruction_key: str
+    ai_instructions: str
+    summary_prompt_key: str
+    plot_summary: str
+    plot_essentials: str
+    author_note: str
+    messages: list[dict] = field(default_factory=list)
+    lore_entries: list = field(default_factory=list)
+
+    @classmethod
+    def from_model(
+        cls, story: StoryModel, messages: list[StoryMessageModel] | None = None
+    ) -> StorySnapshot:
+        if messages is None:
+            messages = story.messages
+        return cls(
+            id=story.id,
+            ai_instruction_key=story.ai_instruction_key,
+            ai_instructions=story.ai_instructions or "",
+            summary_prompt_key=story.summary_prompt_key or "",
+            plot_summary=story.plot_summary or "",
+            plot_essentials=story.plot_essentials or "",
+            author_note=story.author_note or "",
+            messages=[msg.to_payload() for msg in messages],
+            lore_entries=[lore_document(entry) for entry in story.lore_entries],
+        )
+
+
+def lore_document(entry: LoreEntryModel) -> Document:
+    return Document(
+        page_content=build_lore_text(
+            entry.title, entry.tag, entry.triggers or "", entry.description or ""
+        ),
+        metadata={
+            "lore_id": entry.id,
+            "title": entry.title,
+            "tag": entry.tag,
+            "description": entry.description or "",
+            "triggers": entry.triggers or "",
+        },
+    )
 
 
 @dataclass
 class TurnContext:
     text: str
     mode: str
-    story: StoryModel | None
+    story: StorySnapshot | None
     lore_entries: list[Document] | None
     model_profile_id: str | None = None
+    persist_user: bool = False
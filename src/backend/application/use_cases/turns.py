@@ -1,33 +1,59 @@
 from __future__ import annotations
 
-from collections.abc import Iterator
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import aclosing
 from dataclasses import dataclass
+from functools import partial
+
+from langchain_core.documents import Document
 
 from src.backend.application.input_formatting import normalize_mode
+from src.backend.application.lore_prefetch import LorePrefetcher
+from src.backend.application.lore_triggers import LoreTriggerIndex
+from src.backend.application.lore_working_set import LoreWorkingSet
 from src.backend.application.ports import ChatModelProtocol, LoggerProtocol
-from src.backend.application.turn_service import stream_turn
+from src.backend.application.prompt_builder import CLASSIC_LAYOUT, should_skip_lore
+from src.backend.application.summary_scheduler import SummaryScheduler
+from src.backend.application.turn_events import TurnEvent
+from src.backend.application.turn_service import schedule_lore_suggestions, stream_turn
 from src.backend.application.use_cases.lore import LoreRepository
 from src.backend.application.use_cases.stories import StoryRepository
-from src.backend.application.use_cases.turn_models import TurnContext, TurnPayload
+from src.backend.application.use_cases.turn_models import StorySnapshot, TurnContext, TurnPayload
 
 
 @dataclass(frozen=True)
 class TurnSettings:
     model: str
-    summary_model: str
-    summary_max_chars: int
     model_profile_id: str
-    summary_model_profile_id: str
     recent_pairs: int = 3
     overlap_pairs: int = 0
+    token_budget: int | None = None
+    prompt_layout: str = CLASSIC_LAYOUT
+    lore_top_k: int = 8
+    trigger_history_messages: int = 2
+    lore_deadline_seconds: float = 0.25
 
 
 class TurnUseCase:
-    def __init__(self, settings: TurnSettings, logger: LoggerProtocol) -> None:
+    def __init__(
+        self,
+        settings: TurnSettings,
+        logger: LoggerProtocol,
+        summary_scheduler: SummaryScheduler | None = None,
+        trigger_index: LoreTriggerIndex | None = None,
+        working_set: LoreWorkingSet | None = None,
+        prefetcher: LorePrefetcher | None = None,
+    ) -> None:
         self._settings = settings
         self._logger = logger
+        self._summary_scheduler = summary_scheduler
+        self._trigger_index = trigger_index
+        self._working_set = working_set
+        self._prefetcher = prefetcher
+        self._late_retrievals: set[asyncio.Future] = set()
 
-    def _prepare_context(
+    async def _prepare_context(
         self,
         payload: TurnPayload,
         story_repo: StoryRepository,
@@ -38,36 +64,157 @@ class TurnUseCase:
         story = None
         lore_entries = None
         if payload.story_id:
-            story = story_repo.get_story(payload.story_id)
+            story = await story_repo.aload_snapshot(payload.story_id)
             if not story:
                 raise ValueError("Story not found")
-            retrieval_query = "" if mode == "continue" else text
-            lore_entries = lore_repo.retrieve(story.id, retrieval_query)
+            lore_entries = await self._retrieve_lore(story, text, mode, lore_repo)
         return TurnContext(
             text=text,
             mode=mode,
             story=story,
             lore_entries=lore_entries,
             model_profile_id=self._settings.model_profile_id,
+            persist_user=payload.persist_user and mode != "continue" and bool(text.strip()),
+        )
+
+    async def _retrieve_lore(
+        self,
+        story: StorySnapshot,
+        text: str,
+        mode: str,
+        lore_repo: LoreRepository,
+    ) -> list[Document]:
+        top_k = self._settings.lore_top_k
+        triggered = self._triggered_lore(story, text)
+        prefetched = (
+            self._prefetcher.candidates(story.id, story.lore_entries) if self._prefetcher else []
+        )
+        if mode == "continue":
+            # Continue turns have no query to embed; reuse what recent turns retrieved.
+            active = (
+                self._working_set.active(story.id, story.lore_entries) if self._working_set else []
+            )
+            lore = _merge_lore(triggered, prefetched + active, story.plot_essentials, top_k)
+            self._logger.debug(
+                "lore_working_set story_id=%s triggered=%d prefetched=%d active=%d",
+                story.id,
+                len(triggered),
+                len(prefetched),
+                len(active),
+            )
+        elif len(triggered) >= top_k:
+            self._logger.debug(
+                "lore_trigger_fast_path story_id=%s hits=%d", story.id, len(triggered)
+            )
+            lore = triggered[:top_k]
+        else:
+            retrieved = await self._retrieve_within_deadline(
+                story.id, text, lore_repo, has_fallback=bool(prefetched)
+            )
+            lore = _merge_lore(triggered, retrieved + prefetched, story.plot_essentials, top_k)
+            self._logger.debug(
+                "lore_trigger_merge story_id=%s triggered=%d retrieved=%d prefetched=%d",
+                story.id,
+                len(triggered),
+                len(retrieved),
+                len(prefetched),
+            )
+        if self._working_set is not None:
+            self._working_set.update(story.id, lore)
+        return lore
+
+    async def _retrieve_within_deadline(
+        self,
+        story_id: str,
+        text: str,
+        lore_repo: LoreRepository,
+        has_fallback: bool,
+    ) -> list[Document]:
+        deadline = self._settings.lore_deadline_seconds
+        if not has_fallback or deadline <= 0:
+            return await lore_repo.aretrieve(story_id, text)
+        retrieval = asyncio.ensure_future(lore_repo.aretrieve(story_id, text))
+        done, _ = await asyncio.wait({retrieval}, timeout=deadline)
+        if done:
+            return retrieval.result()
+        # Let the late search finish instead of cancelling it mid-request; its hits are dropped.
+        self._late_retrievals.add(retrieval)
+        retrieval.add_done_callback(self._late_retrievals.discard)
+        retrieval.add_done_callback(_discard_result)
+        self._logger.debug(
+            "lore_retrieval_deadline_missed story_id=%s deadline_ms=%d",
+            story_id,
+            int(deadline * 1000),
         )
+        return []
 
-    def run_stream(
+    def _triggered_lore(self, story: StorySnapshot, text: str) -> list[Document]:
+        if self._trigger_index is None:
+            return []
+        history_count = self._settings.trigger_history_messages
+        history = story.messages[-history_count:] if history_count > 0 else []
+        texts = [text, *(message.get("text", "") for message in reversed(history))]
+        return [
+            entry
+            for entry in self._trigger_index.match(story.id, story.lore_entries, texts)
+            if not should_skip_lore(entry, story.plot_essentials)
+        ]
+
+    async def run_stream(
         self,
         payload: TurnPayload,
         story_repo: StoryRepository,
         lore_repo: LoreRepository,
         chat_model: ChatModelProtocol,
-    ) -> Iterator[str]:
-        context = self._prepare_context(payload, story_repo, lore_repo)
-        return stream_turn(
+    ) -> AsyncIterator[TurnEvent]:
+        # Nothing is loaded until the first event is pulled, so a queued turn reads the story
+        # (and searches lore) only once the scheduler has granted it a slot.
+        context = await self._prepare_context(payload, story_repo, lore_repo)
+        append_messages = (
+            partial(story_repo.aappend_messages, context.story.id) if context.story else None
+        )
+        events = stream_turn(
             context,
             chat_model,
             self._settings.model,
             self._logger,
-            commit=story_repo.commit,
-            summary_model=self._settings.summary_model,
-            summary_max_chars=self._settings.summary_max_chars,
-            summary_model_profile_id=self._settings.summary_model_profile_id,
+            append_messages=append_messages,
+            schedule_summary=self._summary_scheduler.schedule if self._summary_scheduler else None,
+            suggest_lore=partial(
+                schedule_lore_suggestions,
+                model=self._settings.model,
+                logger=self._logger,
+            ),
+            prefetch_lore=(
+                partial(self._prefetcher.schedule, lore_repo) if self._prefetcher else None
+            ),
             recent_pairs=self._settings.recent_pairs,
             overlap_pairs=self._settings.overlap_pairs,
+            token_budget=self._settings.token_budget,
+            prompt_layout=self._settings.prompt_layout,
         )
+        async with aclosing(events):
+            async for event in events:
+                yield event
+
+
+def _merge_lore(
+    leading: list[Document],
+    candidates: list[Document],
+    plot_essentials: str,
+    top_k: int,
+) -> list[Document]:
+    merged = list(leading)
+    seen = {entry.metadata.get("lore_id") for entry in leading}
+    for entry in candidates:
+        lore_id = entry.metadata.get("lore_id")
+        if lore_id in seen or should_skip_lore(entry, plot_essentials):
+            continue
+        seen.add(lore_id)
+        merged.append(entry)
+    return merged[:top_k]
+
+
+def _discard_result(task: asyncio.Future) -> None:
+    if not task.cancelled():
+        task.exception()
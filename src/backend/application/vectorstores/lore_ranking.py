@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+def select_diverse(
+    scores: Sequence[float],
+    vectors: np.ndarray | None,
+    k: int,
+    lambda_mult: float,
+    score_threshold: float,
+) -> list[int]:
+    relevance = np.asarray(scores, dtype=np.float32)
+    candidates = np.flatnonzero(relevance >= score_threshold)
+    if k <= 0 or candidates.size == 0:
+        return []
+    candidates = candidates[np.argsort(-relevance[candidates], kind="stable")]
+    if vectors is None or candidates.size <= 1 or lambda_mult >= 1.0:
+        return candidates[:k].tolist()
+    unit = _normalize_rows(np.asarray(vectors, dtype=np.float32)[candidates])
+    similarity = unit @ unit.T
+    relevance = relevance[candidates]
+    chosen = [0]
+    redundancy = similarity[0].copy()
+    available = np.ones(candidates.size, dtype=bool)
+    available[0] = False
+    while len(chosen) < min(k, candidates.size):
+        marginal = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        marginal[~available] = -np.inf
+        pick = int(np.argmax(marginal))
+        chosen.append(pick)
+        available[pick] = False
+        np.maximum(redundancy, similarity[pick], out=redundancy)
+    return candidates[chosen].tolist()
@@ -5,14 +5,46 @@ import logging
 import os
 from typing import Iterable, List
 
+import numpy as np
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
 from langchain_core.vectorstores import VectorStore
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, FieldCondition, Filter, MatchValue, PointStruct, VectorParams
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
+from qdrant_client.http.models import (
+    Distance,
+    FieldCondition,
+    Filter,
+    HnswConfigDiff,
+    KeywordIndexParams,
+    KeywordIndexType,
+    MatchValue,
+    PointStruct,
+    VectorParams,
+)
+
+from src.backend.application.vectorstores.lore_ranking import select_diverse
+from src.backend.infrastructure.embedding_cache import text_hash
+from src.backend.infrastructure.lore_vector_cache import (
+    LORE_VECTOR_CACHE,
+    LoreVectorCache,
+    StoryVectors,
+)
+from src.backend.infrastructure.qdrant import (
+    QDRANT_URL,
+    collection_verified,
+    forget_collection,
+    get_async_qdrant_client,
+    get_qdrant_client,
+    mark_collection_verified,
+)
 
 logger = logging.getLogger("backend")
 
+SHARED_LAYOUT = "shared"
+PER_STORY_LAYOUT = "per_story"
+TENANT_FIELD = "story_id"
+
 
 class LoreVectorStore(VectorStore):
     def __init__(
@@ -22,23 +54,181 @@ class LoreVectorStore(VectorStore):
         client: QdrantClient | None = None,
         collection: str | None = None,
         vector_size: int | None = None,
+        async_client: AsyncQdrantClient | None = None,
+        vector_cache: LoreVectorCache | None = LORE_VECTOR_CACHE,
+        score_threshold: float | None = None,
+        mmr_lambda: float | None = None,
+        layout: str | None = None,
     ) -> None:
         self._embeddings = embeddings
         self._story_id = story_id
-        self._client = client or QdrantClient(url=os.getenv("QDRANT_URL", "http://qdrant:6333"))
+        self._url = QDRANT_URL
+        self._sync_client = client
+        self._async_client = async_client
+        self._layout = layout or os.getenv("QDRANT_LORE_LAYOUT", SHARED_LAYOUT)
         self._collection = collection or os.getenv("QDRANT_COLLECTION", "lore_vectors")
+        if self._layout == PER_STORY_LAYOUT:
+            self._collection = f"{self._collection}_{story_id}"
         self._vector_size = vector_size or int(os.getenv("EMBED_DIM", "768"))
-        self._ensure_collection()
+        self._collection_ready = False
+        self._vector_cache = vector_cache if vector_cache and vector_cache.enabled else None
+        if score_threshold is None:
+            score_threshold = float(os.getenv("LORE_SCORE_THRESHOLD", "0.25"))
+        self._score_threshold = score_threshold
+        if mmr_lambda is None:
+            mmr_lambda = float(os.getenv("LORE_MMR_LAMBDA", "0.7"))
+        self._mmr_lambda = mmr_lambda
+
+    @property
+    def _client(self) -> QdrantClient:
+        if self._sync_client is None:
+            self._sync_client = get_qdrant_client(self._url)
+        if not self._collection_ready:
+            if not collection_verified(self._url, self._collection):
+                self._ensure_collection(self._sync_client)
+                mark_collection_verified(self._url, self._collection)
+            self._collection_ready = True
+        return self._sync_client
+
+    async def _aclient(self) -> AsyncQdrantClient:
+        if self._async_client is None:
+            self._async_client = get_async_qdrant_client(self._url)
+        if not self._collection_ready:
+            if not collection_verified(self._url, self._collection):
+                await self._aensure_collection(self._async_client)
+                mark_collection_verified(self._url, self._collection)
+            self._collection_ready = True
+        return self._async_client
 
     def similarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
         return [doc for doc, _ in self.similarity_search_with_score(query, k, **kwargs)]
 
+    async def asimilarity_search(self, query: str, k: int = 4, **kwargs) -> List[Document]:
+        return [doc for doc, _ in await self.asimilarity_search_with_score(query, k, **kwargs)]
+
     def similarity_search_with_score(self, query: str, k: int = 4, **kwargs):
         if not query:
             return []
         query_vector = self._embeddings.embed_query(query)
-        hits = self._search_points(query_vector, k)
-        logger.debug("lore_qdrant_search query_len=%d hits=%d", len(query), len(hits))
+        fetch_k = self._fetch_k(k, kwargs)
+        found = self._cached_search(self._cached_story_vectors(), query_vector, fetch_k)
+        if found is None:
+            try:
+                hits = self._search_points(query_vector, fetch_k)
+            except UnexpectedResponse as exc:
+                self._forget_missing_collection(exc)
+                raise
+            logger.debug("lore_qdrant_search query_len=%d hits=%d", len(query), len(hits))
+            found = (hits, _hit_vectors(hits))
+        return self._hits_to_results(self._rerank(*found, k))
+
+    async def asimilarity_search_with_score(self, query: str, k: int = 4, **kwargs):
+        if not query:
+            return []
+        query_vector = await self._embeddings.aembed_query(query)
+        fetch_k = self._fetch_k(k, kwargs)
+        found = self._cached_search(await self._acached_story_vectors(), query_vector, fetch_k)
+        if found is None:
+            client = await self._aclient()
+            try:
+                response = await client.query_points(
+                    collection_name=self._collection,
+                    query=query_vector,
+                    query_filter=self._story_filter(),
+                    limit=fetch_k,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+            except UnexpectedResponse as exc:
+                self._forget_missing_collection(exc)
+                raise
+            hits = response.points
+            logger.debug("lore_qdrant_search query_len=%d hits=%d", len(query), len(hits))
+            found = (hits, _hit_vectors(hits))
+        return self._hits_to_results(self._rerank(*found, k))
+
+    def _fetch_k(self, k: int, kwargs: dict) -> int:
+        fetch_k = kwargs.get("fetch_k") or int(os.getenv("LORE_FETCH_K", "0"))
+        return max(k, fetch_k or k * 4)
+
+    def _rerank(self, hits: list, vectors: np.ndarray | None, k: int) -> list:
+        selected = select_diverse(
+            [float(hit.score or 0.0) for hit in hits],
+            vectors,
+            k,
+            self._mmr_lambda,
+            self._score_threshold,
+        )
+        logger.debug(
+            "lore_rerank story_id=%s candidates=%d selected=%d threshold=%.2f",
+            self._story_id,
+            len(hits),
+            len(selected),
+            self._score_threshold,
+        )
+        return [hits[index] for index in selected]
+
+    def _cache_key(self) -> tuple[str, str, str]:
+        return (self._url, self._collection, self._story_id)
+
+    def _cached_story_vectors(self) -> StoryVectors | None:
+        if self._vector_cache is None:
+            return None
+        key = self._cache_key()
+        vectors = self._vector_cache.get(key)
+        if vectors is not None:
+            return vectors
+        generation = self._vector_cache.generation(key)
+        try:
+            points, _ = self._client.scroll(**self._story_vectors_scroll())
+        except Exception:
+            logger.exception("lore_vector_cache_load_failed story_id=%s", self._story_id)
+            return None
+        return self._vector_cache.store(key, generation, points)
+
+    async def _acached_story_vectors(self) -> StoryVectors | None:
+        if self._vector_cache is None:
+            return None
+        key = self._cache_key()
+        vectors = self._vector_cache.get(key)
+        if vectors is not None:
+            return vectors
+        generation = self._vector_cache.generation(key)
+        try:
+            client = await self._aclient()
+            points, _ = await client.scroll(**self._story_vectors_scroll())
+        except Exception:
+            logger.exception("lore_vector_cache_load_failed story_id=%s", self._story_id)
+            return None
+        return self._vector_cache.store(key, generation, points)
+
+    def _story_vectors_scroll(self) -> dict:
+        return {
+            "collection_name": self._collection,
+            "scroll_filter": self._story_filter(),
+            "limit": self._vector_cache.max_points + 1,
+            "with_payload": True,
+            "with_vectors": True,
+        }
+
+    def _cached_search(self, vectors: StoryVectors | None, query_vector: list[float], k: int):
+        if vectors is None:
+            return None
+        found = vectors.search(query_vector, k)
+        if found is not None:
+            logger.debug(
+                "lore_vector_cache_search story_id=%s points=%d hits=%d",
+                self._story_id,
+                len(vectors.ids),
+                len(found[0]),
+            )
+        return found
+
+    def _invalidate_cache(self) -> None:
+        if self._vector_cache is not None:
+            self._vector_cache.invalidate(self._cache_key())
+
+    def _hits_to_results(self, hits) -> list[tuple[Document, float]]:
         results = []
         for hit in hits:
             payload = hit.payload or {}
@@ -58,53 +248,129 @@ class LoreVectorStore(VectorStore):
         if not text_list:
             return []
         embeddings = self._embeddings.embed_documents(text_list)
+        metadata_list = metadatas or [{} for _ in text_list]
+        return self.upsert_vectors(list(zip(text_list, metadata_list, embeddings, strict=True)))
+
+    def upsert_vectors(self, items: list[tuple[str, dict, list[float]]]) -> List[str]:
+        if not items:
+            return []
         points: list[PointStruct] = []
         ids: list[str] = []
-        for idx, text in enumerate(text_list):
-            metadata = (metadatas or [{}])[idx] if metadatas else {}
+        for text, metadata, vector in items:
             lore_id = str(metadata.get("lore_id", "")) or None
             payload = {
                 "story_id": self._story_id,
                 "content": text,
+                "content_hash": text_hash(text),
                 "metadata": metadata,
             }
-            points.append(PointStruct(id=lore_id, vector=embeddings[idx], payload=payload))
+            points.append(PointStruct(id=lore_id, vector=vector, payload=payload))
             if lore_id:
                 ids.append(lore_id)
         self._client.upsert(collection_name=self._collection, points=points)
+        self._invalidate_cache()
         return ids
 
-    def delete_by_lore_id(self, lore_id: str) -> None:
-        if not lore_id:
-            return
-        self._client.delete(collection_name=self._collection, points_selector=[lore_id])
+    def indexed_content_hashes(self) -> dict[str, str]:
+        hashes: dict[str, str] = {}
+        offset = None
+        while True:
+            points, offset = self._client.scroll(
+                collection_name=self._collection,
+                scroll_filter=self._story_filter(),
+                limit=256,
+                offset=offset,
+                with_payload=["content_hash"],
+                with_vectors=False,
+            )
+            for point in points:
+                hashes[str(point.id)] = str((point.payload or {}).get("content_hash") or "")
+            if offset is None:
+                return hashes
 
-    def upsert_lore(self, lore_id: str, vector: list[float], payload: dict) -> None:
-        if not lore_id:
+    def delete_points(self, point_ids: list[str]) -> None:
+        if not point_ids:
             return
-        point = PointStruct(id=lore_id, vector=vector, payload=payload)
-        self._client.upsert(collection_name=self._collection, points=[point])
+        self._client.delete(collection_name=self._collection, points_selector=point_ids)
+        self._invalidate_cache()
 
     @classmethod
     def from_texts(cls, texts: List[str], embedding: Embeddings, **kwargs):
         raise NotImplementedError("Use LoreVectorStore with an existing Qdrant collection")
 
-    def _ensure_collection(self) -> None:
+    def _ensure_collection(self, client: QdrantClient) -> None:
         try:
-            info = self._client.get_collection(self._collection)
-            size = info.config.params.vectors.size  # type: ignore[attr-defined]
-            if size != self._vector_size:
-                logger.warning(
-                    "qdrant_collection_size_mismatch collection=%s expected=%d actual=%d",
-                    self._collection,
-                    self._vector_size,
-                    size,
-                )
-            return
+            info = client.get_collection(self._collection)
+        except Exception:
+            client.create_collection(
+                collection_name=self._collection,
+                vectors_config=self._vectors_config(),
+                hnsw_config=self._hnsw_config(),
+            )
+            info = None
+        else:
+            self._check_vector_size(info)
+        if self._needs_tenant_index(info):
+            client.create_payload_index(
+                collection_name=self._collection,
+                field_name=TENANT_FIELD,
+                field_schema=self._tenant_index(),
+            )
+            self._log_tenant_index()
+
+    async def _aensure_collection(self, client: AsyncQdrantClient) -> None:
+        try:
+            info = await client.get_collection(self._collection)
         except Exception:
-            self._client.create_collection(
+            await client.create_collection(
                 collection_name=self._collection,
-                vectors_config=VectorParams(size=self._vector_size, distance=Distance.COSINE),
+                vectors_config=self._vectors_config(),
+                hnsw_config=self._hnsw_config(),
+            )
+            info = None
+        else:
+            self._check_vector_size(info)
+        if self._needs_tenant_index(info):
+            await client.create_payload_index(
+                collection_name=self._collection,
+                field_name=TENANT_FIELD,
+                field_schema=self._tenant_index(),
+            )
+            self._log_tenant_index()
+
+    def _vectors_config(self) -> VectorParams:
+        return VectorParams(size=self._vector_size, distance=Distance.COSINE)
+
+    def _hnsw_config(self) -> HnswConfigDiff | None:
+        if self._layout == PER_STORY_LAYOUT:
+            return None
+        # Every search is filtered by story, so build per-story graphs instead of a global one.
+        return HnswConfigDiff(m=0, payload_m=16)
+
+    def _needs_tenant_index(self, info) -> bool:
+        if self._layout == PER_STORY_LAYOUT:
+            return False
+        if info is None:
+            return True
+        schema = getattr(info, "payload_schema", None)
+        return schema is not None and TENANT_FIELD not in schema
+
+    def _tenant_index(self) -> KeywordIndexParams:
+        return KeywordIndexParams(type=KeywordIndexType.KEYWORD, is_tenant=True)
+
+    def _log_tenant_index(self) -> None:
+        logger.debug(
+            "qdrant_tenant_index_created collection=%s field=%s", self._collection, TENANT_FIELD
+        )
+
+    def _check_vector_size(self, info) -> None:
+        size = info.config.params.vectors.size  # type: ignore[attr-defined]
+        if size != self._vector_size:
+            logger.warning(
+                "qdrant_collection_size_mismatch collection=%s expected=%d actual=%d",
+                self._collection,
+                self._vector_size,
+                size,
             )
 
     def _search_points(self, query_vector: list[float], limit: int):
@@ -116,6 +382,7 @@ class LoreVectorStore(VectorStore):
                 limit=limit,
                 query_filter=query_filter,
                 with_payload=True,
+                with_vectors=True,
             )
         if hasattr(self._client, "search_points"):
             fn = self._client.search_points
@@ -126,6 +393,8 @@ class LoreVectorStore(VectorStore):
                 "with_payload": True,
             }
             sig = inspect.signature(fn)
+            if "with_vectors" in sig.parameters:
+                kwargs["with_vectors"] = True
             if "query_filter" in sig.parameters:
                 kwargs["query_filter"] = query_filter
             elif "filter" in sig.parameters:
@@ -139,6 +408,8 @@ class LoreVectorStore(VectorStore):
                 "with_payload": True,
             }
             sig = inspect.signature(fn)
+            if "with_vectors" in sig.parameters:
+                kwargs["with_vectors"] = True
             if "query_vector" in sig.parameters:
                 kwargs["query_vector"] = query_vector
             elif "query" in sig.parameters:
@@ -151,5 +422,18 @@ class LoreVectorStore(VectorStore):
             return getattr(result, "points", getattr(result, "result", result))
         raise RuntimeError("Qdrant client does not support vector search")
 
+    def _forget_missing_collection(self, exc: UnexpectedResponse) -> None:
+        if exc.status_code == 404:
+            forget_collection(self._url, self._collection)
+            self._collection_ready = False
+            self._invalidate_cache()
+
     def _story_filter(self) -> Filter:
         return Filter(must=[FieldCondition(key="story_id", match=MatchValue(value=self._story_id))])
+
+
+def _hit_vectors(hits: list) -> np.ndarray | None:
+    vectors = [getattr(hit, "vector", None) for hit in hits]
+    if not vectors or any(not isinstance(vector, list) for vector in vectors):
+        return None
+    return np.asarray(vectors, dtype=np.float32)
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable
+
+from langchain_core.embeddings import Embeddings
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from src.backend.infrastructure.db import SessionLocal
+from src.backend.infrastructure.models import EmbeddingCacheModel
+
+logger = logging.getLogger("backend")
+
+QUERY_KIND = "query"
+DOCUMENT_KIND = "document"
+
+CacheKey = tuple[str, str, str]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def encode_vector(vector: list[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    values = array("f")
+    values.frombytes(data)
+    return values.tolist()
+
+
+class EmbeddingLRU:
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> list[float] | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def put(self, key: CacheKey, vector: list[float]) -> None:
+        if self._max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class CachedEmbeddings(Embeddings):
+    def __init__(
+        self,
+        inner: Embeddings,
+        model: str,
+        memory: EmbeddingLRU,
+        session_factory: Callable[[], Session] | None = SessionLocal,
+        query_instruction: str = "",
+        document_instruction: str = "",
+    ) -> None:
+        self._inner = inner
+        self._model = model
+        self._memory = memory
+        self._session_factory = session_factory
+        self._instructions = {QUERY_KIND: query_instruction, DOCUMENT_KIND: document_instruction}
+
+    def _key(self, kind: str, text: str) -> CacheKey:
+        # The wrapped model prefixes queries and documents differently, so the vectors differ.
+        return (self._model, kind, text_hash(f"{self._instructions[kind]}{text}"))
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key(QUERY_KIND, text)
+        cached = self._lookup([key]).get(key)
+        if cached is not None:
+            return cached
+        vector = self._inner.embed_query(text)
+        self._store({key: vector})
+        return vector
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self._key(DOCUMENT_KIND, text) for text in texts]
+        cached = self._lookup(keys)
+        missing = [index for index, key in enumerate(keys) if key not in cached]
+        if missing:
+            vectors = self._inner.embed_documents([texts[index] for index in missing])
+            fresh = {keys[index]: vector for index, vector in zip(missing, vectors, strict=True)}
+            self._store(fresh)
+            cached.update(fresh)
+        return [cached[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = self._key(QUERY_KIND, text)
+        cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+        cached = (await asyncio.to_thread(self._lookup, [key])).get(key)
+        if cached is not None:
+            return cached
+        vector = await self._inner.aembed_query(text)
+        await asyncio.to_thread(self._store, {key: vector})
+        return vector
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    def _lookup(self, keys: list[CacheKey]) -> dict[CacheKey, list[float]]:
+        found: dict[CacheKey, list[float]] = {}
+        for key in keys:
+            vector = self._memory.get(key)
+            if vector is not None:
+                found[key] = vector
+        missing = [key for key in keys if key not in found]
+        if not missing or self._session_factory is None:
+            return found
+        try:
+            with self._session_factory() as db:
+                rows = (
+                    db.query(EmbeddingCacheModel)
+                    .filter(
+                        EmbeddingCacheModel.model == self._model,
+                        EmbeddingCacheModel.kind.in_({key[1] for key in missing}),
+                        EmbeddingCacheModel.text_hash.in_([key[2] for key in missing]),
+                    )
+                    .all()
+                )
+        except Exception:
+            logger.exception("embedding_cache_lookup_failed model=%s", self._model)
+            return found
+        requested = set(missing)
+        rows = [row for row in rows if (row.model, row.kind, row.text_hash) in requested]
+        for row in rows:
+            key = (row.model, row.kind, row.text_hash)
+            vector = decode_vector(row.vector)
+            self._memory.put(key, vector)
+            found[key] = vector
+        logger.debug(
+            "embedding_cache_lookup model=%s requested=%d memory=%d db=%d",
+            self._model,
+            len(keys),
+            len(keys) - len(missing),
+            len(rows),
+        )
+        return found
+
+    def _store(self, vectors: dict[CacheKey, list[float]]) -> None:
+        vectors = {key: vector for key, vector in vectors.items() if vector}
+        for key, vector in vectors.items():
+            self._memory.put(key, vector)
+        if not vectors or self._session_factory is None:
+            return
+        try:
+            with self._session_factory() as db:
+                for (model, kind, hashed), vector in vectors.items():
+                    db.merge(
+                        EmbeddingCacheModel(
+                            model=model,
+                            kind=kind,
+                            text_hash=hashed,
+                            dim=len(vector),
+                            vector=encode_vector(vector),
+                        )
+                    )
+                db.commit()
+        except IntegrityError:
+            logger.debug("embedding_cache_store_raced model=%s", self._model)
+        except Exception:
+            logger.exception("embedding_cache_store_failed model=%s", self._model)
@@ -4,8 +4,11 @@ import os
 
 from langchain_community.chat_models import ChatOllama
 from langchain_community.embeddings import OllamaEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from src.backend.application.ports import ChatModelProtocol
+from src.backend.infrastructure.db import SessionLocal
+from src.backend.infrastructure.embedding_cache import CachedEmbeddings, EmbeddingLRU
 from src.backend.infrastructure.llm_config import (
     active_chat_model_name,
     active_story_generator_model_name,
@@ -14,6 +17,10 @@ from src.backend.infrastructure.llm_config import (
 )
 from src.backend.infrastructure.openai_compatible_client import OpenAICompatibleChatModel
 
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "2048"))
+EMBED_CACHE_DB = os.getenv("EMBED_CACHE_DB", "1").strip().lower() not in {"0", "false", "no"}
+_EMBEDDING_MEMORY = EmbeddingLRU(EMBED_CACHE_SIZE)
+
 
 def _build_chat_model(model: str | None = None, **options) -> ChatModelProtocol:
     config = get_chat_model_config(model)
@@ -60,8 +67,17 @@ def get_story_generator_repair_model() -> ChatModelProtocol:
     )
 
 
-def get_embedding_model() -> OllamaEmbeddings:
-    return OllamaEmbeddings(
+def get_embedding_model() -> Embeddings:
+    model = os.getenv("EMBED_MODEL", "nomic-embed-text")
+    embeddings = OllamaEmbeddings(
         base_url=os.getenv("OLLAMA_URL", "http://localhost:11434"),
-        model=os.getenv("EMBED_MODEL", "nomic-embed-text"),
+        model=model,
+    )
+    return CachedEmbeddings(
+        embeddings,
+        model,
+        _EMBEDDING_MEMORY,
+        session_factory=SessionLocal if EMBED_CACHE_DB else None,
+        query_instruction=embeddings.query_instruction,
+        document_instruction=embeddings.embed_instruction,
     )
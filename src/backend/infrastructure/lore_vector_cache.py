@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from itertools import count
+
+import numpy as np
+from qdrant_client.http.models import ScoredPoint
+
+LORE_VECTOR_CACHE_STORIES = int(os.getenv("LORE_VECTOR_CACHE_STORIES", "32"))
+LORE_VECTOR_CACHE_MAX_POINTS = int(os.getenv("LORE_VECTOR_CACHE_MAX_POINTS", "1000"))
+LORE_VECTOR_CACHE_TTL_SECONDS = float(os.getenv("LORE_VECTOR_CACHE_TTL_SECONDS", "300"))
+
+CacheKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class StoryVectors:
+    ids: list[str]
+    payloads: list[dict]
+    # None marks a story that is too large for the cache and is always searched in Qdrant.
+    matrix: np.ndarray | None
+    loaded_at: float
+
+    def search(
+        self, query_vector: Sequence[float], k: int
+    ) -> tuple[list[ScoredPoint], np.ndarray] | None:
+        if self.matrix is None:
+            return None
+        if not self.ids or k <= 0:
+            return [], np.empty((0, 0), dtype=np.float32)
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return [], np.empty((0, 0), dtype=np.float32)
+        scores = self.matrix @ (query / norm)
+        k = min(k, len(self.ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        hits = [
+            ScoredPoint(id=self.ids[i], version=0, score=float(scores[i]), payload=self.payloads[i])
+            for i in top
+        ]
+        return hits, self.matrix[top]
+
+
+def _normalized_matrix(vectors: list[Sequence[float]]) -> np.ndarray:
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+    return matrix / norms
+
+
+class LoreVectorCache:
+    def __init__(
+        self,
+        max_stories: int,
+        max_points: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_stories = max_stories
+        self.max_points = max_points
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, StoryVectors] = OrderedDict()
+        self._generations: dict[CacheKey, int] = {}
+        self._counter = count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_stories > 0
+
+    def get(self, key: CacheKey) -> StoryVectors | None:
+        with self._lock:
+            vectors = self._entries.get(key)
+            if vectors is None:
+                return None
+            if self._clock() - vectors.loaded_at > self._ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return vectors
+
+    def generation(self, key: CacheKey) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def store(self, key: CacheKey, generation: int, points: list) -> StoryVectors:
+        if len(points) > self.max_points:
+            vectors = StoryVectors([], [], None, self._clock())
+        else:
+            vectors = StoryVectors(
+                ids=[str(point.id) for point in points],
+                payloads=[point.payload or {} for point in points],
+                matrix=_normalized_matrix([point.vector for point in points]),
+                loaded_at=self._clock(),
+            )
+        with self._lock:
+            # A write that landed while the points were loading makes this snapshot stale.
+            if self._generations.get(key, 0) != generation:
+                return vectors
+            self._entries[key] = vectors
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_stories:
+                self._entries.popitem(last=False)
+        return vectors
+
+    def invalidate(self, key: CacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = next(self._counter)
+
+
+LORE_VECTOR_CACHE = LoreVectorCache(
+    LORE_VECTOR_CACHE_STORIES,
+    LORE_VECTOR_CACHE_MAX_POINTS,
+    LORE_VECTOR_CACHE_TTL_SECONDS,
+)
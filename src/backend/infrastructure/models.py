@@ -4,8 +4,18 @@ from datetime import UTC, datetime
 from typing import List
 from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    event,
+    update,
+)
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 from sqlalchemy.types import JSON
 
 from src.backend.infrastructure.db import Base
@@ -18,6 +28,7 @@ def _generate_id() -> str:
 
 class StoryModel(Base):
     __tablename__ = "stories"
+    __table_args__ = (Index("ix_stories_updated_at_id", "updated_at", "id"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=_generate_id)
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -28,8 +39,16 @@ class StoryModel(Base):
     author_note: Mapped[str] = mapped_column(Text, nullable=False, default="")
     description: Mapped[str] = mapped_column(Text, nullable=False, default="")
     tags: Mapped[List[str]] = mapped_column(JSON, nullable=False, default=list)
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now(UTC))
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now(UTC), onupdate=datetime.now(UTC))
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=lambda: datetime.now(UTC)
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        nullable=False,
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+    )
 
     messages: Mapped[List["StoryMessageModel"]] = relationship(
         "StoryMessageModel",
@@ -72,9 +91,12 @@ class StoryModel(Base):
 
 class StoryMessageModel(Base):
     __tablename__ = "story_messages"
+    __table_args__ = (
+        Index("ix_story_messages_story_id_position", "story_id", "position", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=_generate_id)
-    story_id: Mapped[str] = mapped_column(ForeignKey("stories.id", ondelete="CASCADE"), index=True, nullable=False)
+    story_id: Mapped[str] = mapped_column(ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
     role: Mapped[str] = mapped_column(String, nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False, default="")
     mode: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -123,9 +145,12 @@ class LoreEntryModel(Base):
 
 class LoreSuggestionModel(Base):
     __tablename__ = "lore_suggestions"
+    __table_args__ = (
+        Index("ix_lore_suggestions_story_status_kind_title", "story_id", "status", "kind", "title"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=_generate_id)
-    story_id: Mapped[str] = mapped_column(ForeignKey("stories.id", ondelete="CASCADE"), index=True, nullable=False)
+    story_id: Mapped[str] = mapped_column(ForeignKey("stories.id", ondelete="CASCADE"), nullable=False)
     kind: Mapped[str] = mapped_column(String, nullable=False)  # NEW | UPDATE
     status: Mapped[str] = mapped_column(String, nullable=False, default="pending")  # pending|accepted|rejected
     title: Mapped[str] = mapped_column(String, nullable=False)
@@ -138,3 +163,74 @@ class LoreSuggestionModel(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now(UTC))
 
     story: Mapped[StoryModel] = relationship("StoryModel", back_populates="lore_suggestions")
+
+
+class EmbeddingCacheModel(Base):
+    __tablename__ = "embedding_cache"
+
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, primary_key=True)
+    text_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    dim: Mapped[int] = mapped_column(Integer, nullable=False)
+    vector: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now(UTC))
+
+
+class LoreIndexOutboxModel(Base):
+    __tablename__ = "lore_index_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    story_id: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    lore_id: Mapped[str] = mapped_column(String, nullable=False)
+    op: Mapped[str] = mapped_column(String, nullable=False)  # upsert | delete
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, index=True, nullable=False, default=lambda: datetime.now(UTC)
+    )
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=lambda: datetime.now(UTC)
+    )
+
+
+_STORY_PARTS = (StoryMessageModel, StorySummaryModel, LoreEntryModel, LoreSuggestionModel)
+
+
+def _owning_story_id(obj) -> str | None:
+    if isinstance(obj, StoryModel):
+        return obj.id
+    story = obj.__dict__.get("story")
+    return obj.story_id or (story.id if story is not None else None)
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_story_versions(session: Session, flush_context, instances) -> None:
+    # Any change to a story or one of its parts bumps stories.version, which backs the ETag.
+    created = {obj.id for obj in session.new if isinstance(obj, StoryModel)}
+    removed = {obj.id for obj in session.deleted if isinstance(obj, StoryModel)}
+    modified = [obj for obj in session.dirty if session.is_modified(obj)]
+    touched: set[str] = set()
+    for obj in (*session.new, *modified, *session.deleted):
+        if isinstance(obj, (StoryModel, *_STORY_PARTS)):
+            story_id = _owning_story_id(obj)
+            if story_id:
+                touched.add(story_id)
+    touched -= created | removed
+    if not touched:
+        return
+    loaded = {
+        obj.id: obj for obj in session.identity_map.values() if isinstance(obj, StoryModel)
+    }
+    unloaded = []
+    for story_id in touched:
+        story = loaded.get(story_id)
+        if story is None:
+            unloaded.append(story_id)
+        else:
+            story.version = StoryModel.version + 1
+    if unloaded:
+        session.connection().execute(
+            update(StoryModel.__table__)
+            .where(StoryModel.__table__.c.id.in_(unloaded))
+            .values(version=StoryModel.__table__.c.version + 1)
+        )
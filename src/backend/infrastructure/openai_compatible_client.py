@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Iterable, Iterator
+from collections.abc import AsyncIterator, Iterable, Iterator
 from dataclasses import dataclass, field, replace
 from typing import Any
 
@@ -43,16 +43,28 @@ class OpenAICompatibleChatModel:
             ) as response:
                 response.raise_for_status()
                 for line in response.iter_lines():
-                    if not line.startswith("data: "):
-                        continue
-                    data = line.removeprefix("data: ").strip()
-                    if data == "[DONE]":
+                    chunk = _stream_chunk(line)
+                    if chunk is _STREAM_DONE:
                         break
-                    chunk = httpx.Response(200, content=data).json()
-                    delta = chunk.get("choices", [{}])[0].get("delta", {})
-                    content = delta.get("content") or ""
-                    if content:
-                        yield AIMessage(content=content, response_metadata=chunk)
+                    if chunk is not None:
+                        yield chunk
+
+    async def astream(self, input: Iterable[BaseMessage]) -> AsyncIterator[AIMessage]:
+        payload = self._payload(input, stream=True)
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with client.stream(
+                "POST",
+                self._chat_completions_url(),
+                headers=self._headers(),
+                json=payload,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    chunk = _stream_chunk(line)
+                    if chunk is _STREAM_DONE:
+                        break
+                    if chunk is not None:
+                        yield chunk
 
     def invoke(self, input: Iterable[BaseMessage] | str) -> AIMessage:
         payload = self._payload(input, stream=False)
@@ -63,9 +75,18 @@ class OpenAICompatibleChatModel:
                 json=payload,
             )
             response.raise_for_status()
-        data = response.json()
-        content = data.get("choices", [{}])[0].get("message", {}).get("content") or ""
-        return AIMessage(content=content, response_metadata=data)
+        return _completion_message(response.json())
+
+    async def ainvoke(self, input: Iterable[BaseMessage] | str) -> AIMessage:
+        payload = self._payload(input, stream=False)
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(
+                self._chat_completions_url(),
+                headers=self._headers(),
+                json=payload,
+            )
+            response.raise_for_status()
+        return _completion_message(response.json())
 
     def _chat_completions_url(self) -> str:
         return self.base_url.rstrip("/") + "/chat/completions"
@@ -82,10 +103,34 @@ class OpenAICompatibleChatModel:
             "messages": _messages_payload(input),
             "stream": stream,
         }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}
         payload.update(_openai_options(self.options))
         return payload
 
 
+_STREAM_DONE = object()
+
+
+def _stream_chunk(line: str) -> AIMessage | object | None:
+    if not line.startswith("data: "):
+        return None
+    data = line.removeprefix("data: ").strip()
+    if data == "[DONE]":
+        return _STREAM_DONE
+    chunk = httpx.Response(200, content=data).json()
+    delta = (chunk.get("choices") or [{}])[0].get("delta", {})
+    content = delta.get("content") or ""
+    if not content and not chunk.get("usage"):
+        return None
+    return AIMessage(content=content, response_metadata=chunk)
+
+
+def _completion_message(data: dict[str, Any]) -> AIMessage:
+    content = data.get("choices", [{}])[0].get("message", {}).get("content") or ""
+    return AIMessage(content=content, response_metadata=data)
+
+
 def _messages_payload(input: Iterable[BaseMessage] | str) -> list[dict[str, str]]:
     if isinstance(input, str):
         return [{"role": "user", "content": input}]
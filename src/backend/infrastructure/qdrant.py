@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import weakref
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+QDRANT_URL = os.getenv("QDRANT_URL", "http://qdrant:6333")
+
+_lock = threading.Lock()
+_sync_clients: dict[str, QdrantClient] = {}
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, AsyncQdrantClient]
+] = weakref.WeakKeyDictionary()
+_verified_collections: set[tuple[str, str]] = set()
+
+
+def get_qdrant_client(url: str = QDRANT_URL) -> QdrantClient:
+    with _lock:
+        client = _sync_clients.get(url)
+        if client is None:
+            client = QdrantClient(url=url)
+            _sync_clients[url] = client
+        return client
+
+
+def get_async_qdrant_client(url: str = QDRANT_URL) -> AsyncQdrantClient:
+    # The async client's connection pool is bound to the loop it was first used on.
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(url)
+        if client is None:
+            client = AsyncQdrantClient(url=url)
+            clients[url] = client
+        return client
+
+
+def collection_verified(url: str, collection: str) -> bool:
+    return (url, collection) in _verified_collections
+
+
+def mark_collection_verified(url: str, collection: str) -> None:
+    with _lock:
+        _verified_collections.add((url, collection))
+
+
+def forget_collection(url: str, collection: str) -> None:
+    with _lock:
+        _verified_collections.discard((url, collection))
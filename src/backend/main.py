@@ -1,26 +1,73 @@
 import os
+import threading
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Literal
 
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from src.backend.api.story_routes import cleanup_transient_messages
 from src.backend.api.story_routes import router as story_router
-from src.backend.application.model_profiles import infer_model_profile_id
+from src.backend.api.stream_framing import STREAM_MEDIA_TYPES, frame_events, stop_on_disconnect
+from src.backend.application.llm_settings import COMMON_OPTIONS
+from src.backend.application.lore_indexer import LoreIndexer, LoreIndexerSettings
+from src.backend.application.lore_prefetch import LorePrefetcher
+from src.backend.application.lore_triggers import LoreTriggerIndex
+from src.backend.application.lore_working_set import LoreWorkingSet
+from src.backend.application.model_profiles import (
+    infer_model_profile_id,
+    resolve_prompt_token_budget,
+)
+from src.backend.application.prompt_builder import CLASSIC_LAYOUT, PROMPT_LAYOUTS
+from src.backend.application.summary_scheduler import SummaryScheduler, SummarySettings
+from src.backend.application.turn_events import TurnEvent, coalesce_deltas
+from src.backend.application.turn_scheduler import (
+    TurnQueueFullError,
+    TurnScheduler,
+    TurnSchedulerSettings,
+)
+from src.backend.application.turn_streams import (
+    TurnStreamNotFoundError,
+    TurnStreamOffsetError,
+    TurnStreamRegistry,
+    TurnStreamSettings,
+)
 from src.backend.application.use_cases.lore import DbLoreRepository
-from src.backend.application.use_cases.stories import DbStoryRepository
+from src.backend.application.use_cases.stories import TurnStoryRepository
 from src.backend.application.use_cases.turn_models import TurnPayload
 from src.backend.application.use_cases.turns import TurnSettings, TurnUseCase
-from src.backend.infrastructure.db import get_db
+from src.backend.infrastructure.db import SessionLocal
 from src.backend.infrastructure.langchain_clients import get_chat_model, get_embedding_model
 from src.backend.infrastructure.llm_config import (
     active_chat_model_name,
     active_provider_name,
     active_summary_model_name,
+    get_chat_model_config,
 )
 from src.shared.logging_config import configure_logging
 
-app = FastAPI()
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    # Pick up lore changes that were committed but not indexed before the last shutdown.
+    LORE_INDEXER.notify()
+    threading.Thread(target=_cleanup_transient_messages, daemon=True).start()
+    yield
+
+
+def _cleanup_transient_messages() -> None:
+    # Error replies from older builds were persisted; remove them here instead of on every read.
+    try:
+        with SessionLocal() as db:
+            cleanup_transient_messages(db)
+    except Exception:
+        logger.exception("transient_messages_cleanup_failed")
+
+
+app = FastAPI(lifespan=_lifespan)
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 BACKEND_HOST = os.getenv("BACKEND_HOST", "0.0.0.0")
@@ -31,8 +78,40 @@ SUMMARY_MODEL = active_summary_model_name()
 MODEL_PROFILE_ID = infer_model_profile_id(OLLAMA_MODEL, os.getenv("MODEL_PROFILE"))
 SUMMARY_MODEL_PROFILE_ID = infer_model_profile_id(SUMMARY_MODEL, os.getenv("SUMMARY_MODEL_PROFILE"))
 SUMMARY_MAX_CHARS = int(os.getenv("SUMMARY_MAX_CHARS", "1200"))
+SUMMARY_DEBOUNCE_SECONDS = float(os.getenv("SUMMARY_DEBOUNCE_SECONDS", "2"))
 RECENT_TURN_PAIRS = int(os.getenv("RECENT_TURN_PAIRS", "3"))
 RECENT_TURN_OVERLAP = int(os.getenv("RECENT_TURN_OVERLAP", "2"))
+TURN_HISTORY_WINDOW = int(os.getenv("TURN_HISTORY_WINDOW", "200"))
+PROMPT_TOKEN_BUDGET = int(
+    os.getenv("PROMPT_TOKEN_BUDGET")
+    or resolve_prompt_token_budget(
+        OLLAMA_MODEL,
+        MODEL_PROFILE_ID,
+        num_ctx=COMMON_OPTIONS["num_ctx"] if active_provider_name() == "ollama" else None,
+        num_predict=COMMON_OPTIONS["num_predict"],
+    )
+)
+PROMPT_LAYOUT = os.getenv("PROMPT_LAYOUT", CLASSIC_LAYOUT).strip().lower()
+if PROMPT_LAYOUT not in PROMPT_LAYOUTS:
+    PROMPT_LAYOUT = CLASSIC_LAYOUT
+TURN_MAX_CONCURRENCY = int(os.getenv("TURN_MAX_CONCURRENCY", "1"))
+TURN_MAX_QUEUE = int(os.getenv("TURN_MAX_QUEUE", "8"))
+TURN_STREAM_TTL_SECONDS = float(os.getenv("TURN_STREAM_TTL_SECONDS", "120"))
+TURN_STREAM_BUFFER_CHARS = int(os.getenv("TURN_STREAM_BUFFER_CHARS", "65536"))
+TURN_STREAM_DETACH_GRACE_SECONDS = float(os.getenv("TURN_STREAM_DETACH_GRACE_SECONDS", "15"))
+STREAM_COALESCE_CHARS = int(os.getenv("STREAM_COALESCE_CHARS", "64"))
+STREAM_COALESCE_MS = int(os.getenv("STREAM_COALESCE_MS", "50"))
+EMBED_DIM = int(os.getenv("EMBED_DIM", "768"))
+LORE_TOP_K = int(os.getenv("LORE_TOP_K", "8"))
+LORE_TRIGGERS = os.getenv("LORE_TRIGGERS", "1").strip().lower() not in {"0", "false", "no"}
+LORE_TRIGGER_HISTORY = int(os.getenv("LORE_TRIGGER_HISTORY", "2"))
+LORE_WORKING_SET_DECAY = float(os.getenv("LORE_WORKING_SET_DECAY", "0.5"))
+LORE_PREFETCH = os.getenv("LORE_PREFETCH", "1").strip().lower() not in {"0", "false", "no"}
+LORE_RETRIEVAL_DEADLINE_MS = int(os.getenv("LORE_RETRIEVAL_DEADLINE_MS", "250"))
+LORE_INDEX_BATCH_SIZE = int(os.getenv("LORE_INDEX_BATCH_SIZE", "32"))
+LORE_INDEX_MAX_ATTEMPTS = int(os.getenv("LORE_INDEX_MAX_ATTEMPTS", "10"))
+LORE_INDEX_BACKOFF_SECONDS = float(os.getenv("LORE_INDEX_BACKOFF_SECONDS", "2"))
+LORE_INDEX_MAX_BACKOFF_SECONDS = float(os.getenv("LORE_INDEX_MAX_BACKOFF_SECONDS", "300"))
 BACKEND_LOG_FILE = os.getenv("BACKEND_LOG_FILE", "logs/backend.log")
 FRONTEND_ORIGINS = [
     origin.strip()
@@ -41,7 +120,6 @@ FRONTEND_ORIGINS = [
 ]
 
 logger = configure_logging(BACKEND_LOG_FILE, "backend")
-DB_DEPENDENCY = Depends(get_db)
 CHAT_MODEL_DEPENDENCY = Depends(get_chat_model)
 
 app.add_middleware(
@@ -50,26 +128,83 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Turn-Id", "X-Next-Cursor", "ETag"],
+)
+
+SUMMARY_SCHEDULER = SummaryScheduler(
+    SummarySettings(
+        model=SUMMARY_MODEL,
+        max_chars=SUMMARY_MAX_CHARS,
+        model_profile_id=SUMMARY_MODEL_PROFILE_ID,
+        debounce_seconds=SUMMARY_DEBOUNCE_SECONDS,
+    ),
+    logger,
 )
 
 TURN_USE_CASE = TurnUseCase(
     TurnSettings(
         model=OLLAMA_MODEL,
-        summary_model=SUMMARY_MODEL,
-        summary_max_chars=SUMMARY_MAX_CHARS,
         model_profile_id=MODEL_PROFILE_ID,
-        summary_model_profile_id=SUMMARY_MODEL_PROFILE_ID,
         recent_pairs=RECENT_TURN_PAIRS,
         overlap_pairs=RECENT_TURN_OVERLAP,
+        token_budget=PROMPT_TOKEN_BUDGET,
+        prompt_layout=PROMPT_LAYOUT,
+        lore_top_k=LORE_TOP_K,
+        trigger_history_messages=LORE_TRIGGER_HISTORY,
+        lore_deadline_seconds=LORE_RETRIEVAL_DEADLINE_MS / 1000,
+    ),
+    logger,
+    summary_scheduler=SUMMARY_SCHEDULER,
+    trigger_index=LoreTriggerIndex() if LORE_TRIGGERS else None,
+    working_set=(
+        LoreWorkingSet(decay=LORE_WORKING_SET_DECAY) if LORE_WORKING_SET_DECAY > 0 else None
+    ),
+    prefetcher=LorePrefetcher(logger) if LORE_PREFETCH else None,
+)
+
+TURN_STREAMS = TurnStreamRegistry(
+    TurnStreamSettings(
+        ttl_seconds=TURN_STREAM_TTL_SECONDS,
+        buffer_chars=TURN_STREAM_BUFFER_CHARS,
+        detach_grace_seconds=TURN_STREAM_DETACH_GRACE_SECONDS,
+    ),
+    logger,
+)
+
+TURN_SCHEDULER = TurnScheduler(
+    TurnSchedulerSettings(
+        max_concurrency=TURN_MAX_CONCURRENCY,
+        max_queue=TURN_MAX_QUEUE,
     ),
     logger,
 )
 
+
+LORE_INDEXER = LoreIndexer(
+    LoreIndexerSettings(
+        batch_size=LORE_INDEX_BATCH_SIZE,
+        vector_size=EMBED_DIM,
+        base_backoff_seconds=LORE_INDEX_BACKOFF_SECONDS,
+        max_backoff_seconds=LORE_INDEX_MAX_BACKOFF_SECONDS,
+        max_attempts=LORE_INDEX_MAX_ATTEMPTS,
+    ),
+    logger,
+)
+app.state.lore_indexer = LORE_INDEXER
+
+
+def _turn_backend() -> str:
+    config = get_chat_model_config()
+    return f"{config.provider}:{config.base_url}"
+
+
 class TurnRequest(BaseModel):
     text: str | None = None
     mode: str | None = None
     story_id: str | None = None
     trigger: str | None = None
+    persist_user: bool = True
+    format: Literal["text", "ndjson", "sse"] = "text"
 
 
 class TurnResponse(BaseModel):
@@ -82,6 +217,7 @@ def _to_turn_payload(payload: TurnRequest) -> TurnPayload:
         mode=payload.mode,
         story_id=payload.story_id,
         trigger=payload.trigger,
+        persist_user=payload.persist_user,
     )
 
 
@@ -97,24 +233,83 @@ def healthcheck():
         "model_profile": MODEL_PROFILE_ID,
         "summary_model": SUMMARY_MODEL,
         "summary_model_profile": SUMMARY_MODEL_PROFILE_ID,
+        "prompt_token_budget": PROMPT_TOKEN_BUDGET,
+        "prompt_layout": PROMPT_LAYOUT,
+        "turn_max_concurrency": TURN_MAX_CONCURRENCY,
+        "turn_max_queue": TURN_MAX_QUEUE,
+        "lore_index_backlog": _lore_index_backlog(),
     }
 
 
+def _lore_index_backlog() -> dict:
+    try:
+        backlog = LORE_INDEXER.backlog()
+    except Exception:
+        logger.exception("lore_index_backlog_failed")
+        return {"pending": None, "failed": None}
+    return {"pending": backlog.pending, "failed": backlog.failed}
+
+
 @app.post("/turn/stream")
-def handle_turn_stream(
+async def handle_turn_stream(
     payload: TurnRequest,
-    db=DB_DEPENDENCY,
+    request: Request,
     chat_model=CHAT_MODEL_DEPENDENCY,
 ):
+    repo = TurnStoryRepository(history_window=TURN_HISTORY_WINDOW)
+    if payload.story_id and not await repo.astory_exists(payload.story_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Story not found")
+    try:
+        ticket = TURN_SCHEDULER.admit(_turn_backend(), payload.story_id)
+    except TurnQueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(exc),
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from exc
+    # The slot is otherwise freed when TURN_SCHEDULER.run finishes, which never happens if
+    # setup fails, the client leaves mid-setup, or the producer task ends before its first step.
     try:
-        repo = DbStoryRepository(db=db)
         lore_repo = DbLoreRepository(embeddings=get_embedding_model())
         stream = TURN_USE_CASE.run_stream(_to_turn_payload(payload), repo, lore_repo, chat_model)
-    except ValueError as exc:
+        turn = TURN_STREAMS.start(TURN_SCHEDULER.run(ticket, stream))
+        turn.task.add_done_callback(lambda _: TURN_SCHEDULER.release(ticket))
+        events = TURN_STREAMS.open(turn.id)
+    except BaseException:
+        TURN_SCHEDULER.release(ticket)
+        raise
+    return _turn_stream_response(turn.id, events, payload.format, request)
+
+
+@app.get("/turn/stream/{turn_id}")
+async def resume_turn_stream(
+    turn_id: str,
+    request: Request,
+    offset: int = 0,
+    format: Literal["text", "ndjson", "sse"] = "text",
+):
+    try:
+        events = TURN_STREAMS.open(turn_id, offset)
+    except TurnStreamNotFoundError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
+    except TurnStreamOffsetError as exc:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(exc)) from exc
+    return _turn_stream_response(turn_id, events, format, request)
+
+
+def _turn_stream_response(
+    turn_id: str,
+    events: AsyncIterator[TurnEvent],
+    stream_format: str,
+    request: Request,
+) -> StreamingResponse:
+    events = stop_on_disconnect(events, request.is_disconnected, logger)
+    if stream_format != "text":
+        events = coalesce_deltas(events, STREAM_COALESCE_CHARS, STREAM_COALESCE_MS / 1000)
     return StreamingResponse(
-        stream,
-        media_type="text/plain",
+        frame_events(events, stream_format),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Turn-Id": turn_id},
     )
 
 
@@ -10,9 +10,10 @@ from src.frontend.services.backend_stream import stream_turn
 from src.frontend.state import (
     append_message,
     append_message_with_mode,
+    delete_last_message,
     get_story_messages,
+    invalidate_story_cache,
     update_last_message,
-    update_story_messages,
 )
 
 
@@ -48,10 +49,6 @@ def create_story_actions(
         input_container.set_visibility(False)
         action_wrapper.set_visibility(True)
 
-    async def persist_messages() -> None:
-        messages_snapshot = [dict(msg) for msg in get_story_messages(story_id)]
-        await asyncio.to_thread(update_story_messages, story_id, messages_snapshot)
-
     take_turn_button.on_click(show_input_mode)
     close_button.on_click(show_action_mode)
 
@@ -68,9 +65,12 @@ def create_story_actions(
         append_message(story_id, "assistant", "")
         response_label = append_assistant_label("")
 
+        # The backend appends the turn itself; retries and continues reuse the stored user row.
         try:
             buffer = ""
-            async for chunk in stream_turn(backend_url, text, mode, story_id=story_id):
+            async for chunk in stream_turn(
+                backend_url, text, mode, story_id=story_id, persist_user=show_user
+            ):
                 buffer += chunk
                 update_last_message(story_id, buffer)
                 response_label.set_text(buffer)
@@ -78,15 +78,16 @@ def create_story_actions(
         except HTTPError as exc:
             log_error(f"backend_http_error: {exc}")
             response_label.set_text(f"Backend error: {exc}")
+            invalidate_story_cache(story_id)
         except Exception as exc:
             log_error(f"backend_unexpected_error: {exc}")
             response_label.set_text(f"Unexpected error: {exc}")
+            invalidate_story_cache(story_id)
         finally:
             hide_busy()
             input_field.enable()
             send_button.enable()
             show_action_mode()
-            await persist_messages()
 
     async def submit_command(_=None) -> None:
         cmd = (input_field.value or "").strip()
@@ -112,6 +113,7 @@ def create_story_actions(
         if last_role == "assistant":
             messages.pop()
             render_messages(messages)
+            await asyncio.to_thread(delete_last_message, story_id)
             last_user = _find_last_user(messages)
             if last_user:
                 await send_turn(last_user.get("text", ""), last_user.get("mode", "story"), show_user=False)
@@ -121,15 +123,15 @@ def create_story_actions(
         if last_role == "user":
             await send_turn(messages[-1].get("text", ""), messages[-1].get("mode", "story"), show_user=False)
 
-    def handle_erase() -> None:
+    async def handle_erase() -> None:
         messages = get_story_messages(story_id)
         if not messages:
             return
         messages.pop()
         render_messages(messages)
-        asyncio.create_task(persist_messages())
+        await asyncio.to_thread(delete_last_message, story_id)
 
     bind_input_actions(input_field, send_button, submit_command)
     continue_button.on_click(lambda: asyncio.create_task(handle_continue()))
     retry_button.on_click(lambda: asyncio.create_task(handle_retry()))
-    erase_button.on_click(handle_erase)
+    erase_button.on_click(lambda: asyncio.create_task(handle_erase()))
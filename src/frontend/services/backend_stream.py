@@ -8,9 +8,10 @@ async def stream_turn(
     text: str,
     mode: str,
     story_id: str | None = None,
+    persist_user: bool = True,
 ) -> AsyncIterator[str]:
     async with AsyncClient(timeout=None) as client:
-        payload = {"text": text, "mode": mode}
+        payload = {"text": text, "mode": mode, "persist_user": persist_user}
         if text:
             payload["trigger"] = text
         if story_id:
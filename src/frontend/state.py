@@ -1,5 +1,6 @@
+import copy
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 
@@ -18,6 +19,8 @@ _client = httpx.Client(timeout=15.0)
 
 _story_cache: Dict[str, Story] = {}
 _story_order: List[str] = []
+# Last server copy of each story with its ETag, kept across cache invalidations for revalidation.
+_story_revisions: Dict[str, Tuple[str, Story]] = {}
 
 
 def _request(
@@ -66,7 +69,7 @@ def get_story(story_id: str) -> Optional[Story]:
     if cached and "ai_instructions" in cached:
         _ensure_messages(cached)
         return cached
-    data = _request("GET", f"/stories/{story_id}")
+    data = _fetch_story(story_id)
     if not isinstance(data, dict):
         return None
     _ensure_messages(data)
@@ -74,6 +77,25 @@ def get_story(story_id: str) -> Optional[Story]:
     return data
 
 
+def _fetch_story(story_id: str) -> Optional[Story]:
+    path = f"/stories/{story_id}"
+    known = _story_revisions.get(story_id)
+    headers = {"If-None-Match": known[0]} if known else {}
+    try:
+        response = _client.get(f"{BACKEND_URL}{path}", headers=headers)
+        if response.status_code == 304 and known:
+            return copy.deepcopy(known[1])
+        response.raise_for_status()
+        data = response.json()
+    except Exception as exc:
+        _logger.error("backend_request_failed method=GET path=%s error=%s", path, exc)
+        return None
+    etag = response.headers.get("ETag")
+    if etag and isinstance(data, dict):
+        _story_revisions[story_id] = (etag, copy.deepcopy(data))
+    return data
+
+
 def invalidate_story_cache(story_id: str) -> None:
     _story_cache.pop(story_id, None)
 
@@ -165,6 +187,7 @@ def get_story_generate_job(job_id: str) -> Optional[Dict[str, object]]:
 def delete_story(story_id: str) -> None:
     _request("DELETE", f"/stories/{story_id}")
     _story_cache.pop(story_id, None)
+    _story_revisions.pop(story_id, None)
     if story_id in _story_order:
         _story_order.remove(story_id)
 
@@ -211,12 +234,8 @@ def update_story_field(story_id: str, field: str, value: str) -> None:
         _story_cache[story_id] = data
 
 
-def update_story_messages(story_id: str, messages: List[Message]) -> None:
-    payload = {"messages": messages}
-    data = _request("PUT", f"/stories/{story_id}", payload)
-    if isinstance(data, dict):
-        _ensure_messages(data)
-        _story_cache[story_id] = data
+def delete_last_message(story_id: str) -> None:
+    _request("DELETE", f"/stories/{story_id}/messages/last")
 
 
 def update_story_metadata(story_id: str, title: str, description: str, tags: List[str]) -> None:
@@ -0,0 +1,88 @@
+from fastapi import Request, Response
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.api.story_routes import cleanup_transient_messages, get_story
+from src.backend.application.use_cases.stories import DbStoryRepository
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import StoryMessageModel, StoryModel, StorySummaryModel
+
+
+def _session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'etag.db'}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine, autoflush=False)
+
+
+def _story(db, messages: list[tuple[str, str]] | None = None) -> str:
+    story = StoryModel(
+        title="Test", ai_instruction_key="neutral_storyteller", ai_instructions="Stay grounded."
+    )
+    story.summary_record = StorySummaryModel(summary="", last_position=-1)
+    story.messages = [
+        StoryMessageModel(role=role, text=text, position=position)
+        for position, (role, text) in enumerate(messages or [])
+    ]
+    db.add(story)
+    db.commit()
+    return story.id
+
+
+def _get(db, story_id: str, if_none_match: str | None = None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    response = Response()
+    body = get_story(
+        story_id, Request({"type": "http", "headers": headers}), response, None, db=db
+    )
+    return body, response.headers.get("etag")
+
+
+def test_story_etag_revalidates_until_any_part_of_the_story_changes(tmp_path) -> None:
+    session_factory = _session_factory(tmp_path)
+    with session_factory() as db:
+        story_id = _story(db)
+
+    with session_factory() as db:
+        _, etag = _get(db, story_id)
+        cached, _ = _get(db, story_id, f'W/{etag}, "other"')
+    with session_factory() as db:
+        repo = DbStoryRepository(db=db)
+        repo.append_messages(story_id, [{"role": "user", "text": "Open the gate"}])
+        repo.commit()
+    with session_factory() as db:
+        fresh, fresh_etag = _get(db, story_id, etag)
+        version = db.get(StoryModel, story_id).version
+
+    assert etag == '"v1-all"'
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert fresh_etag == '"v2-all"' and version == 2
+    assert [message.text for message in fresh.messages] == ["Open the gate"]
+
+
+def test_transient_cleanup_runs_outside_reads(tmp_path) -> None:
+    session_factory = _session_factory(tmp_path)
+    with session_factory() as db:
+        story_id = _story(
+            db,
+            [
+                ("user", "look"),
+                ("assistant", "\n[Ollama error: out of memory]"),
+                ("assistant", "The hall is quiet."),
+            ],
+        )
+        clean_id = _story(db, [("assistant", "Mentions Backend error: in the prose.")])
+
+    with session_factory() as db:
+        before, _ = _get(db, story_id)
+    with session_factory() as db:
+        cleaned = cleanup_transient_messages(db)
+    with session_factory() as db:
+        after, etag = _get(db, story_id)
+        untouched, clean_etag = _get(db, clean_id)
+
+    assert len(before.messages) == 3
+    assert cleaned == 1
+    assert [message.text for message in after.messages] == ["look", "The hall is quiet."]
+    assert etag == '"v2-all"'
+    assert len(untouched.messages) == 1 and clean_etag == '"v1-all"'
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.api.story_routes import list_stories
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import StoryModel
+
+
+def _session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'listing.db'}")
+    Base.metadata.create_all(engine)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return sessionmaker(bind=engine, autoflush=False), statements
+
+
+def _seed(db) -> None:
+    updated_at = datetime(2026, 1, 1)
+    for index, tags in enumerate([["dark"], ["light"], ["dark", "sea"], [], ["dark"]]):
+        db.add(
+            StoryModel(
+                id=f"story-{index}",
+                title=f"Story {index}",
+                tags=tags,
+                ai_instruction_key="neutral_storyteller",
+                ai_instructions="Stay grounded.",
+                updated_at=updated_at + timedelta(hours=index // 2),
+            )
+        )
+    db.commit()
+
+
+def _page(db, **params):
+    response = Response()
+    params = {"limit": None, "cursor": None, "tag": None, **params}
+    stories = list_stories(response, db=db, **params)
+    return [story.id for story in stories], response.headers.get("x-next-cursor")
+
+
+def test_listing_pages_by_cursor_without_loading_story_bodies(tmp_path) -> None:
+    session_factory, statements = _session_factory(tmp_path)
+    with session_factory() as db:
+        _seed(db)
+
+    pages = []
+    cursor = None
+    with session_factory() as db:
+        statements.clear()
+        while True:
+            ids, cursor = _page(db, limit=2, cursor=cursor)
+            pages.append(ids)
+            if cursor is None:
+                break
+        everything, last_cursor = _page(db)
+
+    assert pages == [["story-4", "story-3"], ["story-2", "story-1"], ["story-0"]]
+    assert everything == [story_id for page in pages for story_id in page]
+    assert last_cursor is None
+    assert all("ai_instructions" not in statement for statement in statements)
+
+
+def test_listing_filters_by_tag_and_rejects_bad_cursors(tmp_path) -> None:
+    session_factory, _ = _session_factory(tmp_path)
+    with session_factory() as db:
+        _seed(db)
+        first, cursor = _page(db, tag="dark", limit=2)
+        rest, _ = _page(db, tag="dark", limit=2, cursor=cursor)
+        with pytest.raises(HTTPException) as error:
+            _page(db, cursor="not-a-cursor")
+
+    assert first == ["story-4", "story-2"]
+    assert rest == ["story-0"]
+    assert error.value.status_code == 400
@@ -0,0 +1,140 @@
+from fastapi import Request, Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.api.schemas import StoryUpdate
+from src.backend.api.story_routes import accept_lore_suggestion, get_story, update_story
+from src.backend.application.use_cases.stories import TurnStoryRepository
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import (
+    LoreEntryModel,
+    LoreSuggestionModel,
+    StoryMessageModel,
+    StoryModel,
+    StorySummaryModel,
+)
+
+
+class QueryCounter:
+    def __init__(self, engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, *args) -> None:
+        self.count += 1
+
+    def measure(self, fn) -> int:
+        start = self.count
+        fn()
+        return self.count - start
+
+
+def _seed(session_factory, size: int) -> str:
+    with session_factory() as db:
+        story = StoryModel(
+            title="Test", ai_instruction_key="neutral_storyteller", ai_instructions="Stay grounded."
+        )
+        story.summary_record = StorySummaryModel(summary="So far.", last_position=-1)
+        story.messages = [
+            StoryMessageModel(role="user", text=f"m{index}", position=index)
+            for index in range(size)
+        ]
+        story.lore_entries = [
+            LoreEntryModel(title=f"Lore {index}", tag="Place") for index in range(size)
+        ]
+        story.lore_suggestions = [
+            LoreSuggestionModel(kind="NEW", status=status, title=f"Idea {index}", tag="Place")
+            for index, status in enumerate(["pending", "rejected"] * size)
+        ]
+        db.add(story)
+        db.commit()
+        return story.id
+
+
+def _pending_suggestion(session_factory, story_id: str) -> str:
+    with session_factory() as db:
+        query = db.query(LoreSuggestionModel.id).filter(
+            LoreSuggestionModel.story_id == story_id, LoreSuggestionModel.status == "pending"
+        )
+        return query.first()[0]
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "headers": headers})
+
+
+def test_story_endpoints_use_a_fixed_number_of_queries(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'queries.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    counter = QueryCounter(engine)
+    turns = TurnStoryRepository(session_factory=session_factory)
+    windowed = TurnStoryRepository(session_factory=session_factory, history_window=4)
+
+    def counts(story_id: str) -> dict[str, int]:
+        suggestion_id = _pending_suggestion(session_factory, story_id)
+        response = Response()
+        with session_factory() as db:
+            detail = counter.measure(
+                lambda: get_story(story_id, _request(), response, messages_limit=None, db=db)
+            )
+        etag = response.headers["etag"]
+        with session_factory() as db:
+            not_modified = counter.measure(
+                lambda: get_story(story_id, _request(etag), Response(), messages_limit=None, db=db)
+            )
+        with session_factory() as db:
+            update = counter.measure(
+                lambda: update_story(
+                    story_id,
+                    StoryUpdate(title="Renamed"),
+                    Response(),
+                    messages_limit=None,
+                    db=db,
+                    indexer=None,
+                )
+            )
+        with session_factory() as db:
+            accept = counter.measure(
+                lambda: accept_lore_suggestion(story_id, suggestion_id, db=db, indexer=None)
+            )
+        return {
+            "detail": detail,
+            "not_modified": not_modified,
+            "update": update,
+            "accept": accept,
+            "turn": counter.measure(lambda: turns.load_snapshot(story_id)),
+            "turn_windowed": counter.measure(lambda: windowed.load_snapshot(story_id)),
+        }
+
+    small = counts(_seed(session_factory, 2))
+    large = counts(_seed(session_factory, 12))
+
+    assert small == large
+    assert small == {
+        "detail": 5,
+        "not_modified": 1,
+        "update": 6,
+        "accept": 6,
+        "turn": 3,
+        "turn_windowed": 4,
+    }
+
+
+def test_story_update_returns_the_requested_message_window(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'update.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    story_id = _seed(session_factory, 12)
+    response = Response()
+
+    with session_factory() as db:
+        out = update_story(
+            story_id, StoryUpdate(title="Renamed"), response, messages_limit=2, db=db, indexer=None
+        )
+
+    assert out.title == "Renamed"
+    assert [message.text for message in out.messages] == ["m10", "m11"]
+    assert out.messages_before_position == 10
+    assert response.headers["etag"].endswith('-2"')
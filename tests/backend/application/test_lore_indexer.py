@@ -0,0 +1,138 @@
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.backend.application.lore_indexer import (
+    DELETE,
+    LoreIndexer,
+    LoreIndexerSettings,
+    enqueue_lore_index,
+)
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import LoreEntryModel, LoreIndexOutboxModel, StoryModel
+
+
+class StubLogger:
+    def debug(self, *args, **kwargs) -> None:
+        pass
+
+    def exception(self, *args, **kwargs) -> None:
+        pass
+
+
+class FakeEmbeddings:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.fail = False
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.fail:
+            raise RuntimeError("ollama unavailable")
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class FakeStore:
+    def __init__(self, story_id: str, log: list) -> None:
+        self._story_id = story_id
+        self._log = log
+
+    def upsert_vectors(self, items: list[tuple[str, dict, list[float]]]) -> list[str]:
+        ids = [metadata["lore_id"] for _, metadata, _ in items]
+        if ids:
+            self._log.append(("upsert", self._story_id, ids))
+        return ids
+
+    def delete_points(self, point_ids: list[str]) -> None:
+        if point_ids:
+            self._log.append(("delete", self._story_id, list(point_ids)))
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = datetime.now(UTC).replace(tzinfo=None) + timedelta(minutes=1)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _indexer(session_factory, embeddings, log, clock) -> LoreIndexer:
+    return LoreIndexer(
+        LoreIndexerSettings(batch_size=10, vector_size=2, base_backoff_seconds=2, max_attempts=2),
+        StubLogger(),
+        session_factory=session_factory,
+        embeddings_factory=lambda: embeddings,
+        store_factory=lambda _, story_id: FakeStore(story_id, log),
+        clock=clock,
+    )
+
+
+def _seed(session_factory) -> None:
+    with session_factory() as db:
+        story = StoryModel(
+            id="story-1", title="Test", ai_instruction_key="neutral", ai_instructions="Stay."
+        )
+        story.lore_entries.append(LoreEntryModel(id="lore-a", title="Ada", tag="Character"))
+        story.lore_entries.append(LoreEntryModel(id="lore-b", title="Bree", tag="Character"))
+        db.add(story)
+        enqueue_lore_index(db, "story-1", "lore-a")
+        enqueue_lore_index(db, "story-1", "lore-b")
+        enqueue_lore_index(db, "story-1", "lore-a")
+        enqueue_lore_index(db, "story-1", "lore-gone", DELETE)
+        db.commit()
+
+
+def test_drain_embeds_pending_entries_in_one_batch_and_clears_outbox() -> None:
+    session_factory = _session_factory()
+    _seed(session_factory)
+    embeddings = FakeEmbeddings()
+    log: list = []
+    clock = Clock()
+    indexer = _indexer(session_factory, embeddings, log, clock)
+
+    assert indexer.backlog().pending == 4
+    assert indexer.drain_once() == 4
+
+    assert embeddings.calls == [["Ada\nCharacter", "Bree\nCharacter"]]
+    assert log == [
+        ("upsert", "story-1", ["lore-a", "lore-b"]),
+        ("delete", "story-1", ["lore-gone"]),
+    ]
+    assert indexer.backlog().pending == 0
+    assert indexer.drain_once() == 0
+
+
+def test_failed_batch_backs_off_then_gives_up_after_max_attempts() -> None:
+    session_factory = _session_factory()
+    _seed(session_factory)
+    embeddings = FakeEmbeddings()
+    embeddings.fail = True
+    log: list = []
+    clock = Clock()
+    indexer = _indexer(session_factory, embeddings, log, clock)
+
+    assert indexer.drain_once() == 4
+    assert indexer.drain_once() == 0
+    with session_factory() as db:
+        rows = db.query(LoreIndexOutboxModel).all()
+        assert {row.attempts for row in rows} == {1}
+        assert {row.last_error for row in rows} == {"ollama unavailable"}
+        assert {row.next_attempt_at for row in rows} == {clock.now + timedelta(seconds=2)}
+
+    clock.now += timedelta(seconds=2)
+    assert indexer.drain_once() == 4
+    backlog = indexer.backlog()
+    assert (backlog.pending, backlog.failed) == (0, 4)
+    assert log == []
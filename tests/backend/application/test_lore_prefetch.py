@@ -0,0 +1,109 @@
+import asyncio
+
+from langchain_core.documents import Document
+
+from src.backend.application.lore_prefetch import LorePrefetcher
+from src.backend.application.use_cases.turn_models import StorySnapshot, TurnPayload
+from src.backend.application.use_cases.turns import TurnSettings, TurnUseCase
+
+
+class StubLogger:
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        self.messages.append(msg.split(" ", 1)[0])
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+class FakeStoryRepository:
+    def __init__(self, story: StorySnapshot) -> None:
+        self.story = story
+
+    async def aload_snapshot(self, story_id: str) -> StorySnapshot | None:
+        return self.story
+
+
+class SlowLoreRepository:
+    def __init__(self, results: dict[str, list[Document]], delay: float = 0.0) -> None:
+        self.results = results
+        self.delay = delay
+        self.queries: list[str] = []
+
+    async def aretrieve(self, story_id: str, query: str) -> list[Document]:
+        self.queries.append(query)
+        await asyncio.sleep(self.delay)
+        return self.results.get(query, [])
+
+
+def _lore(lore_id: str, title: str) -> Document:
+    metadata = {"lore_id": lore_id, "title": title, "tag": "Place", "triggers": ""}
+    return Document(page_content=title, metadata=metadata)
+
+
+def _story(lore: list[Document]) -> StorySnapshot:
+    return StorySnapshot(
+        id="story-1",
+        ai_instruction_key="neutral_storyteller",
+        ai_instructions="Stay grounded.",
+        summary_prompt_key="neutral_summarizer",
+        plot_summary="",
+        plot_essentials="",
+        author_note="",
+        lore_entries=lore,
+    )
+
+
+def test_prefetched_lore_is_used_when_retrieval_misses_the_deadline() -> None:
+    lore = [_lore("lore-tower", "Tower"), _lore("lore-moat", "Moat")]
+    logger = StubLogger()
+    prefetcher = LorePrefetcher(logger)
+    use_case = TurnUseCase(
+        TurnSettings(model="m", model_profile_id="p", lore_top_k=3, lore_deadline_seconds=0.01),
+        logger,
+        prefetcher=prefetcher,
+    )
+    reply = "The tower looms over the water."
+    lore_repo = SlowLoreRepository({reply: [lore[0]], "Swim across": [lore[1]]})
+
+    async def scenario() -> tuple[list[str], int]:
+        prefetcher.schedule(lore_repo, "story-1", reply)
+        await asyncio.sleep(0.01)
+        lore_repo.delay = 0.5
+        payload = TurnPayload(text="Swim across", mode="do", story_id="story-1")
+        context = await use_case._prepare_context(
+            payload, FakeStoryRepository(_story(lore)), lore_repo
+        )
+        pending = len(use_case._late_retrievals)
+        await asyncio.sleep(0.6)
+        assert not use_case._late_retrievals
+        return [doc.metadata["lore_id"] for doc in context.lore_entries], pending
+
+    assert asyncio.run(scenario()) == (["lore-tower"], 1)
+    assert lore_repo.queries == [reply, "Swim across"]
+    assert "lore_retrieval_deadline_missed" in logger.messages
+
+
+def test_prefetched_lore_fills_slots_after_fresh_results_and_drops_deleted_entries() -> None:
+    lore = [_lore("lore-tower", "Tower"), _lore("lore-moat", "Moat")]
+    prefetcher = LorePrefetcher(StubLogger())
+    use_case = TurnUseCase(
+        TurnSettings(model="m", model_profile_id="p", lore_top_k=3),
+        StubLogger(),
+        prefetcher=prefetcher,
+    )
+    reply = "The tower, the moat and the old well."
+    gone = _lore("lore-well", "Well")
+    lore_repo = SlowLoreRepository({reply: [lore[0], gone], "Swim across": [lore[1]]})
+
+    async def scenario() -> list[str]:
+        await prefetcher.prefetch(lore_repo, "story-1", reply)
+        payload = TurnPayload(text="Swim across", mode="do", story_id="story-1")
+        context = await use_case._prepare_context(
+            payload, FakeStoryRepository(_story(lore)), lore_repo
+        )
+        return [doc.metadata["lore_id"] for doc in context.lore_entries]
+
+    assert asyncio.run(scenario()) == ["lore-moat", "lore-tower"]
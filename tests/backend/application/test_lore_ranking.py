@@ -0,0 +1,67 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.backend.application.vectorstores.lore_ranking import select_diverse
+from src.backend.application.vectorstores.lore_vectorstore import LoreVectorStore
+from src.backend.infrastructure.lore_vector_cache import LoreVectorCache
+
+
+class FixedEmbeddings:
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0, 0.0]
+
+
+class ScrollClient:
+    def __init__(self, points: list) -> None:
+        self.points = points
+
+    def get_collection(self, name: str):
+        vectors = SimpleNamespace(size=3)
+        return SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(vectors=vectors)))
+
+    def scroll(self, **kwargs):
+        return self.points[: kwargs["limit"]], None
+
+
+def _point(lore_id: str, vector: list[float]):
+    payload = {"content": lore_id, "metadata": {"title": lore_id}}
+    return SimpleNamespace(id=lore_id, vector=vector, payload=payload)
+
+
+def test_select_diverse_skips_near_duplicates_and_weak_hits() -> None:
+    vectors = np.array(
+        [[1.0, 0.0, 0.0], [0.99, 0.01, 0.0], [0.8, 0.6, 0.0], [0.1, 0.0, 1.0]],
+        dtype=np.float32,
+    )
+    scores = [0.95, 0.94, 0.8, 0.1]
+
+    assert select_diverse(scores, vectors, 2, 0.5, 0.25) == [0, 2]
+    assert select_diverse(scores, vectors, 3, 1.0, 0.25) == [0, 1, 2]
+    assert select_diverse(scores, None, 4, 0.5, 0.9) == [0, 1]
+    assert select_diverse(scores, vectors, 2, 0.5, 0.99) == []
+
+
+def test_store_reranks_cached_candidates_with_threshold_and_mmr() -> None:
+    client = ScrollClient(
+        [
+            _point("gate", [1.0, 0.0, 0.0]),
+            _point("gate-copy", [1.0, 0.02, 0.0]),
+            _point("bridge", [0.8, 0.0, 0.6]),
+            _point("moon", [0.0, 1.0, 0.0]),
+        ]
+    )
+    store = LoreVectorStore(
+        FixedEmbeddings(),
+        "story-1",
+        client=client,
+        collection="lore_ranking_test",
+        vector_size=3,
+        vector_cache=LoreVectorCache(max_stories=2, max_points=10, ttl_seconds=60),
+        score_threshold=0.25,
+        mmr_lambda=0.3,
+    )
+
+    docs = store.similarity_search("gate", k=3)
+
+    assert [doc.metadata["title"] for doc in docs] == ["gate", "bridge", "gate-copy"]
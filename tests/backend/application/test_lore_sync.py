@@ -0,0 +1,41 @@
+from src.backend.application.use_cases.lore import sync_lore_index
+from src.backend.infrastructure.embedding_cache import text_hash
+
+
+class FakeLoreStore:
+    def __init__(self, indexed: dict[str, str]) -> None:
+        self.indexed = indexed
+        self.batches: list[list[str]] = []
+        self.deleted: list[str] = []
+
+    def indexed_content_hashes(self) -> dict[str, str]:
+        return dict(self.indexed)
+
+    def add_texts(self, texts: list[str], metadatas: list[dict]) -> list[str]:
+        self.batches.append([meta["lore_id"] for meta in metadatas])
+        return [meta["lore_id"] for meta in metadatas]
+
+    def delete_points(self, point_ids: list[str]) -> None:
+        self.deleted.extend(point_ids)
+
+
+def _entry(lore_id: str, text: str) -> tuple[str, str, dict]:
+    return lore_id, text, {"lore_id": lore_id}
+
+
+def test_sync_lore_index_embeds_only_changed_entries_in_batches_and_drops_orphans() -> None:
+    entries = [_entry(f"lore-{index}", f"text {index}") for index in range(5)]
+    store = FakeLoreStore(
+        {
+            "lore-0": text_hash("text 0"),
+            "lore-1": text_hash("outdated"),
+            "lore-2": text_hash("text 2"),
+            "removed": text_hash("gone"),
+        }
+    )
+
+    result = sync_lore_index(store, entries, batch_size=2)
+
+    assert store.batches == [["lore-1", "lore-3"], ["lore-4"]]
+    assert store.deleted == ["removed"]
+    assert (result.embedded, result.unchanged, result.deleted) == (3, 2, 1)
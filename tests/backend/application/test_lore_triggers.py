@@ -0,0 +1,144 @@
+import asyncio
+
+from langchain_core.documents import Document
+
+from src.backend.application.lore_triggers import LoreTriggerIndex, TriggerMatcher
+from src.backend.application.lore_working_set import LoreWorkingSet
+from src.backend.application.use_cases.turn_models import StorySnapshot, TurnPayload
+from src.backend.application.use_cases.turns import TurnSettings, TurnUseCase
+
+
+class StubLogger:
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+class FakeStoryRepository:
+    def __init__(self, story: StorySnapshot) -> None:
+        self.story = story
+
+    async def aload_snapshot(self, story_id: str) -> StorySnapshot | None:
+        return self.story
+
+
+class CountingLoreRepository:
+    def __init__(self, results: list[Document]) -> None:
+        self.results = results
+        self.queries: list[str] = []
+
+    async def aretrieve(self, story_id: str, query: str) -> list[Document]:
+        self.queries.append(query)
+        return self.results
+
+
+def _lore(lore_id: str, title: str, triggers: str = "", tag: str = "Character") -> Document:
+    metadata = {
+        "lore_id": lore_id,
+        "title": title,
+        "tag": tag,
+        "description": f"About {title}.",
+        "triggers": triggers,
+    }
+    return Document(page_content=title, metadata=metadata)
+
+
+def _story(lore: list[Document], messages: list[dict] | None = None) -> StorySnapshot:
+    return StorySnapshot(
+        id="story-1",
+        ai_instruction_key="neutral_storyteller",
+        ai_instructions="Stay grounded.",
+        summary_prompt_key="neutral_summarizer",
+        plot_summary="",
+        plot_essentials="",
+        author_note="",
+        messages=messages or [],
+        lore_entries=lore,
+    )
+
+
+def _prepare(use_case: TurnUseCase, story: StorySnapshot, lore_repo, text: str):
+    payload = TurnPayload(text=text, mode="do", story_id=story.id)
+    return asyncio.run(use_case._prepare_context(payload, FakeStoryRepository(story), lore_repo))
+
+
+def test_trigger_matcher_finds_whole_words_case_insensitively_in_one_pass() -> None:
+    matcher = TriggerMatcher(
+        {"ada": ["Ada"], "adamant": ["adamant", "blue ore"], "inn": ["Gilded Inn", "inn"]}
+    )
+
+    hits = matcher.find("Adam asks ADA about the gilded inn and its Blue Ore.")
+
+    assert hits == {"ada": 10, "inn": 24, "adamant": 43}
+    assert matcher.find("Adamantine and inner halls") == {}
+
+
+def test_trigger_hits_lead_the_lore_and_fill_the_rest_from_vector_search() -> None:
+    lore = [
+        _lore("lore-ada", "Ada", "the smith"),
+        _lore("lore-gate", "North Gate"),
+        _lore("lore-me", "Rook", tag="Player"),
+    ]
+    vector_hit = _lore("lore-river", "River")
+    lore_repo = CountingLoreRepository([lore[0], vector_hit])
+    use_case = TurnUseCase(
+        TurnSettings(model="m", model_profile_id="p", lore_top_k=3),
+        StubLogger(),
+        trigger_index=LoreTriggerIndex(),
+    )
+    story = _story(lore, [{"role": "assistant", "text": "Rook reaches the north gate."}])
+
+    context = _prepare(use_case, story, lore_repo, "Ask the smith for a blade")
+
+    assert [doc.metadata["lore_id"] for doc in context.lore_entries] == [
+        "lore-ada",
+        "lore-gate",
+        "lore-river",
+    ]
+    assert lore_repo.queries == ["Ask the smith for a blade"]
+
+
+def test_turn_skips_vector_search_when_triggers_fill_top_k() -> None:
+    lore = [_lore("lore-ada", "Ada"), _lore("lore-gate", "North Gate")]
+    lore_repo = CountingLoreRepository([])
+    use_case = TurnUseCase(
+        TurnSettings(model="m", model_profile_id="p", lore_top_k=2),
+        StubLogger(),
+        trigger_index=LoreTriggerIndex(),
+    )
+
+    context = _prepare(use_case, _story(lore), lore_repo, "Ada waits at the north gate")
+
+    assert [doc.metadata["lore_id"] for doc in context.lore_entries] == ["lore-ada", "lore-gate"]
+    assert lore_repo.queries == []
+
+
+def test_continue_turn_reuses_the_decaying_working_set_without_vector_search() -> None:
+    lore = [
+        _lore("lore-ada", "Ada"),
+        _lore("lore-gate", "North Gate"),
+        _lore("lore-river", "River"),
+    ]
+    lore_repo = CountingLoreRepository([lore[2]])
+    use_case = TurnUseCase(
+        TurnSettings(model="m", model_profile_id="p", lore_top_k=3, trigger_history_messages=0),
+        StubLogger(),
+        trigger_index=LoreTriggerIndex(),
+        working_set=LoreWorkingSet(decay=0.5, min_weight=0.2),
+    )
+    story = _story(lore)
+
+    _prepare(use_case, story, lore_repo, "Ada follows the current")
+    lore_repo.results = [lore[1]]
+    _prepare(use_case, story, lore_repo, "Look around")
+    payload = TurnPayload(text="", mode="continue", story_id=story.id)
+    edited = _story([lore[0], _lore("lore-gate", "North Gate", "portcullis")])
+    context = asyncio.run(
+        use_case._prepare_context(payload, FakeStoryRepository(edited), lore_repo)
+    )
+
+    assert [doc.metadata["lore_id"] for doc in context.lore_entries] == ["lore-gate", "lore-ada"]
+    assert context.lore_entries[0].metadata["triggers"] == "portcullis"
+    assert lore_repo.queries == ["Ada follows the current", "Look around"]
@@ -1,4 +1,8 @@
-from src.backend.application.model_profiles import get_model_profile, infer_model_profile_id
+from src.backend.application.model_profiles import (
+    get_model_profile,
+    infer_model_profile_id,
+    resolve_prompt_token_budget,
+)
 
 
 def test_infer_model_profile_uses_explicit_profile_first() -> None:
@@ -16,3 +20,11 @@ def test_infer_model_profile_maps_hub_style_model_names() -> None:
 
 def test_get_model_profile_falls_back_to_local_profile() -> None:
     assert get_model_profile("does-not-exist").id == "local_small_instruct"
+
+
+def test_resolve_prompt_token_budget_uses_smallest_context_minus_reply_reserve() -> None:
+    assert resolve_prompt_token_budget("llama3.2:3b", "local_small_instruct", 16384, 1024) == 3072
+    assert (
+        resolve_prompt_token_budget("anthropic/claude-sonnet", "balanced_reasoning", None, 1024)
+        == 30976
+    )
@@ -3,7 +3,11 @@ from types import SimpleNamespace
 from langchain_core.documents import Document
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
-from src.backend.application.prompt_builder import build_chat_messages, build_system_prompt
+from src.backend.application.prompt_builder import (
+    STABLE_PREFIX_LAYOUT,
+    build_chat_messages,
+    build_system_prompt,
+)
 from src.backend.infrastructure.models import StoryMessageModel, StoryModel
 
 
@@ -64,6 +68,14 @@ def test_build_system_prompt_includes_model_profile_guidance() -> None:
     assert "Do not copy sentence structure from recent assistant messages." in prompt
 
 
+def test_build_system_prompt_uses_only_the_lore_it_is_given() -> None:
+    story = _budget_story(turns=0)
+    story.lore_entries = [_lore("Bridge", 10)]
+
+    assert "[LORE]" not in build_system_prompt(story)
+    assert "Bridge" in build_system_prompt(story, lore_entries=story.lore_entries)
+
+
 def test_build_chat_messages_keeps_recent_pairs_and_formats_user_turns() -> None:
     story = StoryModel(
         title="Test Story",
@@ -174,3 +186,110 @@ def test_build_chat_messages_without_story_adds_only_current_user_message() -> N
     assert len(messages) == 1
     assert isinstance(messages[0], HumanMessage)
     assert messages[0].content == "MODE: DO\nTEXT: open gate"
+
+
+def _budget_story(turns: int) -> SimpleNamespace:
+    messages = []
+    for index in range(turns):
+        messages.append({"role": "user", "text": f"u{index}", "mode": "story"})
+        messages.append({"role": "assistant", "text": f"a{index} " + "x" * 200})
+    return SimpleNamespace(
+        ai_instructions="Stay grounded.",
+        plot_summary="",
+        plot_essentials="",
+        author_note="",
+        lore_entries=[],
+        messages=messages,
+    )
+
+
+def _lore(title: str, size: int) -> Document:
+    description = f"{title} " + "y" * size
+    return Document(
+        page_content=description,
+        metadata={"title": title, "tag": "Place", "description": description},
+    )
+
+
+def test_build_chat_messages_with_large_budget_keeps_more_than_recent_pairs() -> None:
+    story = _budget_story(turns=10)
+
+    messages = build_chat_messages(
+        story,
+        user_text="now",
+        recent_pairs=1,
+        token_budget=100_000,
+    )
+
+    assert len(messages) == 1 + 20 + 1
+    assert messages[1].content == "MODE: STORY\nTEXT: u0"
+
+
+def test_build_chat_messages_with_small_budget_prefers_recent_turns_then_lore() -> None:
+    story = _budget_story(turns=10)
+    lore = [_lore("Bridge", 40), _lore("Tower", 4000)]
+
+    messages = build_chat_messages(
+        story,
+        user_text="now",
+        lore_entries=lore,
+        recent_pairs=2,
+        token_budget=400,
+    )
+
+    history = [m.content for m in messages[1:-1]]
+    assert history[-1].startswith("a9")
+    assert 4 <= len(history) < 20
+    assert "Bridge" in messages[0].content
+    assert "Tower" not in messages[0].content
+
+
+def test_budget_packing_keeps_whole_turns_and_skips_oversized_lore() -> None:
+    story = _budget_story(turns=10)
+    lore = [_lore("Tower", 4000), _lore("Bridge", 40)]
+
+    for budget in range(300, 700, 7):
+        messages = build_chat_messages(
+            story,
+            user_text="now",
+            lore_entries=lore,
+            recent_pairs=1,
+            token_budget=budget,
+        )
+        history = messages[1:-1]
+        assert isinstance(history[0], HumanMessage), budget
+        assert len(history) % 2 == 0, budget
+        assert "Bridge" in messages[0].content and "Tower" not in messages[0].content
+
+
+def test_stable_prefix_layout_keeps_prefix_identical_and_lore_after_history() -> None:
+    story = _budget_story(4)
+    story.plot_summary = "The party crossed the river."
+    first = build_chat_messages(
+        story,
+        user_text="next",
+        lore_entries=[_lore("Bridge", 20)],
+        recent_pairs=2,
+        prompt_layout=STABLE_PREFIX_LAYOUT,
+    )
+    story.messages += [
+        {"role": "user", "text": "next", "mode": "story"},
+        {"role": "assistant", "text": "a4"},
+    ]
+    story.plot_summary = "The party crossed the river and reached the tower."
+    second = build_chat_messages(
+        story,
+        user_text="again",
+        lore_entries=[_lore("Tower", 20)],
+        recent_pairs=2,
+        prompt_layout=STABLE_PREFIX_LAYOUT,
+    )
+
+    assert "[LORE]" not in first[0].content
+    assert "[PLOT SUMMARY]" not in first[0].content
+    assert isinstance(first[-2], SystemMessage)
+    assert "Bridge" in first[-2].content
+    assert "reached the tower" in second[-2].content
+    assert "Tower" in second[-2].content
+    prefix = first[:-2]
+    assert [m.content for m in second[: len(prefix)]] == [m.content for m in prefix]
@@ -1,9 +1,7 @@
 from src.backend.application.summarizer import (
     resolve_summary_prompt_key,
     summarize_turn,
-    update_story_summary,
 )
-from src.backend.infrastructure.models import StoryModel
 
 
 class StubLogger:
@@ -146,54 +144,6 @@ def test_summarize_turn_returns_previous_summary_on_invoke_error() -> None:
     assert result == previous
 
 
-def test_update_story_summary_persists_trimmed_summary_on_story() -> None:
-    model = FakeChatModel("Updated summary text that is longer than allowed.")
-    story = StoryModel(
-        title="Test Story",
-        ai_instruction_key="neutral_storyteller",
-        ai_instructions="Stay grounded.",
-        summary_prompt_key="neutral_summarizer",
-    )
-    story.plot_summary = ""
-
-    updated = update_story_summary(
-        client=model,
-        model="other-model",
-        story=story,
-        user_input="Advance",
-        assistant_text="New events occur",
-        max_chars=20,
-        logger=StubLogger(),
-    )
-
-    assert updated == "Updated summary text"
-    assert story.plot_summary == "Updated summary text"
-
-
-def test_update_story_summary_uses_storyteller_to_summarizer_mapping_when_key_missing() -> None:
-    model = FakeChatModel("Updated summary text")
-    story = StoryModel(
-        title="Test Story",
-        ai_instruction_key="dark_storyteller",
-        ai_instructions="Stay grounded.",
-        summary_prompt_key="",
-    )
-    story.plot_summary = "Previous summary"
-
-    update_story_summary(
-        client=model,
-        model="base-model",
-        story=story,
-        user_input="Advance",
-        assistant_text="New events occur",
-        max_chars=240,
-        logger=StubLogger(),
-    )
-
-    prompt = model.invocations[0]
-    assert "campaign notes" in prompt
-
-
 def test_dark_summary_prompt_requests_plain_factual_chronicle() -> None:
     model = FakeChatModel("Updated summary text")
 
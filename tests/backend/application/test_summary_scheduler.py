@@ -0,0 +1,131 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.application.summary_scheduler import SummaryScheduler, SummarySettings
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import StoryMessageModel, StoryModel, StorySummaryModel
+
+
+class StubLogger:
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+class FakeResponse:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+class FakeChatModel:
+    def __init__(self, response_text: str) -> None:
+        self.response_text = response_text
+        self.invocations: list[str] = []
+
+    def bind(self, **kwargs):
+        return self
+
+    def stream(self, input):
+        return iter(())
+
+    def invoke(self, input):
+        self.invocations.append(str(input))
+        return FakeResponse(self.response_text)
+
+
+def _session_factory():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def _seed_story(
+    session_factory,
+    texts: list[tuple[str, str]],
+    last_position: int,
+    ai_instruction_key: str = "neutral_storyteller",
+    summary_prompt_key: str = "neutral_summarizer",
+) -> str:
+    with session_factory() as db:
+        story = StoryModel(
+            title="Test Story",
+            ai_instruction_key=ai_instruction_key,
+            ai_instructions="Stay grounded.",
+            summary_prompt_key=summary_prompt_key,
+        )
+        story.summary_record = StorySummaryModel(summary="", last_position=last_position)
+        story.messages = [
+            StoryMessageModel(role=role, text=text, position=position)
+            for position, (role, text) in enumerate(texts)
+        ]
+        db.add(story)
+        db.commit()
+        return story.id
+
+
+def _scheduler(session_factory, model: FakeChatModel, max_chars: int = 240) -> SummaryScheduler:
+    return SummaryScheduler(
+        SummarySettings(model="summary-model", max_chars=max_chars, debounce_seconds=0),
+        StubLogger(),
+        session_factory=session_factory,
+        chat_model_factory=lambda: model,
+    )
+
+
+def test_catch_up_folds_all_unsummarized_turns_into_one_request() -> None:
+    session_factory = _session_factory()
+    story_id = _seed_story(
+        session_factory,
+        [("user", "u1"), ("assistant", "a1"), ("user", "u2"), ("assistant", "a2")],
+        last_position=1,
+    )
+    model = FakeChatModel("The party advanced.")
+
+    assert _scheduler(session_factory, model).catch_up(story_id) is True
+
+    assert len(model.invocations) == 1
+    assert "User: u2\nAssistant: a2" in model.invocations[0]
+    assert "u1" not in model.invocations[0]
+    with session_factory() as db:
+        record = db.get(StorySummaryModel, story_id)
+        assert record.summary == "The party advanced."
+        assert record.last_position == 3
+
+
+def test_catch_up_skips_llm_when_summary_is_current() -> None:
+    session_factory = _session_factory()
+    story_id = _seed_story(session_factory, [("user", "u1"), ("assistant", "a1")], last_position=1)
+    model = FakeChatModel("unused")
+
+    assert _scheduler(session_factory, model).catch_up(story_id) is False
+    assert model.invocations == []
+
+
+def test_catch_up_stores_the_trimmed_summary() -> None:
+    session_factory = _session_factory()
+    story_id = _seed_story(session_factory, [("user", "u1"), ("assistant", "a1")], last_position=-1)
+    model = FakeChatModel("Updated summary text that is longer than allowed.")
+
+    assert _scheduler(session_factory, model, max_chars=20).catch_up(story_id) is True
+
+    with session_factory() as db:
+        assert db.get(StorySummaryModel, story_id).summary == "Updated summary text"
+
+
+def test_catch_up_maps_the_storyteller_to_its_summarizer_when_key_missing() -> None:
+    session_factory = _session_factory()
+    story_id = _seed_story(
+        session_factory,
+        [("user", "u1"), ("assistant", "a1")],
+        last_position=-1,
+        ai_instruction_key="dark_storyteller",
+        summary_prompt_key="",
+    )
+    model = FakeChatModel("Updated summary text")
+
+    _scheduler(session_factory, model).catch_up(story_id)
+
+    assert "campaign notes" in model.invocations[0]
+    assert "User (player): u1\nNarrator: a1" in model.invocations[0]
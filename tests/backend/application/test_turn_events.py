@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+from src.backend.api.stream_framing import frame_event, stop_on_disconnect
+from src.backend.application.turn_events import TurnEvent, coalesce_deltas, delta_event
+
+
+class StubLogger:
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+async def _events(items: list[TurnEvent], pause_after: int | None = None):
+    for index, item in enumerate(items):
+        if index == pause_after:
+            await asyncio.sleep(0.05)
+        yield item
+
+
+async def _collect(stream) -> list[TurnEvent]:
+    return [event async for event in stream]
+
+
+def test_coalesce_deltas_merges_tokens_until_size_limit_and_flushes_before_done() -> None:
+    items = [delta_event(token) for token in ["ab", "cd", "ef", "g"]] + [TurnEvent("done")]
+
+    events = asyncio.run(_collect(coalesce_deltas(_events(items), max_chars=4, max_seconds=10)))
+
+    assert [(event.type, event.data.get("text")) for event in events] == [
+        ("delta", "abcd"),
+        ("delta", "efg"),
+        ("done", None),
+    ]
+
+
+def test_coalesce_deltas_flushes_when_the_next_token_is_late() -> None:
+    items = [delta_event("slow"), delta_event(" token")]
+
+    events = asyncio.run(
+        _collect(coalesce_deltas(_events(items, pause_after=1), max_chars=100, max_seconds=0.01))
+    )
+
+    assert [event.data["text"] for event in events] == ["slow", " token"]
+
+
+def test_frame_event_formats_ndjson_sse_and_legacy_text() -> None:
+    error = TurnEvent("error", {"message": "boom"})
+
+    assert json.loads(frame_event(delta_event("hi"), "ndjson")) == {"type": "delta", "text": "hi"}
+    assert frame_event(error, "sse") == 'event: error\ndata: {"message": "boom"}\n\n'
+    assert frame_event(error, "text") == "\n[Ollama error: boom]"
+    assert frame_event(TurnEvent("done", {"positions": [3]}), "text") == ""
+
+
+def test_stop_on_disconnect_closes_a_stalled_stream() -> None:
+    closed: list[bool] = []
+
+    async def stalled():
+        try:
+            yield delta_event("first")
+            await asyncio.sleep(10)
+            yield delta_event("never")
+        finally:
+            closed.append(True)
+
+    async def is_disconnected() -> bool:
+        return True
+
+    events = asyncio.run(
+        _collect(stop_on_disconnect(stalled(), is_disconnected, StubLogger(), poll_seconds=0.01))
+    )
+
+    assert events == [delta_event("first")]
+    assert closed == [True]
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.application.turn_events import TurnEvent, delta_event
+from src.backend.application.turn_scheduler import (
+    TurnQueueFullError,
+    TurnScheduler,
+    TurnSchedulerSettings,
+)
+from src.backend.application.use_cases.stories import TurnStoryRepository
+from src.backend.application.use_cases.turn_models import TurnPayload
+from src.backend.application.use_cases.turns import TurnSettings, TurnUseCase
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import StoryModel, StorySummaryModel
+
+
+class StubLogger:
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+def _scheduler(max_queue: int = 8) -> TurnScheduler:
+    settings = TurnSchedulerSettings(max_concurrency=1, max_queue=max_queue, update_seconds=0.01)
+    return TurnScheduler(settings, StubLogger())
+
+
+def test_turn_scheduler_rotates_between_stories_and_rejects_when_full() -> None:
+    async def scenario() -> None:
+        scheduler = _scheduler(max_queue=3)
+        running = scheduler.admit("ollama", "a")
+        a2 = scheduler.admit("ollama", "a")
+        a3 = scheduler.admit("ollama", "a")
+        b1 = scheduler.admit("ollama", "b")
+
+        assert running.granted.done()
+        assert [scheduler.position(t) for t in (a2, b1, a3)] == [1, 2, 3]
+        with pytest.raises(TurnQueueFullError):
+            scheduler.admit("ollama", "c")
+        assert scheduler.admit("other-backend", "c").granted.done()
+
+        scheduler.release(running)
+        assert a2.granted.done()
+        scheduler.release(a2)
+        assert b1.granted.done()
+        assert not a3.granted.done()
+
+    asyncio.run(scenario())
+
+
+def test_turn_scheduler_run_reports_queue_position_until_granted() -> None:
+    async def events():
+        yield delta_event("hello")
+
+    async def scenario() -> list[TurnEvent]:
+        scheduler = _scheduler()
+        running = scheduler.admit("ollama", "a")
+        waiting = scheduler.admit("ollama", "b")
+        asyncio.get_running_loop().call_later(0.05, scheduler.release, running)
+        collected = [event async for event in scheduler.run(waiting, events())]
+        assert scheduler.admit("ollama", "c").granted.done()
+        return collected
+
+    collected = asyncio.run(scenario())
+
+    assert collected[0].type == "queued"
+    assert collected[0].data["position"] == 1
+    assert collected[-1] == delta_event("hello")
+
+
+def test_turn_scheduler_frees_a_slot_once_even_if_run_never_starts() -> None:
+    async def events():
+        yield delta_event("hello")
+
+    async def scenario() -> None:
+        scheduler = _scheduler()
+        abandoned = scheduler.admit("ollama", "a")
+        waiting = scheduler.admit("ollama", "b")
+        unstarted = scheduler.run(abandoned, events())
+
+        scheduler.release(abandoned)
+        scheduler.release(abandoned)
+        await unstarted.aclose()
+        blocked = scheduler.admit("ollama", "c")
+
+        assert waiting.granted.done()
+        assert not blocked.granted.done()
+
+    asyncio.run(scenario())
+
+
+class RecordingModel:
+    def __init__(self) -> None:
+        self.prompts: list[list[str]] = []
+
+    def bind(self, **kwargs):
+        return self
+
+    async def astream(self, input):
+        self.prompts.append([message.content for message in input])
+        yield AIMessage(content=f"reply {len(self.prompts)}")
+
+
+class EmptyLoreRepository:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    async def aretrieve(self, story_id: str, query: str) -> list:
+        self.queries.append(query)
+        return []
+
+
+def test_queued_turns_on_one_story_see_the_previous_turn(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'turns.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        story = StoryModel(
+            title="Test", ai_instruction_key="neutral_storyteller", ai_instructions="Stay grounded."
+        )
+        story.summary_record = StorySummaryModel(summary="", last_position=-1)
+        db.add(story)
+        db.commit()
+        story_id = story.id
+
+    model = RecordingModel()
+    lore_repo = EmptyLoreRepository()
+    story_repo = TurnStoryRepository(session_factory=session_factory)
+    use_case = TurnUseCase(TurnSettings(model="m", model_profile_id="p"), StubLogger())
+
+    async def turn(scheduler: TurnScheduler, text: str) -> list[TurnEvent]:
+        ticket = scheduler.admit("ollama", story_id)
+        payload = TurnPayload(text=text, mode="do", story_id=story_id)
+        stream = use_case.run_stream(payload, story_repo, lore_repo, model)
+        return [event async for event in scheduler.run(ticket, stream)]
+
+    async def scenario() -> None:
+        scheduler = _scheduler()
+        await asyncio.gather(*(turn(scheduler, text) for text in ("FIRST", "SECOND", "THIRD")))
+
+    asyncio.run(scenario())
+
+    assert lore_repo.queries == ["FIRST", "SECOND", "THIRD"]
+    history = [[text for text in prompt[1:-1] if "reply" in text] for prompt in model.prompts]
+    assert history == [[], ["reply 1"], ["reply 1", "reply 2"]]
@@ -0,0 +1,155 @@
+import asyncio
+
+from langchain_core.messages import AIMessage
+
+from src.backend.application.turn_events import TurnEvent
+from src.backend.application.turn_service import _usage_stats, stream_turn
+from src.backend.application.use_cases.turn_models import StorySnapshot, TurnContext
+
+
+class StubLogger:
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+class FakeStreamingModel:
+    def __init__(self, tokens: list[str], fail_after: int | None = None) -> None:
+        self.tokens = tokens
+        self.fail_after = fail_after
+        self.bound_options: dict = {}
+        self.closed = False
+
+    def bind(self, **kwargs):
+        self.bound_options = kwargs
+        return self
+
+    async def astream(self, input):
+        try:
+            for index, token in enumerate(self.tokens):
+                if self.fail_after is not None and index >= self.fail_after:
+                    raise RuntimeError("model went away")
+                yield AIMessage(content=token)
+        finally:
+            self.closed = True
+
+
+def _context(text: str = "Open the gate", mode: str = "do") -> TurnContext:
+    story = StorySnapshot(
+        id="story-1",
+        ai_instruction_key="neutral_storyteller",
+        ai_instructions="Stay grounded.",
+        summary_prompt_key="neutral_summarizer",
+        plot_summary="",
+        plot_essentials="",
+        author_note="",
+    )
+    return TurnContext(text=text, mode=mode, story=story, lore_entries=[], persist_user=True)
+
+
+async def _collect(stream) -> list[TurnEvent]:
+    return [event async for event in stream]
+
+
+def _text(events: list[TurnEvent]) -> str:
+    return "".join(event.data["text"] for event in events if event.type == "delta")
+
+
+def test_stream_turn_appends_turn_and_schedules_summary() -> None:
+    appended: list[list[dict]] = []
+    scheduled: list[str] = []
+    prefetched: list[tuple[str, str]] = []
+
+    async def append_messages(messages: list[dict]) -> list[int]:
+        appended.append(messages)
+        return [0, 1]
+
+    events = asyncio.run(
+        _collect(
+            stream_turn(
+                _context(),
+                FakeStreamingModel(["The gate ", "creaks open."]),
+                "story-model",
+                StubLogger(),
+                append_messages=append_messages,
+                schedule_summary=scheduled.append,
+                prefetch_lore=lambda story_id, reply: prefetched.append((story_id, reply)),
+            )
+        )
+    )
+
+    assert _text(events) == "The gate creaks open."
+    assert events[-1].type == "done"
+    assert events[-1].data["positions"] == [0, 1]
+    assert appended == [
+        [
+            {"role": "user", "text": "Open the gate", "mode": "do"},
+            {"role": "assistant", "text": "The gate creaks open."},
+        ]
+    ]
+    assert scheduled == ["story-1"]
+    assert prefetched == [("story-1", "The gate creaks open.")]
+
+
+def test_stream_turn_persists_only_user_message_when_generation_fails() -> None:
+    appended: list[list[dict]] = []
+    scheduled: list[str] = []
+
+    async def append_messages(messages: list[dict]) -> list[int]:
+        appended.append(messages)
+        return [0]
+
+    events = asyncio.run(
+        _collect(
+            stream_turn(
+                _context(),
+                FakeStreamingModel(["partial", "never"], fail_after=1),
+                "story-model",
+                StubLogger(),
+                append_messages=append_messages,
+                schedule_summary=scheduled.append,
+            )
+        )
+    )
+
+    assert _text(events) == "partial"
+    assert [event.type for event in events[-2:]] == ["error", "done"]
+    assert events[-2].data["message"] == "model went away"
+    assert events[-1].data["positions"] == [0]
+    assert appended == [[{"role": "user", "text": "Open the gate", "mode": "do"}]]
+    assert scheduled == []
+
+
+def test_stream_turn_closes_upstream_and_skips_persistence_when_abandoned() -> None:
+    appended: list[list[dict]] = []
+    model = FakeStreamingModel(["one ", "two ", "three"])
+
+    async def append_messages(messages: list[dict]) -> list[int]:
+        appended.append(messages)
+        return [0, 1]
+
+    async def scenario() -> None:
+        stream = stream_turn(
+            _context(),
+            model,
+            "story-model",
+            StubLogger(),
+            append_messages=append_messages,
+        )
+        await anext(stream)
+        await stream.aclose()
+
+    asyncio.run(scenario())
+
+    assert model.closed
+    assert appended == []
+
+
+def test_usage_stats_reads_ollama_and_openai_metadata() -> None:
+    ollama = {"prompt_eval_count": 812, "prompt_eval_duration": 2_500_000_000}
+    assert _usage_stats(ollama) == {"prompt_tokens": 812, "prompt_eval_ms": 2500}
+    assert _usage_stats(
+        {"usage": {"prompt_tokens": 900, "prompt_tokens_details": {"cached_tokens": 768}}}
+    ) == {"prompt_tokens": 900, "cached_tokens": 768}
@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+from src.backend.application.turn_events import TurnEvent, delta_event
+from src.backend.application.turn_streams import (
+    TurnStreamOffsetError,
+    TurnStreamRegistry,
+    TurnStreamSettings,
+)
+
+
+class StubLogger:
+    def debug(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+    def exception(self, msg: str, *args, **kwargs) -> None:
+        return None
+
+
+async def _tokens(tokens: list[str], delay: float = 0.0):
+    for token in tokens:
+        await asyncio.sleep(delay)
+        yield delta_event(token)
+    yield TurnEvent("done", {"positions": [4, 5]})
+
+
+def test_turn_stream_registry_resumes_from_offset_after_turn_finished() -> None:
+    async def scenario() -> list[TurnEvent]:
+        registry = TurnStreamRegistry(TurnStreamSettings(), StubLogger())
+        turn = registry.start(_tokens(["The ", "gate ", "opens."]))
+        await turn.task
+        with pytest.raises(TurnStreamOffsetError):
+            registry.open(turn.id, offset=99)
+        return [event async for event in registry.open(turn.id, offset=4)]
+
+    events = asyncio.run(scenario())
+
+    assert [event.type for event in events] == ["turn", "delta", "done"]
+    assert events[1].data["text"] == "gate opens."
+    assert events[2].data["positions"] == [4, 5]
+
+
+def test_turn_stream_registry_cancels_generation_only_after_detach_grace() -> None:
+    async def scenario() -> tuple[str, str]:
+        settings = TurnStreamSettings(detach_grace_seconds=0.05)
+        registry = TurnStreamRegistry(settings, StubLogger())
+
+        kept = registry.start(_tokens(["a", "b", "c"], delay=0.03))
+        reader = registry.open(kept.id)
+        await anext(reader)
+        await reader.aclose()
+        resumed = [event async for event in registry.open(kept.id)]
+
+        dropped = registry.start(_tokens(["a", "b", "c", "d", "e"], delay=0.03))
+        reader = registry.open(dropped.id)
+        await anext(reader)
+        await reader.aclose()
+        await dropped.task
+        return resumed[-1].type, dropped.final[-1].type
+
+    assert asyncio.run(scenario()) == ("done", "error")
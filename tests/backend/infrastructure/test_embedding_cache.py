@@ -0,0 +1,79 @@
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.embedding_cache import CachedEmbeddings, EmbeddingLRU
+
+
+class CountingEmbeddings:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def embed_query(self, text: str) -> list[float]:
+        self.calls.append([text])
+        return [float(len(text)), 0.5]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+
+def _session_factory():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)
+
+
+def test_cached_embeddings_reuse_memory_then_database_tier() -> None:
+    session_factory = _session_factory()
+    inner = CountingEmbeddings()
+    first = CachedEmbeddings(inner, "embed-model", EmbeddingLRU(16), session_factory)
+
+    assert first.embed_query("Open the gate") == [13.0, 0.5]
+    assert asyncio.run(first.aembed_query("Open the gate")) == [13.0, 0.5]
+    assert first.embed_documents(["Bridge", "Open the gate"]) == [[6.0, 0.5], [13.0, 0.5]]
+
+    restarted = CachedEmbeddings(inner, "embed-model", EmbeddingLRU(16), session_factory)
+    assert restarted.embed_documents(["Bridge", "Tower"]) == [[6.0, 0.5], [5.0, 0.5]]
+    assert restarted.embed_query("Open the gate") == [13.0, 0.5]
+
+    other_model = CachedEmbeddings(inner, "other-model", EmbeddingLRU(16), session_factory)
+    other_model.embed_query("Bridge")
+
+    assert inner.calls == [
+        ["Open the gate"],
+        ["Bridge", "Open the gate"],
+        ["Tower"],
+        ["Bridge"],
+    ]
+
+
+def test_cached_embeddings_key_by_kind_and_instruction_prefix() -> None:
+    session_factory = _session_factory()
+    inner = CountingEmbeddings()
+    prefixed = CachedEmbeddings(
+        inner,
+        "embed-model",
+        EmbeddingLRU(16),
+        session_factory,
+        query_instruction="query: ",
+        document_instruction="passage: ",
+    )
+    plain = CachedEmbeddings(inner, "embed-model", EmbeddingLRU(16), session_factory)
+
+    prefixed.embed_query("Gate")
+    prefixed.embed_documents(["Gate"])
+    prefixed.embed_query("Gate")
+    plain.embed_documents(["Gate"])
+
+    assert inner.calls == [["Gate"], ["Gate"], ["Gate"]]
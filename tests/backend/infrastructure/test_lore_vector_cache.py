@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from src.backend.application.vectorstores.lore_vectorstore import LoreVectorStore
+from src.backend.infrastructure.lore_vector_cache import LoreVectorCache
+
+
+class FixedEmbeddings:
+    def embed_query(self, text: str) -> list[float]:
+        return [1.0, 0.0]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[1.0, 0.0] for _ in texts]
+
+
+class CountingClient:
+    def __init__(self, points: list) -> None:
+        self.points = points
+        self.calls: list[str] = []
+
+    def get_collection(self, name: str):
+        vectors = SimpleNamespace(size=2)
+        return SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(vectors=vectors)))
+
+    def scroll(self, **kwargs):
+        self.calls.append("scroll")
+        return self.points[: kwargs["limit"]], None
+
+    def query_points(self, collection_name, query, query_filter=None, limit=10, with_payload=True):
+        self.calls.append("query_points")
+        payload = {"content": "remote", "metadata": {"title": "Remote"}}
+        hit = SimpleNamespace(payload=payload, score=0.5)
+        return SimpleNamespace(points=[hit])
+
+    def upsert(self, **kwargs) -> None:
+        self.calls.append("upsert")
+
+
+def _point(lore_id: str, vector: list[float]):
+    payload = {"content": lore_id, "metadata": {"title": lore_id}}
+    return SimpleNamespace(id=lore_id, vector=vector, payload=payload)
+
+
+def _store(client: CountingClient, cache: LoreVectorCache) -> LoreVectorStore:
+    return LoreVectorStore(
+        FixedEmbeddings(),
+        "story-1",
+        client=client,
+        collection="lore_cache_test",
+        vector_size=2,
+        vector_cache=cache,
+    )
+
+
+def test_cached_story_vectors_answer_searches_locally_until_a_write() -> None:
+    client = CountingClient(
+        [_point("side", [0.0, 3.0]), _point("close", [2.0, 0.2]), _point("exact", [5.0, 0.0])]
+    )
+    cache = LoreVectorCache(max_stories=4, max_points=10, ttl_seconds=60)
+    store = _store(client, cache)
+
+    first = store.similarity_search_with_score("bridge", k=2)
+    second = store.similarity_search("bridge", k=2)
+
+    assert [doc.metadata["title"] for doc, _ in first] == ["exact", "close"]
+    assert first[0][1] == 1.0
+    assert [doc.metadata["title"] for doc in second] == ["exact", "close"]
+    assert client.calls == ["scroll"]
+
+    store.add_texts(["new"], metadatas=[{"lore_id": "new"}])
+    store.similarity_search("bridge", k=1)
+
+    assert client.calls == ["scroll", "upsert", "scroll"]
+
+
+def test_stories_above_the_point_limit_fall_back_to_qdrant() -> None:
+    client = CountingClient([_point(f"lore-{index}", [1.0, float(index)]) for index in range(3)])
+    cache = LoreVectorCache(max_stories=4, max_points=2, ttl_seconds=60)
+    store = _store(client, cache)
+
+    store.similarity_search("bridge", k=2)
+    docs = store.similarity_search("bridge", k=2)
+
+    assert [doc.metadata["title"] for doc in docs] == ["Remote"]
+    assert client.calls == ["scroll", "query_points", "query_points"]
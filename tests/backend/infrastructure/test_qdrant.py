@@ -0,0 +1,132 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.backend.application.vectorstores.lore_vectorstore import LoreVectorStore
+from src.backend.infrastructure.qdrant import (
+    QDRANT_URL,
+    forget_collection,
+    get_async_qdrant_client,
+    get_qdrant_client,
+)
+
+
+class FakeEmbeddings:
+    async def aembed_query(self, text: str) -> list[float]:
+        return [0.1, 0.2, 0.3]
+
+
+class CountingAsyncClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def get_collection(self, name: str):
+        self.calls.append("get_collection")
+        vectors = SimpleNamespace(size=3)
+        return SimpleNamespace(config=SimpleNamespace(params=SimpleNamespace(vectors=vectors)))
+
+    async def query_points(self, **kwargs):
+        self.calls.append("query_points")
+        payload = {"content": "A bridge.", "metadata": {"title": "Bridge"}}
+        hit = SimpleNamespace(payload=payload, score=0.9)
+        return SimpleNamespace(points=[hit])
+
+
+def test_lore_vectorstore_verifies_collection_once_per_process() -> None:
+    forget_collection(QDRANT_URL, "lore_test")
+    client = CountingAsyncClient()
+
+    async def scenario() -> None:
+        for story_id in ("story-1", "story-2"):
+            store = LoreVectorStore(
+                FakeEmbeddings(),
+                story_id,
+                collection="lore_test",
+                vector_size=3,
+                async_client=client,
+                vector_cache=None,
+            )
+            docs = await store.asimilarity_search("bridge", k=2)
+            assert docs[0].metadata["title"] == "Bridge"
+
+    asyncio.run(scenario())
+
+    assert client.calls == ["get_collection", "query_points", "query_points"]
+
+
+def test_qdrant_clients_are_shared() -> None:
+    assert get_qdrant_client("http://qdrant.test:6333") is get_qdrant_client("http://qdrant.test:6333")
+
+    async def scenario() -> bool:
+        return get_async_qdrant_client("http://qdrant.test:6333") is get_async_qdrant_client(
+            "http://qdrant.test:6333"
+        )
+
+    assert asyncio.run(scenario())
+
+
+class BootstrapClient:
+    def __init__(self, existing: dict[str, dict] | None = None) -> None:
+        self.existing = existing or {}
+        self.calls: list[tuple] = []
+
+    def get_collection(self, name: str):
+        if name not in self.existing:
+            raise RuntimeError("not found")
+        vectors = SimpleNamespace(size=3)
+        config = SimpleNamespace(params=SimpleNamespace(vectors=vectors))
+        return SimpleNamespace(config=config, payload_schema=self.existing[name])
+
+    def create_collection(self, collection_name: str, vectors_config, hnsw_config=None) -> None:
+        self.calls.append(("create_collection", collection_name, hnsw_config))
+
+    def create_payload_index(self, collection_name: str, field_name: str, field_schema) -> None:
+        self.calls.append(("create_payload_index", collection_name, field_name, field_schema))
+
+    def delete(self, collection_name: str, points_selector) -> None:
+        self.calls.append(("delete", collection_name))
+
+
+def _bootstrap(client: BootstrapClient, collection: str, layout: str) -> None:
+    forget_collection(QDRANT_URL, collection)
+    forget_collection(QDRANT_URL, f"{collection}_story-1")
+    store = LoreVectorStore(
+        FakeEmbeddings(),
+        "story-1",
+        client=client,
+        collection=collection,
+        vector_size=3,
+        vector_cache=None,
+        layout=layout,
+    )
+    store.delete_points(["lore-1"])
+
+
+def test_shared_collection_gets_tenant_index_and_per_story_graphs() -> None:
+    client = BootstrapClient()
+
+    _bootstrap(client, "lore_tenant_test", "shared")
+
+    (_, name, hnsw), (_, index_name, field, schema), _ = client.calls
+    assert name == index_name == "lore_tenant_test"
+    assert (hnsw.m, hnsw.payload_m) == (0, 16)
+    assert field == "story_id"
+    assert schema.is_tenant is True
+
+    upgraded = BootstrapClient({"lore_old": {}})
+    _bootstrap(upgraded, "lore_old", "shared")
+    assert [call[0] for call in upgraded.calls] == ["create_payload_index", "delete"]
+
+    indexed = BootstrapClient({"lore_indexed": {"story_id": {}}})
+    _bootstrap(indexed, "lore_indexed", "shared")
+    assert [call[0] for call in indexed.calls] == ["delete"]
+
+
+def test_per_story_layout_uses_one_collection_per_story() -> None:
+    client = BootstrapClient()
+
+    _bootstrap(client, "lore_layout_test", "per_story")
+
+    assert client.calls == [
+        ("create_collection", "lore_layout_test_story-1", None),
+        ("delete", "lore_layout_test_story-1"),
+    ]
@@ -0,0 +1,135 @@
+import os
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.application.lore_suggester import save_suggestions
+from src.backend.application.use_cases.stories import (
+    STORY_DETAIL_LOAD,
+    STORY_TRANSCRIPT_LOAD,
+    DbStoryRepository,
+)
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import (
+    LoreEntryModel,
+    LoreSuggestionModel,
+    StoryMessageModel,
+    StoryModel,
+    StorySummaryModel,
+)
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+STORIES = 2000
+MESSAGES_PER_STORY = 20
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+def _seed(engine) -> None:
+    start = datetime(2026, 1, 1)
+    story_ids = [f"story-{index:05d}" for index in range(STORIES)]
+    with engine.begin() as conn:
+        conn.execute(
+            insert(StoryModel),
+            [
+                {
+                    "id": story_id,
+                    "title": story_id,
+                    "ai_instruction_key": "neutral_storyteller",
+                    "ai_instructions": "Stay grounded.",
+                    "tags": ["dark"] if index % 3 == 0 else [],
+                    "updated_at": start + timedelta(minutes=index),
+                }
+                for index, story_id in enumerate(story_ids)
+            ],
+        )
+        conn.execute(
+            insert(StorySummaryModel),
+            [{"story_id": story_id, "last_position": -1} for story_id in story_ids],
+        )
+        conn.execute(
+            insert(StoryMessageModel),
+            [
+                {"story_id": story_id, "role": "user", "text": "look", "position": position}
+                for story_id in story_ids
+                for position in range(MESSAGES_PER_STORY)
+            ],
+        )
+        conn.execute(
+            insert(LoreEntryModel),
+            [
+                {"story_id": story_id, "title": f"Lore {index}", "tag": "Place"}
+                for story_id in story_ids
+                for index in range(5)
+            ],
+        )
+        conn.execute(
+            insert(LoreSuggestionModel),
+            [
+                {"story_id": story_id, "kind": "NEW", "status": status, "title": f"Idea {index}"}
+                for story_id in story_ids
+                for index, status in enumerate(["pending", "rejected", "accepted"] * 3)
+            ],
+        )
+        for table in Base.metadata.sorted_tables:
+            conn.execute(text(f'ANALYZE "{table.name}"'))
+
+
+@pytest.fixture
+def plan_engine():
+    schema = f"query_plans_{uuid4().hex[:8]}"
+    admin = create_engine(POSTGRES_URL)
+    with admin.begin() as conn:
+        conn.execute(text(f'CREATE SCHEMA "{schema}"'))
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        Base.metadata.create_all(engine)
+        _seed(engine)
+        yield engine
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+        admin.dispose()
+
+
+def _seq_scans(node: dict) -> list[str]:
+    found = [node["Relation Name"]] if node["Node Type"] == "Seq Scan" else []
+    for child in node.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def test_hot_queries_avoid_sequential_scans(plan_engine) -> None:
+    statements: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(plan_engine, "before_cursor_execute", record)
+    story_id = f"story-{STORIES // 2:05d}"
+    with sessionmaker(bind=plan_engine, autoflush=False)() as db:
+        repo = DbStoryRepository(db=db)
+        repo.get_story(story_id, load=STORY_DETAIL_LOAD + STORY_TRANSCRIPT_LOAD)
+        repo.last_position(story_id)
+        repo.message_window(story_id, 5, before_position=10)
+        repo.messages_from(story_id, 15)
+        _, cursor = repo.list_stories(limit=20)
+        repo.list_stories(limit=20, after=cursor)
+        save_suggestions(story_id, "look", "The hall is quiet.", [], [], db)
+    event.remove(plan_engine, "before_cursor_execute", record)
+
+    scans = {}
+    with plan_engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            found = _seq_scans(plan[0]["Plan"])
+            if found:
+                scans[statement] = found
+
+    assert len(statements) >= 8
+    assert scans == {}
@@ -1,4 +1,16 @@
-from src.backend.api.story_routes import _normalize_persisted_messages
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.backend.api.story_routes import (
+    _apply_messages,
+    _normalize_persisted_messages,
+    pop_message,
+)
+from src.backend.application.use_cases.stories import DbStoryRepository, TurnStoryRepository
+from src.backend.infrastructure.db import Base
+from src.backend.infrastructure.models import StoryMessageModel, StoryModel, StorySummaryModel
 
 
 def test_transient_assistant_errors_are_not_persisted() -> None:
@@ -17,3 +29,198 @@ def test_transient_assistant_errors_are_not_persisted() -> None:
         {"role": "user", "text": "continue"},
         {"role": "assistant", "text": "Normal reply"},
     ]
+
+
+def _session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _story(db) -> StoryModel:
+    story = StoryModel(
+        title="Test", ai_instruction_key="neutral_storyteller", ai_instructions="Stay grounded."
+    )
+    story.summary_record = StorySummaryModel(summary="", last_position=-1)
+    db.add(story)
+    db.commit()
+    return story
+
+
+def test_append_messages_continues_after_last_position() -> None:
+    db = _session()
+    story = _story(db)
+    repo = DbStoryRepository(db=db)
+
+    repo.append_messages(
+        story.id,
+        [{"role": "user", "text": "u1", "mode": "do"}, {"role": "assistant", "text": "a1"}],
+    )
+    repo.commit()
+    repo.append_messages(story.id, [{"role": "assistant", "text": "a2"}])
+    repo.commit()
+
+    rows = (
+        db.query(StoryMessageModel)
+        .filter(StoryMessageModel.story_id == story.id)
+        .order_by(StoryMessageModel.position)
+        .all()
+    )
+    assert [(row.position, row.role, row.text, row.mode) for row in rows] == [
+        (0, "user", "u1", "do"),
+        (1, "assistant", "a1", None),
+        (2, "assistant", "a2", None),
+    ]
+
+
+def test_pop_message_removes_last_row_and_rewinds_summary_position() -> None:
+    db = _session()
+    story = _story(db)
+    repo = DbStoryRepository(db=db)
+    repo.append_messages(
+        story.id, [{"role": "user", "text": "u1"}, {"role": "assistant", "text": "a1"}]
+    )
+    story.summary_record.last_position = 1
+    repo.commit()
+
+    popped = repo.pop_message(story.id)
+    repo.commit()
+
+    assert popped is not None and popped.text == "a1"
+    assert repo.last_position(story.id) == 0
+    assert db.get(StorySummaryModel, story.id).last_position == 0
+
+
+def test_pop_route_tells_a_missing_story_from_an_empty_one() -> None:
+    db = _session()
+    story = _story(db)
+
+    with pytest.raises(HTTPException) as missing:
+        pop_message("missing", db=db)
+    with pytest.raises(HTTPException) as empty:
+        pop_message(story.id, db=db)
+
+    assert (missing.value.status_code, missing.value.detail) == (404, "Story not found")
+    assert (empty.value.status_code, empty.value.detail) == (404, "Message not found")
+
+
+def test_turn_repository_returns_detached_snapshot_and_releases_connection(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'turns.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        story_id = _story(db).id
+    repo = TurnStoryRepository(session_factory=session_factory)
+
+    repo.append_messages(story_id, [{"role": "user", "text": "u1", "mode": "say"}])
+    snapshot = repo.load_snapshot(story_id)
+
+    assert engine.pool.checkedout() == 0
+    assert snapshot is not None
+    assert snapshot.ai_instructions == "Stay grounded."
+    assert snapshot.messages == [{"role": "user", "text": "u1", "mode": "say"}]
+    assert repo.load_snapshot("missing") is None
+
+
+def test_message_window_pages_backwards_by_position() -> None:
+    db = _session()
+    story = _story(db)
+    repo = DbStoryRepository(db=db)
+    repo.append_messages(story.id, [{"role": "user", "text": f"m{index}"} for index in range(5)])
+    repo.commit()
+
+    latest, cursor = repo.message_window(story.id, 2)
+    middle, middle_cursor = repo.message_window(story.id, 2, before_position=cursor)
+    oldest, oldest_cursor = repo.message_window(story.id, 2, before_position=middle_cursor)
+
+    assert [row.text for row in latest] == ["m3", "m4"]
+    assert cursor == 3
+    assert [row.text for row in middle] == ["m1", "m2"]
+    assert [row.text for row in oldest] == ["m0"]
+    assert oldest_cursor is None
+
+
+def test_turn_snapshot_loads_a_hopping_history_window(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'window.db'}")
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        story_id = _story(db).id
+    repo = TurnStoryRepository(session_factory=session_factory, history_window=4)
+
+    repo.append_messages(story_id, [{"role": "user", "text": f"m{index}"} for index in range(7)])
+    first = repo.load_snapshot(story_id)
+    repo.append_messages(story_id, [{"role": "assistant", "text": "m7"}])
+    second = repo.load_snapshot(story_id)
+    repo.append_messages(story_id, [{"role": "user", "text": "m8"}])
+    third = repo.load_snapshot(story_id)
+
+    assert [msg["text"] for msg in first.messages] == ["m0", "m1", "m2", "m3", "m4", "m5", "m6"]
+    assert [msg["text"] for msg in second.messages] == ["m4", "m5", "m6", "m7"]
+    assert [msg["text"] for msg in third.messages] == ["m4", "m5", "m6", "m7", "m8"]
+
+
+def test_transcript_rewrite_keeps_positions_unique_and_reuses_rows() -> None:
+    db = _session()
+    story = _story(db)
+    _apply_messages(story, [{"role": "user", "text": f"m{index}"} for index in range(3)])
+    db.commit()
+    first_id = story.messages[0].id
+
+    _apply_messages(story, [{"role": "user", "text": "m0"}, {"role": "assistant", "text": "new"}])
+    db.commit()
+    _apply_messages(story, [{"role": "user", "text": f"n{index}"} for index in range(4)])
+    db.commit()
+
+    rows = db.query(StoryMessageModel).order_by(StoryMessageModel.position).all()
+    assert [(row.position, row.text) for row in rows] == [
+        (0, "n0"),
+        (1, "n1"),
+        (2, "n2"),
+        (3, "n3"),
+    ]
+    assert rows[0].id == first_id
+
+
+def test_transcript_rewrite_leaves_new_turns_for_the_summary_job() -> None:
+    db = _session()
+    story = _story(db)
+    _apply_messages(story, [{"role": "user", "text": "a"}, {"role": "assistant", "text": "b"}])
+    story.summary_record.last_position = 1
+    db.commit()
+
+    turns = [{"role": "user", "text": text} for text in ["a", "b", "c", "d"]]
+    turns[1]["role"] = "assistant"
+    _apply_messages(story, turns)
+    db.commit()
+    appended = story.summary_record.last_position
+
+    _apply_messages(story, [{"role": "user", "text": "edited"}, *turns[1:]])
+    db.commit()
+
+    assert appended == 1
+    assert story.summary_record.last_position == -1
+
+
+class StaleTailRepository(DbStoryRepository):
+    def __init__(self, db) -> None:
+        super().__init__(db=db)
+        self.reads = 0
+
+    def last_position(self, story_id: str) -> int:
+        self.reads += 1
+        # The first read misses a message that a racing append has just committed.
+        return -1 if self.reads == 1 else super().last_position(story_id)
+
+
+def test_racing_append_retries_after_a_position_conflict() -> None:
+    db = _session()
+    story = _story(db)
+    DbStoryRepository(db=db).append_and_commit(story.id, [{"role": "user", "text": "first"}])
+    repo = StaleTailRepository(db)
+
+    positions = repo.append_and_commit(story.id, [{"role": "assistant", "text": "reply"}])
+
+    rows = db.query(StoryMessageModel).order_by(StoryMessageModel.position).all()
+    assert positions == [1] and repo.reads == 2
+    assert [(row.position, row.text) for row in rows] == [(0, "first"), (1, "reply")]
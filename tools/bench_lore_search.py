@@ -0,0 +1,95 @@
+import argparse
+import os
+import random
+import statistics
+import time
+from uuid import uuid4
+
+from qdrant_client import QdrantClient
+
+from src.backend.application.vectorstores.lore_vectorstore import (
+    PER_STORY_LAYOUT,
+    SHARED_LAYOUT,
+    LoreVectorStore,
+)
+
+
+class RandomEmbeddings:
+    def __init__(self, dim: int, seed: int) -> None:
+        self._dim = dim
+        self._random = random.Random(seed)
+
+    def vector(self) -> list[float]:
+        return [self._random.uniform(-1.0, 1.0) for _ in range(self._dim)]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.vector()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.vector() for _ in texts]
+
+
+def _store(args, client: QdrantClient, embeddings: RandomEmbeddings, story_id: str):
+    return LoreVectorStore(
+        embeddings,
+        story_id,
+        client=client,
+        collection=args.collection,
+        vector_size=args.dim,
+        vector_cache=None,
+        layout=args.layout,
+    )
+
+
+def _drop_collections(client: QdrantClient, prefix: str) -> None:
+    for collection in client.get_collections().collections:
+        if collection.name == prefix or collection.name.startswith(f"{prefix}_"):
+            client.delete_collection(collection.name)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure lore search latency as stories grow.")
+    parser.add_argument("--url", default=os.getenv("QDRANT_URL", "http://localhost:6333"))
+    parser.add_argument("--collection", default="lore_bench")
+    parser.add_argument(
+        "--layout", choices=[SHARED_LAYOUT, PER_STORY_LAYOUT], default=SHARED_LAYOUT
+    )
+    parser.add_argument("--dim", type=int, default=int(os.getenv("EMBED_DIM", "768")))
+    parser.add_argument("--lore-per-story", type=int, default=40)
+    parser.add_argument("--stories", default="10,100,1000,3000")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url)
+    embeddings = RandomEmbeddings(args.dim, args.seed)
+    _drop_collections(client, args.collection)
+    story_ids: list[str] = []
+    print(f"layout={args.layout} dim={args.dim} lore_per_story={args.lore_per_story}")
+    print(f"{'stories':>8} {'points':>9} {'p50_ms':>8} {'p95_ms':>8}")
+    for target in (int(value) for value in args.stories.split(",")):
+        while len(story_ids) < target:
+            story_id = str(uuid4())
+            items = [
+                (f"lore {index}", {"lore_id": str(uuid4())}, embeddings.vector())
+                for index in range(args.lore_per_story)
+            ]
+            _store(args, client, embeddings, story_id).upsert_vectors(items)
+            story_ids.append(story_id)
+        durations = []
+        for _ in range(args.queries):
+            store = _store(args, client, embeddings, random.choice(story_ids))
+            start = time.perf_counter()
+            store.similarity_search_with_score("query", k=8)
+            durations.append((time.perf_counter() - start) * 1000)
+        durations.sort()
+        p95 = durations[int(len(durations) * 0.95) - 1]
+        print(
+            f"{target:>8} {target * args.lore_per_story:>9} "
+            f"{statistics.median(durations):>8.2f} {p95:>8.2f}"
+        )
+    _drop_collections(client, args.collection)
+
+
+if __name__ == "__main__":
+    main()